@@ -1,7 +1,86 @@
-from strands.models.llamacpp import LlamaCppModel
+import json
 import logging
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from app.clients.llm import llm_clients
+from app.config import LLM_MODEL, LLM_TIMEOUT
+
+if TYPE_CHECKING:
+    from strands.models.llamacpp import LlamaCppModel
 
 logger = logging.getLogger(__name__)
 
-def get_model() -> LlamaCppModel:
-    return LlamaCppModel(base_url="http://localhost:8080")
+
+def get_model(base_url: str | None = None) -> "LlamaCppModel":
+    """Return a new strands model bound to *base_url*.
+
+    Defaults to the least-loaded available LLM server at call time; use
+    :meth:`~app.clients.llm.LLMClientManager.call` to also get retries and
+    breaker accounting for the agent's requests.
+    """
+    # Imported on first use, so the API starts without loading strands
+    from strands.models.llamacpp import LlamaCppModel
+
+    return LlamaCppModel(base_url=base_url or llm_clients.pick().url)
+
+
+def _chat_payload(
+    messages: list[dict[str, str]],
+    max_tokens: int | None,
+    temperature: float | None,
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {"model": LLM_MODEL, "messages": messages}
+    if max_tokens is not None:
+        payload["max_tokens"] = max_tokens
+    if temperature is not None:
+        payload["temperature"] = temperature
+    return payload
+
+
+async def chat_completion(
+    messages: list[dict[str, str]],
+    *,
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    timeout: float = LLM_TIMEOUT,
+) -> dict[str, Any]:
+    """Run an OpenAI-style chat completion on one of the llama.cpp servers.
+
+    Returns the decoded JSON response
+    (``response["choices"][0]["message"]["content"]``).
+    """
+    payload = _chat_payload(messages, max_tokens, temperature)
+    return await llm_clients.post("/v1/chat/completions", payload, timeout=timeout)
+
+
+async def stream_chat_completion(
+    messages: list[dict[str, str]],
+    *,
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    timeout: float = LLM_TIMEOUT,
+) -> AsyncIterator[str]:
+    """Stream a chat completion, yielding content deltas as tokens arrive.
+
+    Uses the server's ``stream: true`` mode (Server-Sent Events, one JSON
+    chunk per ``data:`` line, terminated by ``data: [DONE]``).
+    """
+    payload = _chat_payload(messages, max_tokens, temperature)
+    payload["stream"] = True
+
+    lines = llm_clients.stream_lines("/v1/chat/completions", payload, timeout=timeout)
+    try:
+        async for line in lines:
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or []
+            if not choices:
+                continue
+            delta = (choices[0].get("delta") or {}).get("content")
+            if delta:
+                yield delta
+    finally:
+        await lines.aclose()
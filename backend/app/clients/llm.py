@@ -0,0 +1,320 @@
+"""Process-wide client for the llama.cpp inference servers.
+
+All LLM traffic goes through one :class:`LLMClientManager`, which
+
+- keeps a dedicated pooled HTTP client with keep-alive connections,
+- spreads requests over the configured servers (``LLM_ENDPOINTS``), picking
+  the one with the fewest requests in flight (round-robin on ties),
+- retries transport errors and overload statuses with exponential backoff,
+  on another server when one is available,
+- trips a per-server circuit breaker after ``LLM_BREAKER_THRESHOLD``
+  consecutive failures; the server is skipped for ``LLM_BREAKER_COOLDOWN``
+  seconds, after which a single probe request is let through: its success
+  closes the breaker and its failure re-opens it,
+- probes each server's ``/health`` endpoint in the background, opening or
+  closing breakers accordingly.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+import httpx
+
+from app.config import (
+    LLM_BREAKER_COOLDOWN,
+    LLM_BREAKER_THRESHOLD,
+    LLM_CONNECT_TIMEOUT,
+    LLM_ENDPOINTS,
+    LLM_HEALTH_INTERVAL,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BACKOFF,
+    LLM_TIMEOUT,
+)
+from app.services.errors import ServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+# Statuses llama-server returns while loading or overloaded
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+@dataclass
+class LLMEndpoint:
+    url: str
+    in_flight: int = 0
+    requests: int = 0
+    errors: int = 0
+    # Consecutive failures; the breaker opens at the threshold
+    failures: int = 0
+    opened_at: float | None = None
+    # A half-open breaker's probe request is in flight
+    probing: bool = False
+    healthy: bool | None = None
+
+
+class LLMClientManager:
+    """Load-balanced, retrying, circuit-breaking access to the LLM servers."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        *,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_backoff: float = LLM_RETRY_BACKOFF,
+        breaker_threshold: int = LLM_BREAKER_THRESHOLD,
+        breaker_cooldown: float = LLM_BREAKER_COOLDOWN,
+        health_interval: float = LLM_HEALTH_INTERVAL,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one LLM endpoint is required")
+        self.endpoints = [LLMEndpoint(url) for url in urls]
+        self._max_retries = max(0, max_retries)
+        self._retry_backoff = retry_backoff
+        self._breaker_threshold = max(1, breaker_threshold)
+        self._breaker_cooldown = breaker_cooldown
+        self._health_interval = health_interval
+        self._round_robin = itertools.count()
+        self._client: httpx.AsyncClient | None = None
+        self._health_task: asyncio.Task | None = None
+
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client used for LLM calls."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                ),
+            )
+        return self._client
+
+    async def start(self) -> None:
+        """Start the background health checks (idempotent)."""
+        if self._health_task is None and self._health_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def pick(self, exclude: set[str] = frozenset()) -> LLMEndpoint:
+        """Return the least-loaded server whose breaker lets requests through.
+
+        Servers in *exclude* (already tried) are avoided when possible.
+
+        Raises:
+            ServiceBusyError: If every server's breaker is open.
+        """
+        now = time.monotonic()
+        available = [e for e in self.endpoints if self._allows(e, now)]
+        if not available:
+            reopen = min(
+                e.opened_at + self._breaker_cooldown - now
+                for e in self.endpoints
+                if e.opened_at is not None
+            )
+            raise ServiceBusyError(
+                "No LLM server is available", retry_after=max(1, math.ceil(reopen))
+            )
+        candidates = [e for e in available if e.url not in exclude] or available
+        start = next(self._round_robin) % len(candidates)
+        rotated = candidates[start:] + candidates[:start]
+        return min(rotated, key=lambda e: e.in_flight)
+
+    async def call(self, request: Callable[[LLMEndpoint], Awaitable[T]]) -> T:
+        """Run ``request(endpoint)`` on a picked server, with retries and breakers.
+
+        For calls that do not go through :meth:`post` (e.g. strands agents,
+        which bring their own HTTP client): *request* must talk to
+        ``endpoint.url`` only. Errors caused by a retryable ``httpx`` error
+        are retried on another server; any other error is raised as is.
+        """
+        tried: set[str] = set()
+        for attempt in range(self._max_retries + 1):
+            endpoint = self.pick(tried)
+            tried.add(endpoint.url)
+            self._begin(endpoint)
+            try:
+                result = await request(endpoint)
+            except Exception as e:
+                cause = self._retryable_cause(e)
+                if cause is None:
+                    raise
+                self._record_failure(endpoint, cause)
+                if attempt == self._max_retries:
+                    raise
+                await self._backoff(attempt)
+                continue
+            finally:
+                self._end(endpoint)
+            self._record_success(endpoint)
+            return result
+        raise AssertionError("unreachable")
+
+    async def post(
+        self, path: str, payload: dict[str, Any], *, timeout: float = LLM_TIMEOUT
+    ) -> dict[str, Any]:
+        """POST JSON to *path* on one of the servers and return the decoded reply."""
+        async def request(endpoint: LLMEndpoint) -> dict[str, Any]:
+            response = await self.client().post(
+                f"{endpoint.url}{path}", json=payload, timeout=timeout
+            )
+            response.raise_for_status()
+            return response.json()
+
+        return await self.call(request)
+
+    async def stream_lines(
+        self, path: str, payload: dict[str, Any], *, timeout: float = LLM_TIMEOUT
+    ) -> AsyncIterator[str]:
+        """POST JSON to *path* and yield the streamed response line by line.
+
+        A failed attempt is retried only if nothing was yielded yet.
+        """
+        tried: set[str] = set()
+        for attempt in range(self._max_retries + 1):
+            endpoint = self.pick(tried)
+            tried.add(endpoint.url)
+            self._begin(endpoint)
+            yielded = False
+            try:
+                async with self.client().stream(
+                    "POST", f"{endpoint.url}{path}", json=payload, timeout=timeout
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        yielded = True
+                        yield line
+            except httpx.HTTPError as e:
+                if not self._retryable(e):
+                    raise
+                self._record_failure(endpoint, e)
+                if yielded or attempt == self._max_retries:
+                    raise
+                await self._backoff(attempt)
+                continue
+            finally:
+                self._end(endpoint)
+            self._record_success(endpoint)
+            return
+
+    async def check_health(self) -> None:
+        """Probe every server's ``/health`` and update its breaker."""
+        async def probe(endpoint: LLMEndpoint) -> None:
+            try:
+                response = await self.client().get(
+                    f"{endpoint.url}/health", timeout=LLM_CONNECT_TIMEOUT
+                )
+                healthy = response.status_code == 200
+            except httpx.HTTPError:
+                healthy = False
+            if healthy != endpoint.healthy:
+                logger.info("LLM server %s is %s", endpoint.url, "up" if healthy else "down")
+            endpoint.healthy = healthy
+            if healthy:
+                endpoint.failures = 0
+                endpoint.opened_at = None
+            elif endpoint.opened_at is None:
+                endpoint.failures = self._breaker_threshold
+                endpoint.opened_at = time.monotonic()
+
+        await asyncio.gather(*(probe(e) for e in self.endpoints))
+
+    def stats(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "url": e.url,
+                "state": self._state(e, now),
+                "healthy": e.healthy,
+                "in_flight": e.in_flight,
+                "requests": e.requests,
+                "errors": e.errors,
+            }
+            for e in self.endpoints
+        ]
+
+    def _allows(self, endpoint: LLMEndpoint, now: float) -> bool:
+        state = self._state(endpoint, now)
+        # A half-open server takes one probe at a time
+        return state == "closed" or (state == "half_open" and not endpoint.probing)
+
+    def _state(self, endpoint: LLMEndpoint, now: float) -> str:
+        if endpoint.opened_at is None:
+            return "closed"
+        if now - endpoint.opened_at < self._breaker_cooldown:
+            return "open"
+        return "half_open"
+
+    def _begin(self, endpoint: LLMEndpoint) -> None:
+        if self._state(endpoint, time.monotonic()) == "half_open":
+            endpoint.probing = True
+        endpoint.in_flight += 1
+        endpoint.requests += 1
+
+    def _end(self, endpoint: LLMEndpoint) -> None:
+        endpoint.in_flight -= 1
+        endpoint.probing = False
+
+    def _record_success(self, endpoint: LLMEndpoint) -> None:
+        endpoint.failures = 0
+        endpoint.opened_at = None
+
+    def _record_failure(self, endpoint: LLMEndpoint, error: Exception) -> None:
+        endpoint.errors += 1
+        endpoint.failures += 1
+        logger.warning("LLM call to %s failed: %r", endpoint.url, error)
+        if endpoint.failures >= self._breaker_threshold:
+            if endpoint.opened_at is None or self._state(endpoint, time.monotonic()) == "half_open":
+                logger.warning("Circuit opened for LLM server %s", endpoint.url)
+            endpoint.opened_at = time.monotonic()
+
+    @staticmethod
+    def _retryable(error: httpx.HTTPError) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in _RETRYABLE_STATUS
+        return isinstance(error, httpx.TransportError)
+
+    @classmethod
+    def _retryable_cause(cls, error: BaseException) -> httpx.HTTPError | None:
+        """Return the retryable ``httpx`` error in *error*'s chain, if any."""
+        seen: set[int] = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            if isinstance(error, httpx.HTTPError):
+                return error if cls._retryable(error) else None
+            error = error.__cause__ or error.__context__
+        return None
+
+    async def _backoff(self, attempt: int) -> None:
+        await asyncio.sleep(self._retry_backoff * 2 ** attempt)
+
+    async def _health_loop(self) -> None:
+        while True:
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.warning("LLM health check failed: %s", e)
+            await asyncio.sleep(self._health_interval)
+
+
+# Process-wide manager, started and closed by the FastAPI lifespan in main.py
+llm_clients = LLMClientManager(LLM_ENDPOINTS)
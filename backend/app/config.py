@@ -1 +1,145 @@
-# Configuration settings for the application (ports, paths, etc.)
\ No newline at end of file
+# Configuration settings for the application (ports, paths, etc.)
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Shared headless browser pool (app/services/web_tools/browser_pool.py)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_CONTEXTS_PER_BROWSER = int(os.getenv("BROWSER_CONTEXTS_PER_BROWSER", "4"))
+BROWSER_ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "120"))
+
+# Crawl scheduler limits (app/services/web_tools/scheduler.py)
+CRAWL_MAX_IN_FLIGHT_PAGES = int(os.getenv("CRAWL_MAX_IN_FLIGHT_PAGES", "24"))
+CRAWL_DOMAIN_CONCURRENCY = int(os.getenv("CRAWL_DOMAIN_CONCURRENCY", "2"))
+CRAWL_DOMAIN_MIN_INTERVAL = float(os.getenv("CRAWL_DOMAIN_MIN_INTERVAL", "1.0"))
+CRAWL_MAX_PENDING = int(os.getenv("CRAWL_MAX_PENDING", "64"))
+
+# Shared HTTP client (app/clients/http.py)
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+
+# Persistent page cache (app/services/web_tools/page_cache.py)
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", "./cache/pages.sqlite3")
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "3600"))
+# Per-domain overrides, e.g. "reuters.com=900,arxiv.org=86400"
+PAGE_CACHE_DOMAIN_TTLS = os.getenv("PAGE_CACHE_DOMAIN_TTLS", "")
+
+# Podcast generation (app/routers/podcasts.py)
+PODCAST_SCRAPE_CONCURRENCY = int(os.getenv("PODCAST_SCRAPE_CONCURRENCY", "4"))
+PODCAST_MAX_FOLLOW = int(os.getenv("PODCAST_MAX_FOLLOW", "5"))
+
+# Background podcast jobs (app/services/jobs.py)
+PODCAST_JOB_WORKERS = int(os.getenv("PODCAST_JOB_WORKERS", "2"))
+PODCAST_JOB_MAX_QUEUED = int(os.getenv("PODCAST_JOB_MAX_QUEUED", "20"))
+PODCAST_JOB_RETENTION = float(os.getenv("PODCAST_JOB_RETENTION", "3600"))
+
+# Executors for blocking model calls (app/services/executors.py)
+LLM_EXECUTOR_WORKERS = int(os.getenv("LLM_EXECUTOR_WORKERS", "4"))
+LLM_EXECUTOR_QUEUE = int(os.getenv("LLM_EXECUTOR_QUEUE", "16"))
+TTS_EXECUTOR_WORKERS = int(os.getenv("TTS_EXECUTOR_WORKERS", "1"))
+TTS_EXECUTOR_QUEUE = int(os.getenv("TTS_EXECUTOR_QUEUE", "4"))
+
+# Text-to-speech (app/services/tts.py)
+TTS_BATCH_SIZE = int(os.getenv("TTS_BATCH_SIZE", "4"))
+# Seeded (deterministic) sampling; unset keeps random sampling
+TTS_SEED = int(os.environ["TTS_SEED"]) if os.getenv("TTS_SEED") else None
+# Multi-process TTS worker farm (app/services/tts_workers.py); 0 keeps the
+# model in this process. Use TTS_EXECUTOR_WORKERS > 1 to share the workers
+# between concurrent episodes
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", "0"))
+# Torch threads per worker; 0 divides the CPU cores evenly between workers
+TTS_WORKER_THREADS = int(os.getenv("TTS_WORKER_THREADS", "0"))
+# Script segmentation into TTS chunks (app/services/segmentation.py)
+TTS_CHUNK_MAX_CHARS = int(os.getenv("TTS_CHUNK_MAX_CHARS", "220"))
+TTS_CHUNK_MIN_CHARS = int(os.getenv("TTS_CHUNK_MIN_CHARS", "80"))
+# Silence (seconds) inserted after a chunk within / at the end of a paragraph
+TTS_SENTENCE_PAUSE = float(os.getenv("TTS_SENTENCE_PAUSE", "0.15"))
+TTS_PARAGRAPH_PAUSE = float(os.getenv("TTS_PARAGRAPH_PAUSE", "0.4"))
+
+# Per-line segment cache, used only with TTS_SEED; cache misses are then
+# synthesized one line per generate call (app/services/tts_cache.py)
+TTS_SEGMENT_CACHE_ENABLED = os.getenv("TTS_SEGMENT_CACHE_ENABLED", "true").lower() == "true"
+TTS_SEGMENT_CACHE_PATH = os.getenv("TTS_SEGMENT_CACHE_PATH", "./cache/tts_segments")
+TTS_SEGMENT_CACHE_MAX_BYTES = int(os.getenv("TTS_SEGMENT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Generated episodes (app/services/output_store.py)
+PODCASTS_OUTPUT_PATH = os.getenv("PODCASTS_OUTPUT_PATH", "./podcasts")
+PODCAST_RETENTION_DAYS = float(os.getenv("PODCAST_RETENTION_DAYS", "7"))
+PODCAST_MAX_EPISODES = int(os.getenv("PODCAST_MAX_EPISODES", "200"))
+
+# LLM servers (OpenAI-compatible llama.cpp endpoints, app/clients/llm.py)
+# Comma-separated server roots; defaults to BASE_URL_RUNTIME without "/v1"
+LLM_ENDPOINTS = [
+    url.strip().rstrip("/")
+    for url in os.getenv(
+        "LLM_ENDPOINTS",
+        os.getenv("BASE_URL_RUNTIME", "http://localhost:8080/v1").rstrip("/").removesuffix("/v1"),
+    ).split(",")
+    if url.strip()
+]
+LLM_MODEL = os.getenv("LIGHT_MODEL", "")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "300"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "16"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "3"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+LLM_HEALTH_INTERVAL = float(os.getenv("LLM_HEALTH_INTERVAL", "15"))
+
+# Map-reduce script generation (app/services/script_generator.py)
+SCRIPT_SUMMARY_CONCURRENCY = int(os.getenv("SCRIPT_SUMMARY_CONCURRENCY", "4"))
+SCRIPT_ARTICLE_MAX_TOKENS = int(os.getenv("SCRIPT_ARTICLE_MAX_TOKENS", "3000"))
+SCRIPT_SUMMARY_MAX_TOKENS = int(os.getenv("SCRIPT_SUMMARY_MAX_TOKENS", "350"))
+SCRIPT_REDUCE_INPUT_TOKENS = int(os.getenv("SCRIPT_REDUCE_INPUT_TOKENS", "4000"))
+SCRIPT_MAX_TOKENS = int(os.getenv("SCRIPT_MAX_TOKENS", "4096"))
+
+# Pipelined podcast generation (app/services/pipeline.py)
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+PIPELINE_SECTION_ARTICLES = int(os.getenv("PIPELINE_SECTION_ARTICLES", "3"))
+
+# URL finder agent result cache (app/services/agents/cache.py)
+URL_SEARCH_CACHE_ENABLED = os.getenv("URL_SEARCH_CACHE_ENABLED", "true").lower() == "true"
+URL_SEARCH_CACHE_TTL = float(os.getenv("URL_SEARCH_CACHE_TTL", "3600"))
+# How long past the TTL a stale result may still be served while refreshing
+URL_SEARCH_CACHE_STALE_TTL = float(os.getenv("URL_SEARCH_CACHE_STALE_TTL", "86400"))
+URL_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("URL_SEARCH_CACHE_MAX_ENTRIES", "512"))
+
+# Web search backend for the search_web tool (app/services/agents/tools/search.py)
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "1800"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+SEARCH_MIN_INTERVAL = float(os.getenv("SEARCH_MIN_INTERVAL", "1.0"))
+SEARCH_MAX_RETRIES = int(os.getenv("SEARCH_MAX_RETRIES", "3"))
+SEARCH_BACKOFF = float(os.getenv("SEARCH_BACKOFF", "2.0"))
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "4"))
+
+# Static HTTP fetch tier in front of the browser (app/services/web_tools/static_fetch.py)
+STATIC_FETCH_ENABLED = os.getenv("STATIC_FETCH_ENABLED", "true").lower() == "true"
+STATIC_FETCH_TIMEOUT = float(os.getenv("STATIC_FETCH_TIMEOUT", "10"))
+# Best static article must reach this relevance, otherwise the browser is used
+STATIC_FETCH_MIN_RELEVANCE = float(os.getenv("STATIC_FETCH_MIN_RELEVANCE", "0.1"))
+# How long a per-domain static/browser decision is remembered
+STATIC_DECISION_TTL = float(os.getenv("STATIC_DECISION_TTL", "86400"))
+# Domains that always need the browser, e.g. "x.com,medium.com"
+JS_HEAVY_DOMAINS = os.getenv("JS_HEAVY_DOMAINS", "")
+
+# Near-duplicate article detection (app/services/web_tools/dedup.py)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+# Estimated Jaccard similarity of word shingles above which articles are duplicates
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "5"))
+
+# Startup (main.py): models load on first use unless warmed up in the background
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "false").lower() == "true"
+
+# In-process model residency (app/services/residency.py); 0 disables the limit
+MODEL_RAM_BUDGET_MB = float(os.getenv("MODEL_RAM_BUDGET_MB", "0"))
+# Unload models unused for this many seconds; 0 keeps them loaded
+MODEL_IDLE_TIMEOUT = float(os.getenv("MODEL_IDLE_TIMEOUT", "1800"))
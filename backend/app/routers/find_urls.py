@@ -1,32 +1,67 @@
 """Route for discovering the best URLs for a given topic."""
 from fastapi import APIRouter
 import logging
+from typing import Awaitable
 
+from app.clients.clients import get_model
+from app.clients.llm import llm_clients
 from app.routers.schemas import URLSearchRequest, URLSearchResponse
-from app.services.agents.agents import url_finder_agent
+from app.services.agents.agents import build_url_finder_agent
+from app.services.agents.cache import normalize_topic, url_search_cache
+from app.services.errors import ServiceBusyError
+from app.services.executors import llm_executor
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _ask_url_finder(base_url: str, prompt: str):
+    # A fresh agent per request: agents are not safe for concurrent calls
+    return build_url_finder_agent(get_model(base_url))(prompt=prompt)
+
+
+async def _run_url_finder(topic: str, max_sources: int) -> URLSearchResponse:
+    """Run the URL finder agent once (raises if it returns nothing usable)."""
+    prompt = f"Topic: {topic}, Number of URLs: {max_sources}"
+    response = await llm_clients.call(
+        lambda endpoint: llm_executor.run(_ask_url_finder, endpoint.url, prompt)
+    )
+
+    if not isinstance(response.structured_output, URLSearchResponse):
+        raise ValueError("Agent failed to return valid URL structure.")
+    if not response.structured_output.urls:
+        raise ValueError("Agent returned no URLs.")
+    return response.structured_output
+
+
 @router.post("/search", response_model=URLSearchResponse)
 async def search_urls(request: URLSearchRequest) -> URLSearchResponse:
-    """Search for relevant URLs for a topic."""
+    """Search for relevant URLs for a topic.
+
+    Results are cached per normalized topic and ``max_sources`` (see
+    ``app/services/agents/cache.py``).
+    """
     try:
         logger.info("Searching URLs for topic: %s", request.topic)
 
-        response = url_finder_agent(prompt=f"Topic: {request.topic}, Number of URLs: {request.max_sources}")
+        def load() -> Awaitable[URLSearchResponse]:
+            return _run_url_finder(request.topic, request.max_sources)
 
-        if not isinstance(response.structured_output, URLSearchResponse):
-            raise ValueError("Agent failed to return valid URL structure.")
+        if url_search_cache is not None:
+            key = (normalize_topic(request.topic), request.max_sources)
+            result = await url_search_cache.get_or_load(key, load)
+        else:
+            result = await load()
 
-        logger.info("Found %d URLs for topic '%s'", len(response.structured_output.urls), request.topic)
+        logger.info("Found %d URLs for topic '%s'", len(result.urls), request.topic)
 
         return URLSearchResponse(
             topic=request.topic,
-            urls=response.structured_output.urls,
+            urls=result.urls,
         )
 
+    except ServiceBusyError:
+        raise
     except Exception as e:
         logger.error("Search URLs error: %s", e)
         return URLSearchResponse(topic=request.topic, urls=[])
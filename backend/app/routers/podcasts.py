@@ -1,82 +1,64 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+import json
 import logging
 
-from app.services.script_generator import ScriptGeneratorService
-from app.services.tts import TTSGeneratorService
-from app.routers.schemas import PodcastRequest, PodcastResponse
-from app.services.web_tools.agents import scraper_agent, scraper_tool_limit
-from app.services.web_tools.schemas import ScraperResponse
+from app.routers.schemas import PodcastJobResponse, PodcastRequest, PodcastResponse
+from app.services.errors import NoContentError, ServiceBusyError
+from app.services.executors import tts_executor
+from app.services.jobs import PodcastJob, PodcastJobManager
+from app.services.podcast_generator import PodcastGeneratorService
+from app.services.web_tools.schemas import ScrapedArticle
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Initialize services
-script_generator = ScriptGeneratorService()
-tts_generator = TTSGeneratorService()
+podcast_generator = PodcastGeneratorService()
+job_manager = PodcastJobManager(podcast_generator.generate)
+
+
+def _job_response(job: PodcastJob) -> PodcastJobResponse:
+    return PodcastJobResponse(
+        job_id=job.id,
+        status=job.status.value,
+        stage=job.stage,
+        progress=job.progress,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+def _get_job_or_404(job_id: str) -> PodcastJob:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    return job
+
 
 @router.post("/generate", response_model=PodcastResponse)
 async def generate_podcast(request: PodcastRequest):
     """
     Generate a new podcast from the provided URLs:
-    1. Scrape article content from the URLs
+    1. Scrape article content from the URLs (concurrently, in input order)
     2. Generate podcast script
+    3. Synthesize the audio
+
+    Runs inline; prefer ``POST /podcasts/jobs`` for long episodes.
     """
     try:
-        logger.info(f"Generating podcast for topic: {request.topic}")
-        logger.info(f"Using {len(request.urls)} URLs")
-        
-        all_articles = []
-        for url in request.urls:
-            scraper_tool_limit.reset()
-            result = scraper_agent(
-                prompt=(
-                    f"Find and extract the most relevant article about '{request.topic}' "
-                    f"starting from this URL: {url}.\n\n"
-                    "Follow your loop: browse_page → read_article → evaluate_content → decide.\n"
-                    "If the first article isn't relevant, try another link. "
-                    "Return the article URL, title, and a concise summary."
-                ),
-                structured_output_model=ScraperResponse,
-            )
-            assert isinstance(result.structured_output, ScraperResponse), "Expected ScraperResponse"
-            article = result.structured_output
-            all_articles.append({
-                "script": article.content,
-                "sources": article.url
-            })
-        
-        if not all_articles:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No articles found from the provided URLs"
-            )
-        
-        logger.info(f"Scraped {len(all_articles)} articles")
-        
-        news_content = "\n\n".join([
-            f"URL: {article['sources']}\n\n{article['script']}" 
-            for article in all_articles
-        ])
-        
-        logger.info(f"Generated podcast script: {news_content}")
-        
-        script = script_generator.generate_podcast_script(
-            duration=request.duration,
-            topic=request.topic,
-            news_content=news_content
-        )
-        
-        audio_path = tts_generator.generate_audio(script)
-        
-        return PodcastResponse(
-            topic=request.topic,
-            duration=request.duration,
-            script="".join([article["script"] for article in all_articles]),
-            sources=[article["sources"] for article in all_articles],
-            audio_path=audio_path
+        return await podcast_generator.generate(request)
+    except NoContentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
         )
-        
-    except HTTPException:
+    except ServiceBusyError:
         raise
     except Exception as e:
         logger.error(f"Generate podcast error: {str(e)}")
@@ -86,6 +68,105 @@ async def generate_podcast(request: PodcastRequest):
         )
 
 
+async def _collect_articles(request: PodcastRequest) -> list[ScrapedArticle]:
+    """Scrape the sources before a streaming response starts (errors map to HTTP)."""
+    try:
+        return await podcast_generator.collect_articles(request)
+    except NoContentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ServiceBusyError:
+        raise
+    except Exception as e:
+        logger.error(f"Collect articles error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.post("/stream")
+async def stream_podcast(request: PodcastRequest):
+    """
+    Generate a podcast and stream its audio (WAV) while it is synthesized.
+
+    Scraping completes before the response starts (so its errors map to
+    HTTP statuses); article summaries, the script and audio are produced
+    after the 200 headers are sent, and a failure there ends the stream
+    early. The script is streamed from the LLM and each line is
+    synthesized as soon as it is written, so LLM and TTS time overlap.
+    The full file is also saved on the server's output store.
+    """
+    # Fail with 429 before scraping, and again before the 200 headers are
+    # sent, rather than truncating the WAV body when TTS is saturated
+    tts_executor.check_capacity()
+    articles = await _collect_articles(request)
+    tts_executor.check_capacity()
+    return StreamingResponse(
+        podcast_generator.stream_audio(request, articles),
+        media_type="audio/wav",
+    )
+
+
+@router.post("/script/stream")
+async def stream_podcast_script(request: PodcastRequest):
+    """
+    Stream the podcast script as plain text, one line at a time, while the
+    LLM writes it.
+    """
+    articles = await _collect_articles(request)
+
+    async def line_stream():
+        async for line in podcast_generator.stream_script(request, articles):
+            yield f"{line}\n"
+
+    return StreamingResponse(line_stream(), media_type="text/plain; charset=utf-8")
+
+
+@router.post(
+    "/jobs",
+    response_model=PodcastJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_podcast_job(request: PodcastRequest):
+    """Queue a podcast generation and return its job id immediately."""
+    job = job_manager.submit(request)
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=PodcastJobResponse)
+async def get_podcast_job(job_id: str):
+    """Return the status, stage and progress of a podcast job."""
+    return _job_response(_get_job_or_404(job_id))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_podcast_job_events(job_id: str):
+    """Stream job progress as Server-Sent Events until the job ends."""
+    _get_job_or_404(job_id)
+
+    async def event_stream():
+        async for event in job_manager.events(job_id):
+            yield f"event: {event['status']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.delete("/jobs/{job_id}", response_model=PodcastJobResponse)
+async def cancel_podcast_job(job_id: str):
+    """Cancel a queued or running podcast job."""
+    _get_job_or_404(job_id)
+    job = job_manager.cancel(job_id)
+    assert job is not None
+    return _job_response(job)
+
+
 @router.get("/health")
 async def health_check():
     """Health check for the podcasts router."""
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel
 from app.services.web_tools.schemas import ScrapedArticle
 
@@ -25,6 +27,21 @@ class PodcastResponse(BaseModel):
     script: str
     sources: list[str]
     audio_path: str
+    # Per-stage pipeline timings in seconds (see app/services/pipeline.py)
+    timings: dict[str, Any] | None = None
+
+
+class PodcastJobResponse(BaseModel):
+    """Status of a background podcast generation job."""
+    job_id: str
+    status: str
+    stage: str | None = None
+    # Latest progress details keyed by stage (e.g. "scraping", "synthesizing")
+    progress: dict[str, dict[str, Any]] = {}
+    result: PodcastResponse | None = None
+    error: str | None = None
+    created_at: float
+    updated_at: float
 
 
 class ScrapeRequest(BaseModel):
@@ -33,6 +50,9 @@ class ScrapeRequest(BaseModel):
     urls: list[str]
     max_articles: int = 5
     min_relevance: float = 0.1
+    # Seconds after which unfinished seeds are cancelled and the articles
+    # scraped so far are returned
+    deadline: float | None = None
 
 
 class ScrapeResponse(BaseModel):
@@ -1,10 +1,13 @@
 """Route for scraping URLs using crawl4ai and returning best content."""
 
 import logging
+from contextlib import aclosing
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from app.routers.schemas import ScrapeRequest, ScrapeResponse
+from app.services.errors import ServiceBusyError
 from app.services.web_tools.scraper import CrawlScraper
 from app.services.web_tools.schemas import ScrapedArticle
 
@@ -29,7 +32,10 @@ async def extract_content(request: ScrapeRequest) -> ScrapeResponse:
             urls=request.urls,
             topic=request.topic,
             min_relevance=request.min_relevance,
+            deadline=request.deadline,
         )
+    except ServiceBusyError:
+        raise
     except Exception as e:
         logger.error("Scrape error: %s", e)
         raise HTTPException(
@@ -53,6 +59,7 @@ async def extract_content(request: ScrapeRequest) -> ScrapeResponse:
                 title=a.title,
                 content=a.content,
                 relevance_score=a.relevance_score,
+                alternate_sources=a.alternate_sources,
             )
             for a in top_articles
         ],
@@ -66,6 +73,37 @@ async def extract_content(request: ScrapeRequest) -> ScrapeResponse:
     return response
 
 
+@router.post("/extract/stream")
+async def stream_extract_content(request: ScrapeRequest):
+    """
+    Scrape the given URLs and stream articles as NDJSON, one JSON object
+    per line, as soon as each seed is scraped and scored.
+
+    The stream ends after ``max_articles`` articles, when every seed is
+    done, or when ``deadline`` expires; unfinished crawls are cancelled.
+    """
+    logger.info("Streaming scrape of %d URLs for topic: '%s'", len(request.urls), request.topic)
+    # Reject before the response starts, so a full scheduler still maps to 429
+    _scraper.check_capacity(len(request.urls))
+
+    async def article_stream():
+        articles = _scraper.scrape_stream(
+            urls=request.urls,
+            topic=request.topic,
+            min_relevance=request.min_relevance,
+            deadline=request.deadline,
+        )
+        sent = 0
+        async with aclosing(articles):
+            async for article in articles:
+                yield article.model_dump_json() + "\n"
+                sent += 1
+                if sent >= request.max_articles:
+                    break
+
+    return StreamingResponse(article_stream(), media_type="application/x-ndjson")
+
+
 @router.get("/health")
 async def health_check() -> dict[str, str]:
     """Health check for the scrape router."""
@@ -1,15 +1,23 @@
-from strands import Agent
-
 from app.routers.schemas import URLSearchResponse
 from app.clients.clients import get_model
 from .prompts import URL_FINDER_AGENT_PROMPT
-from .tools.tools import search_web
-
-url_finder_agent = Agent(
-    name="url_finder_agent",
-    description="Agent for finding URLs",
-    model=get_model(),
-    tools=[search_web],
-    structured_output_model=URLSearchResponse,
-    system_prompt=URL_FINDER_AGENT_PROMPT,
-)
+
+
+def build_url_finder_agent(model=None):
+    """Build a new URL finder agent (strands is imported on first use).
+
+    strands Agents keep per-conversation message state and must not be
+    called concurrently, so every request gets its own agent.
+    """
+    from strands import Agent
+
+    from .tools.tools import search_web, search_web_batch
+
+    return Agent(
+        name="url_finder_agent",
+        description="Agent for finding URLs",
+        model=model or get_model(),
+        tools=[search_web, search_web_batch],
+        structured_output_model=URLSearchResponse,
+        system_prompt=URL_FINDER_AGENT_PROMPT,
+    )
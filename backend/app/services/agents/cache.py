@@ -0,0 +1,146 @@
+"""In-memory cache of URL finder agent results.
+
+A ``url_finder_agent`` run takes several LLM turns and web searches, while
+most requests ask about the same few topics. Results are cached under the
+normalized topic and the requested number of sources:
+
+- fresh entries (younger than ``URL_SEARCH_CACHE_TTL``) are served directly;
+- stale entries (up to ``URL_SEARCH_CACHE_STALE_TTL`` past the TTL) are
+  served immediately while a background run refreshes them;
+- concurrent requests for the same key share a single agent run.
+
+Failed runs are not cached. The number of entries is bounded with LRU
+eviction.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from app.config import (
+    URL_SEARCH_CACHE_ENABLED,
+    URL_SEARCH_CACHE_MAX_ENTRIES,
+    URL_SEARCH_CACHE_STALE_TTL,
+    URL_SEARCH_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_topic(topic: str) -> str:
+    """Canonical form of a topic: case-folded, punctuation and extra spaces removed."""
+    text = unicodedata.normalize("NFKC", topic).casefold()
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    stored_at: float
+
+
+class ResultCache(Generic[T]):
+    """TTL cache with stale-while-revalidate and request coalescing."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = URL_SEARCH_CACHE_TTL,
+        stale_ttl: float = URL_SEARCH_CACHE_STALE_TTL,
+        max_entries: int = URL_SEARCH_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[Hashable, _Entry[T]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_load(
+        self, key: Hashable, load: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Return the cached value for *key*, calling *load* when needed.
+
+        Exceptions from *load* propagate to every waiting caller and
+        nothing is cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < self._ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < self._ttl + self._stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._in_flight:
+                    logger.info(f"Refreshing stale result for {key!r}")
+                    self._start_load(key, load)
+                return entry.value
+
+        if key in self._in_flight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            self._start_load(key, load)
+        # Shielded so a disconnecting caller does not cancel the shared run
+        return await asyncio.shield(self._in_flight[key])
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+    def _start_load(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> None:
+        async def run() -> T:
+            try:
+                value = await load()
+                self._store(key, value)
+                return value
+            finally:
+                self._in_flight.pop(key, None)
+
+        task = asyncio.create_task(run())
+        # Background refreshes may have no awaiting caller
+        task.add_done_callback(_log_failure)
+        self._in_flight[key] = task
+
+    def _store(self, key: Hashable, value: T) -> None:
+        self._entries[key] = _Entry(value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Cached load failed: {task.exception()}")
+
+
+# Process-wide cache of URLSearchResponse results (None when disabled)
+url_search_cache: ResultCache | None = (
+    ResultCache() if URL_SEARCH_CACHE_ENABLED else None
+)
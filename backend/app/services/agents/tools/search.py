@@ -0,0 +1,247 @@
+"""Search backend layer behind the agent's ``search_web`` tools.
+
+The agent issues many similar queries while it explores a topic. Searches
+go through a :class:`SearchService` that
+
+- caches results for ``SEARCH_CACHE_TTL`` under a normalized query (case,
+  punctuation and word order ignored), so duplicate and near-duplicate
+  queries are answered without a network call; a cached result with more
+  hits also serves requests for fewer,
+- coalesces identical concurrent queries into one backend call (a query
+  asking for more hits than the call in flight makes its own call),
+- paces backend calls (``SEARCH_MIN_INTERVAL``) and retries rate-limited
+  calls with exponential backoff,
+- runs batches of queries concurrently (:meth:`SearchService.search_many`).
+
+The backend is pluggable: anything implementing :class:`SearchBackend`
+works, e.g. a local stand-in in tests. The default is DuckDuckGo, with one
+reusable ``DDGS`` session per worker thread.
+"""
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from ddgs import DDGS
+from ddgs.exceptions import RatelimitException
+
+from app.config import (
+    SEARCH_BACKOFF,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_TTL,
+    SEARCH_CONCURRENCY,
+    SEARCH_MAX_RETRIES,
+    SEARCH_MIN_INTERVAL,
+)
+from .schemas import SearchResponse, SearchResult
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+class SearchRateLimited(Exception):
+    """Raised by a backend when the search provider throttles us."""
+
+
+class SearchBackend(Protocol):
+    def text(self, query: str, max_results: int) -> list[dict[str, str]]:
+        """Return raw results with ``title``, ``href`` and ``body`` keys."""
+        ...
+
+
+class DDGSBackend:
+    """DuckDuckGo search with one reusable session per thread."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def text(self, query: str, max_results: int) -> list[dict[str, str]]:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = DDGS()
+        try:
+            return list(session.text(query, max_results=max_results))
+        except RatelimitException as e:
+            raise SearchRateLimited(str(e)) from e
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: case-folded, unpunctuated, words sorted."""
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return " ".join(sorted(set(_PUNCTUATION.sub(" ", text).split())))
+
+
+@dataclass
+class _CachedSearch:
+    results: list[SearchResult]
+    max_results: int
+    stored_at: float
+
+
+class SearchService:
+    """Cached, coalesced and rate-limited access to a search backend."""
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        *,
+        ttl: float = SEARCH_CACHE_TTL,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        min_interval: float = SEARCH_MIN_INTERVAL,
+        max_retries: int = SEARCH_MAX_RETRIES,
+        backoff: float = SEARCH_BACKOFF,
+        concurrency: int = SEARCH_CONCURRENCY,
+    ) -> None:
+        self.backend = backend
+        self._ttl = ttl
+        self._max_entries = max(1, max_entries)
+        self._min_interval = min_interval
+        self._max_retries = max(0, max_retries)
+        self._backoff = backoff
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, _CachedSearch] = OrderedDict()
+        # Normalized query -> (future, max_results) of the backend call in flight
+        self._in_flight: dict[str, tuple[Future, int]] = {}
+        self._pace_lock = threading.Lock()
+        self._next_call = 0.0
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, concurrency), thread_name_prefix="search"
+        )
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+
+    def search(self, query: str, max_results: int = 10) -> SearchResponse:
+        """Search *query*, serving from the cache when possible."""
+        key = normalize_query(query) or query
+        with self._lock:
+            cached = self._cache.get(key)
+            if (
+                cached is not None
+                and time.monotonic() - cached.stored_at < self._ttl
+                and cached.max_results >= max_results
+            ):
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return SearchResponse(query=query, results=cached.results[:max_results])
+
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None or in_flight[1] < max_results
+            if leader:
+                self.misses += 1
+                future: Future = Future()
+                self._in_flight[key] = future, max_results
+            else:
+                self.coalesced += 1
+                future = in_flight[0]
+
+        if not leader:
+            results = future.result()
+            return SearchResponse(query=query, results=results[:max_results])
+
+        try:
+            results = self._fetch(query, max_results)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(results)
+            with self._lock:
+                self._store(key, _CachedSearch(results, max_results, time.monotonic()))
+        finally:
+            with self._lock:
+                if self._in_flight.get(key, (None,))[0] is future:
+                    del self._in_flight[key]
+        return SearchResponse(query=query, results=results)
+
+    def search_many(
+        self, queries: list[str], max_results: int = 10
+    ) -> list[SearchResponse]:
+        """Run several searches concurrently; results follow *queries* order.
+
+        A failed query yields an empty result instead of failing the batch.
+        """
+        futures = [self._pool.submit(self.search, q, max_results) for q in queries]
+        responses = []
+        for query, future in zip(queries, futures):
+            try:
+                responses.append(future.result())
+            except Exception as e:
+                logger.error(f"Search failed for {query!r}: {e}")
+                responses.append(SearchResponse(query=query, results=[]))
+        return responses
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._cache),
+                "in_flight": len(self._in_flight),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "rate_limited": self.rate_limited,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _fetch(self, query: str, max_results: int) -> list[SearchResult]:
+        for attempt in range(self._max_retries + 1):
+            self._pace()
+            try:
+                raw = self.backend.text(query, max_results)
+                break
+            except SearchRateLimited:
+                with self._lock:
+                    self.rate_limited += 1
+                if attempt == self._max_retries:
+                    raise
+                delay = self._backoff * 2 ** attempt
+                logger.warning(f"Search rate limited, retrying in {delay:.1f}s")
+                # Push back every caller, not only this one
+                with self._pace_lock:
+                    self._next_call = max(self._next_call, time.monotonic() + delay)
+
+        return [
+            SearchResult(
+                title=r.get("title", ""),
+                url=r.get("href", ""),
+                snippet=r.get("body", ""),
+            )
+            for r in raw
+            if r.get("href")
+        ]
+
+    def _pace(self) -> None:
+        """Block until the next backend call is allowed."""
+        with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_call - now
+            self._next_call = max(now, self._next_call) + self._min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _store(self, key: str, entry: _CachedSearch) -> None:
+        current = self._cache.get(key)
+        if (
+            current is not None
+            and current.max_results > entry.max_results
+            and entry.stored_at - current.stored_at < self._ttl
+        ):
+            # Keep the fresh entry that can serve more requests
+            return
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+
+# Process-wide search service used by the agent tools
+search_service = SearchService(DDGSBackend())
@@ -1,7 +1,7 @@
 import logging
-from ddgs import DDGS
 from strands.tools import tool
-from .schemas import SearchResponse, SearchResult
+from .schemas import SearchResponse
+from .search import search_service
 
 logger = logging.getLogger(__name__)
 
@@ -18,20 +18,21 @@ def search_web(query: str, max_results: int = 10) -> SearchResponse:
         max_results: Maximum number of results to return (1-25, default 10).
     """
     try:
-        with DDGS() as ddgs:
-            raw = list(ddgs.text(query, max_results=max_results))
+        return search_service.search(query, max_results=max_results)
     except Exception as exc:
         logger.error(f"DuckDuckGo search failed: {exc}")
         return SearchResponse(query=query, results=[])
 
-    results = [
-        SearchResult(
-            title=r.get("title", ""),
-            url=r.get("href", ""),
-            snippet=r.get("body", ""),
-        )
-        for r in raw
-        if r.get("href")
-    ]
-
-    return SearchResponse(query=query, results=results)
+
+@tool
+def search_web_batch(queries: list[str], max_results: int = 10) -> list[SearchResponse]:
+    """Run several web searches at once and return one result set per query.
+
+    Prefer this tool over repeated search_web calls when you already know
+    the queries you want to run: they are executed concurrently.
+
+    Args:
+        queries: The search query strings.
+        max_results: Maximum number of results per query (1-25, default 10).
+    """
+    return search_service.search_many(queries, max_results=max_results)
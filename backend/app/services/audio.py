@@ -0,0 +1,82 @@
+"""Helpers for writing and streaming audio incrementally, segment by segment."""
+
+import struct
+import wave
+
+import numpy as np
+
+# Placeholder RIFF/data sizes for a WAV stream whose length is unknown
+_STREAMING_SIZE = 0xFFFFFFFF
+
+
+class RunningPeakNormalizer:
+    """Peak-normalize audio one segment at a time.
+
+    Each segment is divided by the largest peak seen so far (including its
+    own), so output never clips and loudness stays consistent without
+    holding the whole waveform in memory.
+    """
+
+    def __init__(self) -> None:
+        self.peak = 0.0
+
+    def __call__(self, segment: np.ndarray) -> np.ndarray:
+        if segment.size:
+            self.peak = max(self.peak, float(np.abs(segment).max()))
+        if self.peak > 0:
+            return segment / self.peak
+        return segment
+
+
+def to_pcm16(segment: np.ndarray) -> bytes:
+    """Convert float audio in [-1, 1] to little-endian 16-bit PCM bytes."""
+    return (np.clip(segment, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def silence(seconds: float, sampling_rate: int, num_channels: int = 1) -> bytes:
+    """Return *seconds* of 16-bit PCM silence."""
+    return bytes(2 * num_channels * int(round(seconds * sampling_rate)))
+
+
+def streaming_wav_header(sampling_rate: int, num_channels: int = 1) -> bytes:
+    """Return a 16-bit PCM WAV header suitable for an open-ended stream."""
+    byte_rate = sampling_rate * num_channels * 2
+    return b"".join([
+        b"RIFF", struct.pack("<I", _STREAMING_SIZE), b"WAVE",
+        b"fmt ", struct.pack(
+            "<IHHIIHH", 16, 1, num_channels, sampling_rate,
+            byte_rate, num_channels * 2, 16,
+        ),
+        b"data", struct.pack("<I", _STREAMING_SIZE),
+    ])
+
+
+class WavFileWriter:
+    """Append 16-bit PCM frames to a WAV file; the header is fixed on close."""
+
+    def __init__(self, path: str, sampling_rate: int, num_channels: int = 1) -> None:
+        self.path = path
+        self.frames = 0
+        self.sampling_rate = sampling_rate
+        self._frame_size = 2 * num_channels
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(num_channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sampling_rate)
+
+    def write(self, pcm: bytes) -> None:
+        self._wav.writeframesraw(pcm)
+        self.frames += len(pcm) // self._frame_size
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sampling_rate
+
+    def close(self) -> None:
+        self._wav.close()
+
+    def __enter__(self) -> "WavFileWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,17 @@
+"""Exceptions shared across services."""
+
+
+class ServiceBusyError(Exception):
+    """A bounded resource is saturated and the request should be retried later.
+
+    Surfaced by the API as ``429 Too Many Requests`` with a ``Retry-After``
+    header (see the exception handler in ``main.py``).
+    """
+
+    def __init__(self, message: str, retry_after: int = 10) -> None:
+        super().__init__(message)
+        self.retry_after = max(1, int(retry_after))
+
+
+class NoContentError(Exception):
+    """No usable content could be produced for the request (mapped to 404)."""
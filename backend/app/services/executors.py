@@ -0,0 +1,194 @@
+"""Dedicated executors for blocking LLM and TTS work.
+
+Model calls are synchronous and can run for minutes, so async handlers must
+never call them directly. Each workload gets its own bounded thread pool:
+LLM calls cannot starve TTS synthesis (and vice versa), and once a pool's
+backlog is full new work is rejected with ``ServiceBusyError`` instead of
+piling up. Thread pools (rather than process pools) are used because the
+models live in this process; pool occupancy is exposed via :meth:`stats`.
+"""
+
+import asyncio
+import functools
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+from app.config import (
+    LLM_EXECUTOR_QUEUE,
+    LLM_EXECUTOR_WORKERS,
+    TTS_EXECUTOR_QUEUE,
+    TTS_EXECUTOR_WORKERS,
+)
+from app.services.errors import ServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """A named thread pool with a bounded backlog and usage metrics."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        self.name = name
+        self._max_workers = max(1, max_workers)
+        self._max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix=f"{name}-worker"
+        )
+        self._lock = threading.Lock()
+        self._in_system = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def check_capacity(self) -> None:
+        """Raise ServiceBusyError if a new task would be rejected right now.
+
+        Streaming responses call this before sending their headers, since
+        :meth:`stream` only takes its slot once iteration starts.
+        """
+        with self._lock:
+            if self._in_system >= self._max_workers + self._max_queue:
+                self._rejected += 1
+                raise ServiceBusyError(
+                    f"{self.name} executor is saturated",
+                    retry_after=self._retry_after(),
+                )
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+        Raises:
+            ServiceBusyError: If every worker is busy and the backlog is full.
+        """
+        with self._lock:
+            if self._in_system >= self._max_workers + self._max_queue:
+                self._rejected += 1
+                raise ServiceBusyError(
+                    f"{self.name} executor is saturated",
+                    retry_after=self._retry_after(),
+                )
+            self._in_system += 1
+
+        submitted = time.monotonic()
+        call = functools.partial(self._call, fn, submitted, *args, **kwargs)
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._release()
+            raise
+        # Free the slot when the work ends, not when the awaiter gives up:
+        # cancelling this coroutine cannot stop a call already on a worker.
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    async def stream(
+        self, fn: Callable[..., Iterator[T]], *args: Any, **kwargs: Any
+    ) -> AsyncIterator[T]:
+        """Drive the generator ``fn(*args, **kwargs)`` on the pool.
+
+        Items are handed to the event loop as soon as the worker produces
+        them. If the consumer stops early the generator is closed on the
+        worker at its next item.
+
+        The slot is taken when iteration starts; callers that must fail
+        before a response is sent should call :meth:`check_capacity` first.
+
+        Raises:
+            ServiceBusyError: If every worker is busy and the backlog is full.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[Any, BaseException | None]] = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def produce() -> None:
+            gen = fn(*args, **kwargs)
+            try:
+                for item in gen:
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+                    if stop.is_set():
+                        break
+            finally:
+                gen.close()
+
+        def on_done(task: asyncio.Future) -> None:
+            error = None if task.cancelled() else task.exception()
+            queue.put_nowait((done, error))
+
+        task = asyncio.ensure_future(self.run(produce))
+        task.add_done_callback(on_done)
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    break
+                yield item
+        finally:
+            stop.set()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self._max_workers,
+                "max_queue": self._max_queue,
+                "active": self._active,
+                "queued": self._in_system - self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": round(self._total_wait / finished, 3) if finished else 0.0,
+                "avg_run_seconds": round(self._total_run / finished, 3) if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, fn: Callable[..., T], submitted: float, *args: Any, **kwargs: Any) -> T:
+        started = time.monotonic()
+        with self._lock:
+            self._active += 1
+            self._total_wait += started - submitted
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._total_run += time.monotonic() - started
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_system -= 1
+
+    def _retry_after(self) -> int:
+        finished = self._completed + self._failed
+        avg_run = self._total_run / finished if finished else 30.0
+        waves = (self._in_system + 1) / self._max_workers
+        return math.ceil(avg_run * waves)
+
+
+# Process-wide pools, shut down by the FastAPI lifespan in main.py
+llm_executor = BoundedExecutor("llm", LLM_EXECUTOR_WORKERS, LLM_EXECUTOR_QUEUE)
+tts_executor = BoundedExecutor("tts", TTS_EXECUTOR_WORKERS, TTS_EXECUTOR_QUEUE)
+
+
+def executor_stats() -> dict[str, dict[str, Any]]:
+    return {e.name: e.stats() for e in (llm_executor, tts_executor)}
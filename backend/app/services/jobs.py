@@ -0,0 +1,277 @@
+"""Background job subsystem for long-running podcast generations.
+
+Submitting a job returns immediately with its id; a fixed pool of worker
+tasks drains a bounded queue and runs the generation. Each job records its
+status, current stage and progress, and publishes progress events to any
+number of subscribers (used by the SSE endpoint). Jobs can be cancelled
+while queued or running; a running generation stops at the next progress
+report (e.g. after the current TTS segment).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from app.config import (
+    PODCAST_JOB_MAX_QUEUED,
+    PODCAST_JOB_RETENTION,
+    PODCAST_JOB_WORKERS,
+)
+from app.routers.schemas import PodcastRequest, PodcastResponse
+from app.services.errors import ServiceBusyError
+from app.services.podcast_generator import ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[PodcastRequest, ProgressCallback], Awaitable[PodcastResponse]]
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+_TERMINAL = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+
+class JobCancelledError(Exception):
+    """Raised from a progress report once a running job has been cancelled."""
+
+
+@dataclass
+class PodcastJob:
+    id: str
+    request: PodcastRequest
+    status: JobStatus = JobStatus.QUEUED
+    stage: str | None = None
+    # Latest details per stage; pipeline stages interleave, so each keeps its own
+    progress: dict[str, dict[str, Any]] = field(default_factory=dict)
+    result: PodcastResponse | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    events: deque[dict[str, Any]] = field(default_factory=lambda: deque(maxlen=200))
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    task: asyncio.Task | None = None
+    subscribers: set[asyncio.Queue] = field(default_factory=set)
+
+    @property
+    def done(self) -> bool:
+        return self.status in _TERMINAL
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status.value,
+            "stage": self.stage,
+            "progress": {stage: dict(details) for stage, details in self.progress.items()},
+            "error": self.error,
+            "updated_at": self.updated_at,
+        }
+
+
+class PodcastJobManager:
+    """Bounded queue + worker pool for podcast generation jobs."""
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        *,
+        workers: int = PODCAST_JOB_WORKERS,
+        max_queued: int = PODCAST_JOB_MAX_QUEUED,
+        retention: float = PODCAST_JOB_RETENTION,
+    ) -> None:
+        self._runner = runner
+        self._num_workers = max(1, workers)
+        self._max_queued = max(1, max_queued)
+        self._retention = retention
+        self._jobs: dict[str, PodcastJob] = {}
+        self._queue: asyncio.Queue[PodcastJob] | None = None
+        # Jobs waiting for a worker; cancelled ones stay in the asyncio
+        # queue until a worker skips them, so qsize() overcounts
+        self._queued = 0
+        self._workers: list[asyncio.Task] = []
+        self._stopping = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"podcast-job-worker-{i}")
+            for i in range(self._num_workers)
+        ]
+        logger.info("Started %d podcast job workers", self._num_workers)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for job in self._jobs.values():
+            if not job.done:
+                self.cancel(job.id)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, request: PodcastRequest) -> PodcastJob:
+        """Queue a generation job.
+
+        Raises:
+            ServiceBusyError: If the queue is full.
+        """
+        if self._queue is None:
+            raise RuntimeError("PodcastJobManager.start() has not been called")
+        self._prune()
+        if self._queued >= self._max_queued:
+            raise ServiceBusyError("Podcast job queue is full", retry_after=60)
+
+        job = PodcastJob(id=uuid.uuid4().hex, request=request)
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        self._queued += 1
+        self._publish(job)
+        logger.info("Queued podcast job %s for topic '%s'", job.id, request.topic)
+        return job
+
+    def get(self, job_id: str) -> PodcastJob | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> PodcastJob | None:
+        """Cancel a queued or running job; returns None for unknown ids."""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        job.cancel_event.set()
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            # Still queued: the worker will skip it
+            self._queued -= 1
+            self._finish(job, JobStatus.CANCELLED)
+        return job
+
+    async def events(self, job_id: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield the job's current state, then every update until it ends."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        job.subscribers.add(queue)
+        try:
+            yield job.snapshot()
+            while not job.done:
+                event = await queue.get()
+                yield event
+            # Drain updates published together with the terminal one
+            while not queue.empty():
+                yield queue.get_nowait()
+        finally:
+            job.subscribers.discard(queue)
+
+    def stats(self) -> dict[str, int]:
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        counts["workers"] = len(self._workers)
+        return counts
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.done:
+                    continue
+                self._queued -= 1
+                job.task = asyncio.create_task(
+                    self._runner(job.request, self._progress_callback(job))
+                )
+                job.status = JobStatus.RUNNING
+                self._publish(job)
+                try:
+                    job.result = await job.task
+                    self._finish(job, JobStatus.COMPLETED)
+                except (asyncio.CancelledError, JobCancelledError):
+                    self._finish(job, JobStatus.CANCELLED)
+                    if self._stopping or not job.cancel_event.is_set():
+                        # The worker itself is being cancelled (shutdown)
+                        raise
+                except Exception as e:
+                    logger.error("Podcast job %s failed: %s", job.id, e)
+                    job.error = str(e)
+                    self._finish(job, JobStatus.FAILED)
+            finally:
+                self._queue.task_done()
+
+    def _progress_callback(self, job: PodcastJob) -> ProgressCallback:
+        """Build a thread-safe progress reporter bound to *job*."""
+        loop = self._loop
+        assert loop is not None
+
+        def report(stage: str, details: dict[str, Any]) -> None:
+            if job.cancel_event.is_set():
+                raise JobCancelledError(job.id)
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if on_loop:
+                self._update(job, stage, details)
+            else:
+                loop.call_soon_threadsafe(self._update, job, stage, details)
+
+        return report
+
+    def _update(self, job: PodcastJob, stage: str, details: dict[str, Any]) -> None:
+        if job.done:
+            return
+        job.stage = stage
+        job.progress.setdefault(stage, {}).update(details)
+        self._publish(job)
+
+    def _finish(self, job: PodcastJob, status: JobStatus) -> None:
+        job.status = status
+        job.task = None
+        self._publish(job)
+        logger.info("Podcast job %s %s", job.id, status.value)
+
+    def _publish(self, job: PodcastJob) -> None:
+        job.updated_at = time.time()
+        event = job.snapshot()
+        job.events.append(event)
+        for queue in job.subscribers:
+            queue.put_nowait(event)
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the retention period."""
+        cutoff = time.time() - self._retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,190 @@
+"""Content-addressed storage for generated podcast episodes.
+
+An episode is named after a hash of everything that determines its audio
+(script text, TTS model id and sampling rate), so identical requests reuse
+the existing file instead of running TTS again, and different requests can
+never overwrite each other. Audio is written to a unique temporary file
+and atomically renamed into place; a JSON sidecar keeps metadata such as
+duration, topic and sources. Old episodes are garbage-collected by age and
+by a maximum episode count.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import wave
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator
+
+from app.config import (
+    PODCAST_MAX_EPISODES,
+    PODCAST_RETENTION_DAYS,
+    PODCASTS_OUTPUT_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _KeyLock:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Threads holding or waiting for the lock; the entry is dropped at zero
+    users: int = 0
+
+
+@dataclass
+class StoredPodcast:
+    key: str
+    audio_path: str
+    duration: float
+    created_at: float
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+class PodcastOutputStore:
+    """Directory of ``<key>.wav`` episodes with ``<key>.json`` metadata."""
+
+    def __init__(
+        self,
+        root: str = PODCASTS_OUTPUT_PATH,
+        *,
+        retention_days: float = PODCAST_RETENTION_DAYS,
+        max_episodes: int = PODCAST_MAX_EPISODES,
+    ) -> None:
+        self.root = root
+        self._retention = retention_days * 86400
+        self._max_episodes = max_episodes
+        self._locks: dict[str, _KeyLock] = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self.gc()
+
+    @staticmethod
+    def key(script: str, model_id: str | None, sampling_rate: int) -> str:
+        """Return the content address of an episode."""
+        payload = json.dumps(
+            {"script": script.strip(), "model": model_id or "", "rate": sampling_rate},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def audio_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.wav")
+
+    def get(self, key: str) -> StoredPodcast | None:
+        """Return the stored episode for *key*, if any."""
+        audio_path = self.audio_path(key)
+        if not os.path.exists(audio_path):
+            return None
+        try:
+            with open(self._metadata_path(key), encoding="utf-8") as f:
+                stored = StoredPodcast(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            stored = StoredPodcast(
+                key=key,
+                audio_path=audio_path,
+                duration=_wav_duration(audio_path),
+                created_at=os.path.getmtime(audio_path),
+            )
+        # Refresh mtime so retention counts from the last use
+        os.utime(audio_path)
+        return stored
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Serialize generation of the same episode across threads."""
+        with self._locks_guard:
+            entry = self._locks.setdefault(key, _KeyLock())
+            entry.users += 1
+        try:
+            with entry.lock:
+                yield
+        finally:
+            with self._locks_guard:
+                entry.users -= 1
+                if not entry.users:
+                    del self._locks[key]
+
+    @contextmanager
+    def writing(self, key: str) -> Iterator[str]:
+        """Yield a unique temporary path to write the episode audio to.
+
+        The caller must :meth:`commit` the file; if the block raises (or a
+        generator holding it is closed) the partial file is removed.
+        """
+        tmp_path = os.path.join(self.root, f".{key}.{uuid.uuid4().hex}.part")
+        try:
+            yield tmp_path
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def commit(
+        self, key: str, tmp_path: str, metadata: dict[str, Any] | None = None
+    ) -> StoredPodcast:
+        """Atomically publish a finished episode and its metadata."""
+        audio_path = self.audio_path(key)
+        stored = StoredPodcast(
+            key=key,
+            audio_path=audio_path,
+            duration=_wav_duration(tmp_path),
+            created_at=time.time(),
+            metadata=metadata or {},
+        )
+        os.replace(tmp_path, audio_path)
+
+        meta_tmp = f"{self._metadata_path(key)}.{uuid.uuid4().hex}.part"
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(stored), f)
+        os.replace(meta_tmp, self._metadata_path(key))
+
+        logger.info(f"Stored episode {key} ({stored.duration:.1f}s)")
+        self.gc()
+        return stored
+
+    def gc(self) -> int:
+        """Delete expired episodes and the oldest beyond the count limit."""
+        try:
+            episodes = sorted(
+                (
+                    (os.path.getmtime(os.path.join(self.root, name)), name[:-4])
+                    for name in os.listdir(self.root)
+                    if name.endswith(".wav") and not name.startswith(".")
+                ),
+                reverse=True,
+            )
+        except OSError as e:
+            logger.warning(f"Episode GC failed: {e}")
+            return 0
+
+        cutoff = time.time() - self._retention
+        removed = 0
+        for index, (mtime, key) in enumerate(episodes):
+            if index < self._max_episodes and mtime >= cutoff:
+                continue
+            for path in (self.audio_path(key), self._metadata_path(key)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            removed += 1
+
+        if removed:
+            logger.info(f"Episode GC removed {removed} episodes")
+        return removed
+
+    def _metadata_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+
+def _wav_duration(path: str) -> float:
+    try:
+        with wave.open(path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (OSError, wave.Error, ZeroDivisionError):
+        return 0.0
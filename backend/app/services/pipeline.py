@@ -0,0 +1,359 @@
+"""Pipelined podcast generation: scrape → summarize → script sections → TTS.
+
+Instead of running each phase to completion before starting the next, the
+stages run concurrently and hand work over through bounded async queues:
+
+- **scrape**: sources are crawled concurrently; each source's articles are
+  queued as soon as that source is done.
+- **summarize**: a pool of workers summarizes articles as they arrive.
+- **compose**: summaries are grouped into sections of
+  ``PIPELINE_SECTION_ARTICLES``; each section is streamed from the LLM and
+  its lines are fed to TTS while it is being written.
+- **synthesize**: a TTS worker synthesizes lines as they are fed.
+
+Bounded queues (``PIPELINE_QUEUE_SIZE``) keep a fast stage from running far
+ahead of a slow one, so end-to-end latency approaches that of the slowest
+stage rather than the sum of all of them. Per-stage timings are recorded in
+:attr:`PodcastPipeline.timings`.
+"""
+
+import asyncio
+import logging
+import queue
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from app.config import (
+    DEDUP_ENABLED,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_SECTION_ARTICLES,
+    PODCAST_MAX_FOLLOW,
+    PODCAST_SCRAPE_CONCURRENCY,
+    SCRIPT_SUMMARY_CONCURRENCY,
+)
+from app.routers.schemas import PodcastRequest
+from app.services.errors import NoContentError
+from app.services.executors import tts_executor
+from app.services.script_generator import ScriptGeneratorService
+from app.services.tts import TTSGeneratorService
+from app.services.web_tools.dedup import NearDuplicateIndex
+from app.services.web_tools.scheduler import new_owner
+from app.services.web_tools.schemas import ScrapedArticle
+from app.services.web_tools.scraper import CrawlScraper
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output on its queue
+_DONE = object()
+# Number of trailing script characters given to the next section as context
+_SECTION_CONTEXT_CHARS = 600
+# Length of the closing section and floor for short sections
+_MIN_SECTION_WORDS = 80
+
+
+class LineFeed:
+    """Hands script lines from the event loop to a TTS worker thread.
+
+    Iterating (on the worker) yields batches of the lines available so far,
+    at most *batch_size* at a time, blocking until at least one arrives.
+    """
+
+    _END = object()
+
+    def __init__(self, batch_size: int) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._batch_size = max(1, batch_size)
+        self._error: BaseException | None = None
+
+    def put(self, line: str) -> None:
+        self._queue.put(line)
+
+    def close(self, error: BaseException | None = None) -> None:
+        self._error = error
+        self._queue.put(self._END)
+
+    def __iter__(self) -> Iterator[list[str]]:
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not self._END and len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            ended = batch[-1] is self._END
+            if ended:
+                batch.pop()
+            if batch:
+                yield batch
+            if ended:
+                if self._error is not None:
+                    raise self._error
+                return
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock timing of one pipeline stage, relative to the pipeline start."""
+
+    items: int = 0
+    started: float | None = None
+    first_output: float | None = None
+    finished: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        duration = (
+            self.finished - self.started
+            if self.started is not None and self.finished is not None
+            else None
+        )
+        return {
+            "items": self.items,
+            "started": _round(self.started),
+            "first_output": _round(self.first_output),
+            "finished": _round(self.finished),
+            "seconds": _round(duration),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 3) if value is not None else None
+
+
+class PodcastPipeline:
+    """One pipelined generation run for a podcast request."""
+
+    STAGES = ("scrape", "summarize", "compose", "synthesize")
+
+    def __init__(
+        self,
+        request: PodcastRequest,
+        *,
+        scraper: CrawlScraper,
+        script_generator: ScriptGeneratorService,
+        tts_generator: TTSGeneratorService,
+        progress: Callable[[str, dict[str, Any]], None],
+    ) -> None:
+        self.request = request
+        self.scraper = scraper
+        self.script_generator = script_generator
+        self.tts_generator = tts_generator
+        self.progress = progress
+        self.articles: list[ScrapedArticle] = []
+        self.lines: list[str] = []
+        self.timings = {stage: StageTiming() for stage in self.STAGES}
+        # Filled in while scraping; written to the sidecar once TTS commits
+        self.metadata: dict[str, Any] = {
+            "topic": request.topic,
+            "duration_minutes": request.duration,
+            "sources": [],
+        }
+        self._origin = time.monotonic()
+        self._finished: float | None = None
+        self._summaries_done = 0
+        # Articles are deduplicated as they arrive: the first copy is kept
+        # because it may already be summarized when a later one shows up
+        self._duplicates = NearDuplicateIndex() if DEDUP_ENABLED else None
+        # Set once the first script line exists, so the TTS worker is not
+        # held idle while sources are still being scraped
+        self._script_started = asyncio.Event()
+
+    async def run(self) -> str:
+        """Run every stage to completion and return the episode's audio path.
+
+        Raises:
+            NoContentError: If no article could be scraped from the URLs.
+            ServiceBusyError: If the crawl scheduler or TTS executor is saturated.
+        """
+        self.scraper.check_capacity(len(self.request.urls))
+        articles: asyncio.Queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        summaries: asyncio.Queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        feed = LineFeed(self.tts_generator.batch_size)
+
+        tasks = [
+            asyncio.create_task(self._scrape(articles)),
+            asyncio.create_task(self._summarize(articles, summaries)),
+            asyncio.create_task(self._compose(summaries, feed)),
+            asyncio.create_task(self._synthesize(feed)),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Unblock the TTS worker if it is still waiting for lines
+            feed.close(asyncio.CancelledError())
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._finished = self._now()
+        logger.info(f"Pipeline timings: {self.timings_dict()}")
+        return self.tts_generator.episode_path("\n".join(self.lines))
+
+    def timings_dict(self) -> dict[str, Any]:
+        return {
+            "stages": {stage: t.as_dict() for stage, t in self.timings.items()},
+            "total": _round(self._finished),
+        }
+
+    async def _scrape(self, out: asyncio.Queue) -> None:
+        timing = self.timings["scrape"]
+        self._begin(timing)
+        semaphore = asyncio.Semaphore(PODCAST_SCRAPE_CONCURRENCY)
+        owner = new_owner()
+        sources_done = 0
+
+        async def scrape_source(url: str) -> None:
+            nonlocal sources_done
+            async with semaphore:
+                logger.info(f"Scraping source: {url}")
+                found = await self.scraper.scrape_url(
+                    url, self.request.topic, max_follow=PODCAST_MAX_FOLLOW, owner=owner
+                )
+            for article in found[: self.request.max_articles_per_site]:
+                if self._duplicates is not None and self._duplicates.find_or_add(article):
+                    continue
+                self.articles.append(article)
+                self.metadata["sources"].append(article.url)
+                self._output(timing)
+                await out.put(article)
+            sources_done += 1
+            self.progress("scraping", {"done": sources_done, "total": len(self.request.urls)})
+
+        try:
+            await asyncio.gather(*(scrape_source(url) for url in self.request.urls))
+        finally:
+            timing.finished = self._now()
+        for _ in range(SCRIPT_SUMMARY_CONCURRENCY):
+            await out.put(_DONE)
+
+    async def _summarize(self, source: asyncio.Queue, out: asyncio.Queue) -> None:
+        timing = self.timings["summarize"]
+
+        async def worker() -> None:
+            while (article := await source.get()) is not _DONE:
+                self._begin(timing)
+                summary = await self.script_generator.summarize_articles(
+                    self.request.topic, [article]
+                )
+                self._summaries_done += 1
+                self._output(timing)
+                self.progress("scripting", {"summarized": self._summaries_done})
+                await out.put(summary[0])
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(SCRIPT_SUMMARY_CONCURRENCY)))
+        finally:
+            timing.finished = self._now()
+        await out.put(_DONE)
+
+    async def _compose(self, source: asyncio.Queue, feed: LineFeed) -> None:
+        timing = self.timings["compose"]
+        section_size = max(1, PIPELINE_SECTION_ARTICLES)
+        # The episode's word budget is shared by the articles still expected
+        # (at most max_articles_per_site per source); the last section gets
+        # what is left if fewer arrive
+        words_left = self.script_generator.episode_words(self.request.duration)
+        articles_left = max(1, len(self.request.urls) * self.request.max_articles_per_site)
+        sections = 0
+        pending: list[str] = []
+        try:
+            while True:
+                # Wait for one summary, then take whatever else is ready (up
+                # to a section), so the next section starts as soon as the
+                # LLM is free
+                item = await source.get()
+                finished = item is _DONE
+                if not finished:
+                    self._begin(timing)
+                    pending.append(item)
+                    while len(pending) < section_size and not source.empty():
+                        item = source.get_nowait()
+                        if item is _DONE:
+                            finished = True
+                            break
+                        pending.append(item)
+
+                if finished and not sections and not pending:
+                    raise NoContentError("No articles found from the provided URLs")
+                if not pending:
+                    # Closing section only: every expected article was covered
+                    words = _MIN_SECTION_WORDS
+                elif finished:
+                    words = words_left
+                else:
+                    words = words_left * len(pending) // max(articles_left, len(pending))
+                words_left = max(0, words_left - words)
+                articles_left = max(0, articles_left - len(pending))
+                await self._write_section(
+                    feed, pending,
+                    words=max(words, _MIN_SECTION_WORDS),
+                    first=sections == 0,
+                    final=finished,
+                )
+                sections += 1
+                pending = []
+                self._output(timing)
+                if finished:
+                    break
+        finally:
+            timing.finished = self._now()
+            self._script_started.set()
+        feed.close()
+
+    async def _write_section(
+        self,
+        feed: LineFeed,
+        summaries: list[str],
+        *,
+        words: int,
+        first: bool,
+        final: bool,
+    ) -> None:
+        previous = "\n".join(self.lines)[-_SECTION_CONTEXT_CHARS:]
+        async for line in self.script_generator.stream_script_section(
+            self.request.duration,
+            self.request.topic,
+            summaries,
+            words=words,
+            first=first,
+            final=final,
+            previous=previous,
+        ):
+            self.lines.append(line)
+            feed.put(line)
+            self._script_started.set()
+
+    async def _synthesize(self, feed: LineFeed) -> None:
+        timing = self.timings["synthesize"]
+        await self._script_started.wait()
+        try:
+            async for chunk in tts_executor.stream(
+                self.tts_generator.stream_lines,
+                feed,
+                progress_callback=lambda done: self.progress(
+                    "synthesizing", {"done": done}
+                ),
+                metadata=self.metadata,
+            ):
+                # The WAV header arrives as soon as the worker starts
+                if timing.started is None:
+                    self._begin(timing)
+                else:
+                    self._output(timing)
+        finally:
+            timing.finished = self._now()
+
+    def _begin(self, timing: StageTiming) -> None:
+        if timing.started is None:
+            timing.started = self._now()
+
+    def _output(self, timing: StageTiming) -> None:
+        timing.items += 1
+        if timing.first_output is None:
+            timing.first_output = self._now()
+
+    def _now(self) -> float:
+        return time.monotonic() - self._origin
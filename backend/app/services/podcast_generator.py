@@ -0,0 +1,189 @@
+"""End-to-end podcast generation: scrape sources, write the script, synthesize audio."""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable
+
+from app.config import PODCAST_MAX_FOLLOW, PODCAST_SCRAPE_CONCURRENCY
+from app.routers.schemas import PodcastRequest, PodcastResponse
+from app.services.errors import NoContentError
+from app.services.executors import tts_executor
+from app.services.pipeline import LineFeed, PodcastPipeline
+from app.services.script_generator import ScriptGeneratorService
+from app.services.tts import TTSGeneratorService
+from app.services.web_tools.dedup import deduplicate
+from app.services.web_tools.scheduler import new_owner
+from app.services.web_tools.schemas import ScrapedArticle
+from app.services.web_tools.scraper import CrawlScraper
+
+logger = logging.getLogger(__name__)
+
+# Called with a stage name ("scraping", "scripting", "synthesizing") and
+# stage-specific details, e.g. {"done": 3, "total": 10} while scraping.
+# It may be invoked from worker threads and may raise to abort generation.
+ProgressCallback = Callable[[str, dict[str, Any]], None]
+
+
+def _noop_progress(stage: str, details: dict[str, Any]) -> None:
+    pass
+
+
+def _episode_metadata(
+    request: PodcastRequest, articles: list[ScrapedArticle]
+) -> dict[str, Any]:
+    return {
+        "topic": request.topic,
+        "duration_minutes": request.duration,
+        "sources": [article.url for article in articles],
+    }
+
+
+class PodcastGeneratorService:
+    """Runs the scrape → script → TTS pipeline for one podcast request."""
+
+    def __init__(self) -> None:
+        self.script_generator = ScriptGeneratorService()
+        self.tts_generator = TTSGeneratorService()
+        self.scraper = CrawlScraper()
+
+    async def generate(
+        self,
+        request: PodcastRequest,
+        progress: ProgressCallback | None = None,
+    ) -> PodcastResponse:
+        """Generate a podcast, reporting stage changes through *progress*.
+
+        The stages run as a pipeline (see ``app.services.pipeline``), so
+        progress reports from different stages interleave.
+
+        Raises:
+            NoContentError: If no article could be scraped from the URLs.
+            ServiceBusyError: If the crawl scheduler or an executor is saturated.
+        """
+        pipeline = PodcastPipeline(
+            request,
+            scraper=self.scraper,
+            script_generator=self.script_generator,
+            tts_generator=self.tts_generator,
+            progress=progress or _noop_progress,
+        )
+        audio_path = await pipeline.run()
+        articles = pipeline.articles
+
+        return PodcastResponse(
+            topic=request.topic,
+            duration=request.duration,
+            script="".join([article.content for article in articles]),
+            sources=[article.url for article in articles],
+            audio_path=audio_path,
+            timings=pipeline.timings_dict(),
+        )
+
+    async def collect_articles(
+        self,
+        request: PodcastRequest,
+        progress: ProgressCallback | None = None,
+    ) -> list[ScrapedArticle]:
+        """Scrape the request's sources.
+
+        Raises:
+            NoContentError: If no article could be scraped from the URLs.
+        """
+        progress = progress or _noop_progress
+        logger.info(f"Generating podcast for topic: {request.topic}")
+        logger.info(f"Using {len(request.urls)} URLs")
+
+        progress("scraping", {"sources": len(request.urls)})
+        articles = await self.scrape_sources(
+            request.urls, request.topic, request.max_articles_per_site
+        )
+
+        if not articles:
+            raise NoContentError("No articles found from the provided URLs")
+
+        logger.info(f"Scraped {len(articles)} articles")
+        return articles
+
+    def stream_script(
+        self, request: PodcastRequest, articles: list[ScrapedArticle]
+    ) -> AsyncIterator[str]:
+        """Yield the script's lines as the LLM writes them."""
+        return self.script_generator.stream_podcast_script(
+            duration=request.duration,
+            topic=request.topic,
+            articles=articles,
+        )
+
+    async def stream_audio(
+        self,
+        request: PodcastRequest,
+        articles: list[ScrapedArticle],
+    ) -> AsyncIterator[bytes]:
+        """Stream the episode as WAV bytes while the script is still being written.
+
+        Script lines are fed to TTS as soon as the LLM completes them, so
+        synthesis overlaps generation instead of waiting for the whole
+        script. The finished episode is saved in the output store.
+        """
+        feed = LineFeed(self.tts_generator.batch_size)
+
+        async def pump() -> None:
+            try:
+                async for line in self.stream_script(request, articles):
+                    feed.put(line)
+            except Exception as e:
+                # Re-raised on the TTS worker, then to the consumer
+                feed.close(e)
+            else:
+                feed.close()
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            async for chunk in tts_executor.stream(
+                self.tts_generator.stream_lines,
+                feed,
+                metadata=_episode_metadata(request, articles),
+            ):
+                yield chunk
+        finally:
+            pump_task.cancel()
+            # Unblock the TTS worker if it is still waiting for lines
+            feed.close(asyncio.CancelledError())
+
+    async def scrape_sources(
+        self, urls: list[str], topic: str, max_articles_per_site: int
+    ) -> list[ScrapedArticle]:
+        """Scrape every source concurrently (bounded), keeping input order.
+
+        Near-duplicate articles across sources are dropped.
+        """
+        self.scraper.check_capacity(len(urls))
+        semaphore = asyncio.Semaphore(PODCAST_SCRAPE_CONCURRENCY)
+        owner = new_owner()
+        per_source = await asyncio.gather(*(
+            self._scrape_source(
+                url, topic,
+                max_articles=max_articles_per_site,
+                semaphore=semaphore,
+                owner=owner,
+            )
+            for url in urls
+        ))
+        return deduplicate([article for articles in per_source for article in articles])
+
+    async def _scrape_source(
+        self,
+        url: str,
+        topic: str,
+        *,
+        max_articles: int,
+        semaphore: asyncio.Semaphore,
+        owner: str,
+    ) -> list[ScrapedArticle]:
+        """Scrape one source URL with its own crawl and article budget."""
+        async with semaphore:
+            logger.info(f"Scraping source: {url}")
+            articles = await self.scraper.scrape_url(
+                url, topic, max_follow=PODCAST_MAX_FOLLOW, owner=owner
+            )
+        return articles[:max_articles]
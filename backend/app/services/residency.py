@@ -0,0 +1,232 @@
+"""Residency manager for in-process models.
+
+Loading a model costs seconds, so models should stay resident between
+requests, but an idle instance should not hold gigabytes of RAM forever.
+:class:`ModelResidency` owns every in-process model (currently the TTS
+processor and model; the LLMs run in separate llama.cpp servers):
+
+- a model is loaded on first :meth:`~ModelResidency.use` and stays
+  resident afterwards, so back-to-back requests pay no reload cost;
+- models unused for ``MODEL_IDLE_TIMEOUT`` seconds are unloaded by a
+  background sweep;
+- loaded models are kept within ``MODEL_RAM_BUDGET_MB``: before a load,
+  the least recently used idle models are unloaded to make room. A model
+  in use is never unloaded; if the budget cannot be met because of them,
+  ``ServiceBusyError`` is raised;
+- residency, sizes and load times are reported by :meth:`stats`.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from app.config import MODEL_IDLE_TIMEOUT, MODEL_RAM_BUDGET_MB
+from app.services.errors import ServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Resident:
+    load: Callable[[], Any]
+    unload: Callable[[Any], None]
+    size: Callable[[Any], int]
+    # Expected size before the first load; replaced by the measured size
+    size_bytes: int = 0
+    model: Any = None
+    users: int = 0
+    last_used: float = 0.0
+    loads: int = 0
+    unloads: int = 0
+    last_load_seconds: float = 0.0
+    total_load_seconds: float = 0.0
+
+
+class ModelResidency:
+    """Keeps hot models loaded within a RAM budget and unloads idle ones."""
+
+    def __init__(
+        self,
+        *,
+        budget_mb: float = MODEL_RAM_BUDGET_MB,
+        idle_timeout: float = MODEL_IDLE_TIMEOUT,
+    ) -> None:
+        self._budget = int(budget_mb * 1024 * 1024)
+        self._idle_timeout = idle_timeout
+        self._residents: dict[str, _Resident] = {}
+        self._lock = threading.Lock()
+        # Serializes loads and unloads (each can take seconds); re-entrant
+        # because a load unloads other models to make room
+        self._load_lock = threading.RLock()
+        self._sweep_task: asyncio.Task | None = None
+
+    def register(
+        self,
+        name: str,
+        load: Callable[[], Any],
+        unload: Callable[[Any], None],
+        *,
+        size: Callable[[Any], int] = lambda model: 0,
+        size_hint: int = 0,
+    ) -> None:
+        """Declare a model; registering an existing *name* is a no-op."""
+        with self._lock:
+            self._residents.setdefault(
+                name, _Resident(load, unload, size, size_bytes=size_hint)
+            )
+
+    def is_loaded(self, name: str) -> bool:
+        with self._lock:
+            return self._residents[name].model is not None
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """Yield the loaded model *name*, loading it first if needed.
+
+        The model cannot be unloaded while the context is open (contexts
+        may be nested).
+
+        Raises:
+            ServiceBusyError: If the RAM budget is taken by models in use.
+        """
+        resident = self._residents[name]
+        with self._lock:
+            resident.users += 1
+            resident.last_used = time.monotonic()
+            model = resident.model
+        try:
+            if model is None:
+                model = self._load(name, resident)
+            yield model
+        finally:
+            with self._lock:
+                resident.users -= 1
+                resident.last_used = time.monotonic()
+
+    def unload_idle(self, idle_for: float | None = None) -> list[str]:
+        """Unload models unused for *idle_for* seconds (default: the idle timeout)."""
+        idle_for = self._idle_timeout if idle_for is None else idle_for
+        with self._load_lock:
+            now = time.monotonic()
+            with self._lock:
+                names = [
+                    name for name, r in self._residents.items()
+                    if r.model is not None and not r.users and now - r.last_used >= idle_for
+                ]
+            for name in names:
+                self._unload(name, self._residents[name], reason="idle")
+        return names
+
+    async def start(self) -> None:
+        """Start the background idle sweep (idempotent)."""
+        if self._sweep_task is None and self._idle_timeout > 0:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def close(self) -> None:
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "budget_bytes": self._budget or None,
+                "resident_bytes": self._resident_bytes(),
+                "idle_timeout": self._idle_timeout,
+                "models": {
+                    name: {
+                        "loaded": r.model is not None,
+                        "in_use": r.users,
+                        "size_bytes": r.size_bytes,
+                        "idle_seconds": round(now - r.last_used, 1) if r.model is not None else None,
+                        "loads": r.loads,
+                        "unloads": r.unloads,
+                        "last_load_seconds": round(r.last_load_seconds, 3),
+                        "avg_load_seconds": round(r.total_load_seconds / r.loads, 3) if r.loads else 0.0,
+                    }
+                    for name, r in self._residents.items()
+                },
+            }
+
+    def _load(self, name: str, resident: _Resident) -> Any:
+        with self._load_lock:
+            if resident.model is not None:
+                return resident.model
+            self._make_room(name, resident.size_bytes)
+
+            start_time = time.monotonic()
+            model = resident.load()
+            elapsed = time.monotonic() - start_time
+            with self._lock:
+                resident.model = model
+                resident.size_bytes = resident.size(model) or resident.size_bytes
+                resident.loads += 1
+                resident.last_load_seconds = elapsed
+                resident.total_load_seconds += elapsed
+            logger.info(
+                "Loaded model %s in %.2fs (%.0f MiB)",
+                name, elapsed, resident.size_bytes / 2**20,
+            )
+            return model
+
+    def _make_room(self, name: str, size: int) -> None:
+        """Unload idle models, least recently used first, until *size* fits."""
+        if not self._budget:
+            return
+        with self._lock:
+            candidates = sorted(
+                (r.last_used, other) for other, r in self._residents.items()
+                if other != name and r.model is not None and not r.users
+            )
+        for _, other in candidates:
+            with self._lock:
+                if self._resident_bytes() + size <= self._budget:
+                    return
+            self._unload(other, self._residents[other], reason="budget")
+
+        with self._lock:
+            over_budget = self._resident_bytes() + size > self._budget
+            in_use = any(r.users and r.model is not None for r in self._residents.values())
+        if over_budget and in_use:
+            raise ServiceBusyError(f"Not enough model memory to load {name}")
+        if over_budget:
+            logger.warning("Model %s exceeds the model RAM budget on its own", name)
+
+    def _unload(self, name: str, resident: _Resident, *, reason: str) -> None:
+        # Never overlaps a load (of this model or of one making room)
+        with self._load_lock:
+            with self._lock:
+                if resident.model is None or resident.users:
+                    return
+                model, resident.model = resident.model, None
+                resident.unloads += 1
+            logger.info("Unloading model %s (%s)", name, reason)
+            try:
+                resident.unload(model)
+            except Exception as e:
+                logger.warning("Unloading model %s failed: %s", name, e)
+
+    def _resident_bytes(self) -> int:
+        return sum(r.size_bytes for r in self._residents.values() if r.model is not None)
+
+    async def _sweep_loop(self) -> None:
+        interval = max(1.0, min(60.0, self._idle_timeout / 4))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.unload_idle)
+            except Exception as e:
+                logger.warning("Model idle sweep failed: %s", e)
+
+
+# Process-wide manager, started and closed by the FastAPI lifespan in main.py
+model_residency = ModelResidency()
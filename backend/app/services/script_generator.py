@@ -1,27 +1,234 @@
-from app.clients.clients import get_model
-import os
-from dotenv import load_dotenv
+from app.clients.clients import chat_completion, stream_chat_completion
+from app.config import (
+    SCRIPT_ARTICLE_MAX_TOKENS,
+    SCRIPT_MAX_TOKENS,
+    SCRIPT_REDUCE_INPUT_TOKENS,
+    SCRIPT_SUMMARY_CONCURRENCY,
+    SCRIPT_SUMMARY_MAX_TOKENS,
+)
+from app.services.web_tools.schemas import ScrapedArticle
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable
 
-load_dotenv()
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used to turn token budgets into text sizes
+_CHARS_PER_TOKEN = 4
+# Spoken words per minute and tokens per word, used to size the final script
+_WORDS_PER_MINUTE = 150
+_TOKENS_PER_WORD = 1.4
 
 
 class ScriptGeneratorService:
-    """Service for generating podcast scripts using a Large Language Model (LLM)."""
-    
+    """Service for generating podcast scripts using a Large Language Model (LLM).
+
+    Scripts are produced map-reduce style: every article is summarized by
+    its own (concurrent) LLM call, summaries are condensed further if they
+    still exceed the composition budget, and a final streamed call writes
+    the script from the summaries (``stream_podcast_script``), yielding
+    lines as soon as they are complete. Each stage has its own token
+    budget, so large article sets never overflow the context window.
+
+    The podcast pipeline (``app.services.pipeline``) instead writes the
+    episode section by section with ``stream_script_section`` as
+    summaries arrive.
+    """
+
     def __init__(self):
-        self.model_path = os.getenv("LIGHT_MODEL_PATH")
-        
-    def generate_podcast_script(self, duration: int, topic: str, news_content: str) -> str:
-        """Genera uno script per podcast basato sul contenuto delle news."""
-        model = get_model(self.model_path)
+        self.concurrency = SCRIPT_SUMMARY_CONCURRENCY
+        self.article_max_tokens = SCRIPT_ARTICLE_MAX_TOKENS
+        self.summary_max_tokens = SCRIPT_SUMMARY_MAX_TOKENS
+        self.reduce_input_tokens = SCRIPT_REDUCE_INPUT_TOKENS
+        self.script_max_tokens = SCRIPT_MAX_TOKENS
+
+    def episode_words(self, duration: int) -> int:
+        """Approximate spoken word count of a *duration*-minute episode."""
+        return duration * _WORDS_PER_MINUTE
+
+    async def stream_podcast_script(
+        self,
+        duration: int,
+        topic: str,
+        articles: list[ScrapedArticle],
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> AsyncIterator[str]:
+        """Summarize *articles* and stream the script, yielding non-empty lines.
+
+        ``progress_callback(done, total)`` is called as article summaries
+        complete.
+        """
+        summaries = await self.summarize_articles(topic, articles, progress_callback)
+        summaries = await self.reduce_summaries(topic, summaries)
+        async for line in self.stream_compose_script(duration, topic, summaries):
+            yield line
+
+    async def summarize_articles(
+        self,
+        topic: str,
+        articles: list[ScrapedArticle],
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> list[str]:
+        """Map stage: summarize every article concurrently (input order kept)."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def summarize(article: ScrapedArticle) -> str:
+            nonlocal done
+            async with semaphore:
+                try:
+                    summary = await self.summarize_article(topic, article)
+                except (httpx.HTTPError, KeyError, IndexError) as e:
+                    # Fall back to the raw (truncated) article so one failed
+                    # call does not sink the whole episode
+                    logger.warning(f"Summarizing {article.url} failed: {e}")
+                    summary = self._fallback_summary(article)
+            done += 1
+            if progress_callback is not None:
+                progress_callback(done, len(articles))
+            return summary
+
+        return list(await asyncio.gather(*(summarize(a) for a in articles)))
+
+    async def summarize_article(self, topic: str, article: ScrapedArticle) -> str:
+        """Summarize one article, keeping the facts relevant to *topic*."""
+        content = article.content[: self.article_max_tokens * _CHARS_PER_TOKEN]
+        messages = [
+            {"role": "system",
+            "content": f"""
+                You are a research assistant preparing notes for a podcast about {topic}.
+
+                IMPORTANT: Do NOT include your thinking process. Output ONLY the notes.
+
+                Summarize the article below in at most {self.summary_max_tokens * 3 // 4} words.
+                Keep the key facts, names, numbers, dates and quotes related to {topic}.
+                Ignore navigation text, ads and unrelated content.
+            """},
+            {"role": "user",
+            "content": f"TITLE: {article.title}\nURL: {article.url}\n\n{content}"},
+        ]
+        response = await chat_completion(messages, max_tokens=self.summary_max_tokens)
+        summary = response["choices"][0]["message"]["content"].strip()
+        return f"SOURCE: {article.url}\n{summary}"
+
+    async def reduce_summaries(self, topic: str, summaries: list[str]) -> list[str]:
+        """Condense groups of summaries until they fit the composition budget."""
+        budget = self.reduce_input_tokens * _CHARS_PER_TOKEN
+        while len(summaries) > 1 and sum(len(s) for s in summaries) > budget:
+            groups: list[list[str]] = [[]]
+            size = 0
+            for summary in summaries:
+                if groups[-1] and size + len(summary) > budget:
+                    groups.append([])
+                    size = 0
+                groups[-1].append(summary)
+                size += len(summary)
+            if len(groups) == len(summaries):
+                # Every summary fills the budget alone: merge pairwise instead
+                groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+
+            logger.info(f"Condensing {len(summaries)} summaries into {len(groups)} groups")
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def condense(group: list[str]) -> str:
+                async with semaphore:
+                    try:
+                        return await self._condense(topic, group)
+                    except (httpx.HTTPError, KeyError, IndexError) as e:
+                        # As in the map stage, one failed call must not sink
+                        # the episode: keep the group's notes, shortened
+                        logger.warning(f"Condensing {len(group)} summaries failed: {e}")
+                        return self._fallback_notes(group, budget // len(groups))
+
+            summaries = list(await asyncio.gather(*(condense(g) for g in groups)))
+        return summaries
+
+    async def stream_compose_script(
+        self, duration: int, topic: str, summaries: list[str]
+    ) -> AsyncIterator[str]:
+        """Stream the reduce stage, yielding each script line once it is complete."""
+        messages, max_tokens = self._compose_request(duration, topic, summaries)
+        async for line in self._stream_lines(messages, max_tokens):
+            yield line
+
+    async def stream_script_section(
+        self,
+        duration: int,
+        topic: str,
+        summaries: list[str],
+        *,
+        words: int,
+        first: bool = False,
+        final: bool = False,
+        previous: str = "",
+    ) -> AsyncIterator[str]:
+        """Stream one section of an episode written section by section.
+
+        The first section opens the show and the final one closes it; the
+        others continue from *previous* (the tail of the script so far).
+        With no summaries the section is a closing segment only.
+        """
+        if first:
+            role = "This is the OPENING section: start with a short introduction to the episode."
+        else:
+            role = "Continue the episode naturally from where it left off. Do NOT greet the audience again."
+        if final:
+            role += " This is the LAST section: end with a brief conclusion and sign-off."
+        else:
+            role += " Do NOT conclude the episode, more sections follow."
+
+        news_content = "\n\n".join(summaries) if summaries else "(no new articles, wrap up the episode)"
+        messages = [
+            {"role": "system",
+            "content": f"""
+                You are a professional podcast host writing one section of an engaging {duration}-minute episode about {topic}.
+
+                IMPORTANT: Do NOT include your thinking process, reasoning, or internal thoughts in the response. Output ONLY the script of this section.
+
+                {role}
+
+                Write about {words} words covering the following notes about recent news articles, with **one person talking**, as if they are speaking directly to the audience.
+
+                NEWS ARTICLES:
+                {news_content}
+
+                END OF THE SCRIPT SO FAR:
+                {previous or "(this is the beginning)"}
+
+                REQUIREMENTS:
+                - Use a conversational, engaging tone
+                - Include natural transitions and personal commentary
+                - Optimize for text-to-speech:
+                - No music cues, stage directions, or special characters
+                - Natural pauses with commas and periods
+                - Spell out numbers and abbreviations
+                - Pronunciation should be clear and natural
+
+                Generate the section now:
+            """}
+        ]
+        max_tokens = min(self.script_max_tokens, int(words * _TOKENS_PER_WORD) + 64)
+        async for line in self._stream_lines(messages, max_tokens):
+            yield line
+
+    def _compose_request(
+        self, duration: int, topic: str, summaries: list[str]
+    ) -> tuple[list[dict[str, Any]], int]:
+        news_content = "\n\n".join(summaries)
+        max_tokens = min(
+            self.script_max_tokens,
+            int(duration * _WORDS_PER_MINUTE * _TOKENS_PER_WORD),
+        )
         messages = [
             {"role": "system",
             "content": f"""
                 You are a professional podcast host creating an engaging {duration}-minute episode about {topic}.
-                
+
                 IMPORTANT: Do NOT include your thinking process, reasoning, or internal thoughts in the response. Output ONLY the final podcast script.
 
-                Based on the following recent news articles, create a natural, conversational podcast script with **one person talking**, as if they are speaking directly to the audience.
+                Based on the following notes about recent news articles, create a natural, conversational podcast script with **one person talking**, as if they are speaking directly to the audience.
 
                 NEWS ARTICLES:
                 {news_content}
@@ -39,6 +246,44 @@ class ScriptGeneratorService:
                 Generate the complete podcast script now:
             """}
         ]
-        response = model.create_chat_completion(messages=messages)
-        self.llm_service.empty_gpu_cache(model=model)
-        return response["choices"][0]["message"]["content"].strip()
\ No newline at end of file
+        return messages, max_tokens
+
+    async def _condense(self, topic: str, summaries: list[str]) -> str:
+        notes = "\n\n".join(summaries)
+        messages = [
+            {"role": "system",
+            "content": f"""
+                You are a research assistant preparing notes for a podcast about {topic}.
+
+                IMPORTANT: Do NOT include your thinking process. Output ONLY the notes.
+
+                Merge the notes below into one set of notes of at most {self.summary_max_tokens * 3 // 4} words.
+                Keep the most important facts and every SOURCE line.
+            """},
+            {"role": "user", "content": notes},
+        ]
+        response = await chat_completion(messages, max_tokens=self.summary_max_tokens)
+        return response["choices"][0]["message"]["content"].strip()
+
+    def _fallback_summary(self, article: ScrapedArticle) -> str:
+        content = article.content[: self.summary_max_tokens * _CHARS_PER_TOKEN]
+        return f"SOURCE: {article.url}\n{content}"
+
+    def _fallback_notes(self, summaries: list[str], max_chars: int) -> str:
+        # Concatenate the summaries, each cut to an equal share of the
+        # group's part of the budget (SOURCE lines come first and survive)
+        share = max(1, (max_chars - 2 * (len(summaries) - 1)) // len(summaries))
+        return "\n\n".join(summary[:share] for summary in summaries)
+
+    async def _stream_lines(
+        self, messages: list[dict[str, Any]], max_tokens: int
+    ) -> AsyncIterator[str]:
+        buffer = ""
+        async for delta in stream_chat_completion(messages, max_tokens=max_tokens):
+            buffer += delta
+            *complete, buffer = buffer.split("\n")
+            for line in complete:
+                if line.strip():
+                    yield line.strip()
+        if buffer.strip():
+            yield buffer.strip()
@@ -0,0 +1,116 @@
+"""Split a podcast script into TTS-sized chunks.
+
+LLM scripts mix one-word lines with whole paragraphs. Lines are split into
+sentences, over-long sentences are split at clause boundaries (then between
+words), and sentences are packed greedily into chunks of at most
+``TTS_CHUNK_MAX_CHARS`` characters. A paragraph (script line) boundary ends
+a chunk once it holds ``TTS_CHUNK_MIN_CHARS``, so short lines are merged
+while longer paragraphs keep their own chunks.
+
+Each chunk carries the silence to insert after it: ``TTS_PARAGRAPH_PAUSE``
+at the end of a paragraph (also when a short paragraph tail is only
+flushed once the next paragraph does not fit after it),
+``TTS_SENTENCE_PAUSE`` otherwise.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+from app.config import (
+    TTS_CHUNK_MAX_CHARS,
+    TTS_CHUNK_MIN_CHARS,
+    TTS_PARAGRAPH_PAUSE,
+    TTS_SENTENCE_PAUSE,
+)
+
+# Sentence end: terminal punctuation (and closing quotes), then whitespace
+# not followed by a lower-case word
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"')\]]*\s+(?![a-z])")
+_CLAUSE_END = re.compile(r"(?<=[,;:—])\s+")
+# Words whose trailing period does not end a sentence ("no." is left out:
+# "The answer is no. Next" is far more common in scripts than "No. 5")
+_ABBREVIATIONS = frozenset(
+    "mr mrs ms dr prof sr jr st vs etc inc ltd co corp e.g i.e u.s u.k".split()
+)
+
+
+@dataclass
+class Chunk:
+    """Text for one TTS call and the silence (seconds) that follows it."""
+    text: str
+    pause: float
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split *text* into sentences, keeping common abbreviations intact."""
+    sentences: list[str] = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        candidate = text[start:match.start()]
+        last_word = candidate.rsplit(maxsplit=1)[-1] if candidate.split() else ""
+        if last_word.rstrip(".").lower() in _ABBREVIATIONS:
+            continue
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    if text[start:].strip():
+        sentences.append(text[start:].strip())
+    return sentences
+
+
+def _split_long(sentence: str, max_chars: int) -> list[str]:
+    """Split a sentence longer than *max_chars* at clauses, then words."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces = _pack(_CLAUSE_END.split(sentence), max_chars)
+    if all(len(p) <= max_chars for p in pieces):
+        return pieces
+    return [
+        part for piece in pieces
+        for part in (_pack(piece.split(), max_chars) if len(piece) > max_chars else [piece])
+    ]
+
+
+def _pack(parts: list[str], max_chars: int) -> list[str]:
+    """Join consecutive *parts* with spaces into pieces of up to *max_chars*."""
+    pieces: list[str] = []
+    for part in parts:
+        if pieces and len(pieces[-1]) + 1 + len(part) <= max_chars:
+            pieces[-1] += " " + part
+        else:
+            pieces.append(part)
+    return pieces
+
+
+def segment_script(
+    lines: Iterable[str],
+    *,
+    max_chars: int = TTS_CHUNK_MAX_CHARS,
+    min_chars: int = TTS_CHUNK_MIN_CHARS,
+    sentence_pause: float = TTS_SENTENCE_PAUSE,
+    paragraph_pause: float = TTS_PARAGRAPH_PAUSE,
+) -> list[Chunk]:
+    """Pack the sentences of the script *lines* into TTS chunks."""
+    chunks: list[Chunk] = []
+    current = ""
+    # *current* ends at a paragraph boundary (a tail kept to be merged)
+    at_paragraph_end = False
+
+    def flush(pause: float) -> None:
+        nonlocal current
+        if current:
+            chunks.append(Chunk(current, pause))
+            current = ""
+
+    for line in lines:
+        for sentence in split_sentences(line.strip()):
+            for piece in _split_long(sentence, max_chars):
+                if current and len(current) + 1 + len(piece) > max_chars:
+                    flush(paragraph_pause if at_paragraph_end else sentence_pause)
+                current = f"{current} {piece}" if current else piece
+                at_paragraph_end = False
+        if len(current) >= min_chars:
+            flush(paragraph_pause)
+        at_paragraph_end = bool(current)
+    flush(paragraph_pause)
+    return chunks
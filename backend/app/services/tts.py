@@ -1,65 +1,453 @@
-from app.services.llm import LLMService
+import functools
+import gc
+import itertools
 import logging
 import time
-import torch
 import numpy as np
-import scipy.io.wavfile
 import os
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Iterable, Iterator
 from dotenv import load_dotenv
 
+from app.config import PODCASTS_OUTPUT_PATH, TTS_BATCH_SIZE, TTS_SEED
+from app.services.audio import (
+    RunningPeakNormalizer,
+    WavFileWriter,
+    silence,
+    streaming_wav_header,
+    to_pcm16,
+)
+from app.services.output_store import PodcastOutputStore
+from app.services.residency import ModelResidency, model_residency
+from app.services.segmentation import segment_script
+from app.services.tts_cache import SegmentCache, segment_cache
+from app.services.tts_workers import TTSWorkerPool, tts_worker_pool
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Seeded generate calls draw from torch's process-wide RNG: run them one at
+# a time so concurrent episodes cannot interleave their draws
+_seeded_generate_lock = threading.Lock()
+
+
+def generate_speech(
+    processor: Any,
+    model: Any,
+    device: str,
+    texts: list[str],
+    seed: int | None = None,
+) -> list[np.ndarray]:
+    """Run one ``generate`` call over *texts* and split the padded output.
+
+    With a *seed* the call samples from a freshly seeded RNG (``generate``
+    takes no ``torch.Generator``, so the global RNG is forked for the call
+    and restored afterwards), making its output reproducible.
+    """
+    import torch
+
+    inputs = processor(
+        text=texts,
+        return_tensors="pt",
+    )
+    inputs = {key: value.to(device) for key, value in inputs.items()}
+
+    if seed is None:
+        return _generate(model, inputs, len(texts))
+    devices = None if str(device).startswith("cuda") else []
+    with _seeded_generate_lock, torch.random.fork_rng(devices=devices):
+        torch.manual_seed(seed)
+        return _generate(model, inputs, len(texts))
+
+
+def _generate(model: Any, inputs: dict[str, Any], count: int) -> list[np.ndarray]:
+    if count == 1:
+        speech_values = model.generate(**inputs, do_sample=True)
+        return [speech_values.cpu().float().numpy().squeeze()]
+
+    speech_values, lengths = model.generate(
+        **inputs, do_sample=True, return_output_lengths=True
+    )
+    audio = speech_values.cpu().float().numpy()
+    return [audio[row, : int(length)] for row, length in enumerate(lengths)]
+
+
+@dataclass
+class TTSModel:
+    processor: Any
+    model: Any
+    device: str
+    llm_service: Any
+
+
+def _load_tts_model(model_path: str | None, device: str | None = None) -> TTSModel:
+    from app.services.llm import LLMService
+
+    llm_service = LLMService()
+    processor, model, default_device = llm_service.get_tts_model(model_path)
+    device = device or default_device
+    logger.info(f"Moving model to {device}...")
+    model.to(device)
+    return TTSModel(processor, model, device, llm_service)
+
+
+def _unload_tts_model(tts: TTSModel) -> None:
+    tts.llm_service.empty_tts_model_cache(tts.model)
+    gc.collect()
+
+
+def _tts_model_bytes(tts: TTSModel) -> int:
+    try:
+        tensors = itertools.chain(tts.model.parameters(), tts.model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    except AttributeError:
+        return 0
+
+
+def _dir_bytes(path: str | None) -> int:
+    """Size of the files under *path*, a first estimate of a model's RAM use."""
+    if not path or not os.path.isdir(path):
+        return 0
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
 
 class TTSGeneratorService:
-    """Service for generating podcast audio from a given script using Text-to-Speech."""
+    """Service for generating podcast audio from a given script using Text-to-Speech.
+
+    The processor and model (and torch) are loaded on first use, or
+    ahead of time by :meth:`warm_up`, and are then kept on their device by
+    the residency manager (see ``app/services/residency.py``) until idle.
+    With a worker pool (``TTS_WORKERS > 0``) segments are synthesized by
+    the pool's processes and no model is loaded in this process.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        workers: TTSWorkerPool | None = tts_worker_pool,
+        residency: ModelResidency = model_residency,
+        device: str | None = None,
+    ):
         self.model_id = os.getenv("TTS_MODEL_ID")
         self.model_path = os.getenv("TTS_MODEL_PATH")
-        self.output_path = os.getenv("PODCASTS_OUTPUT_PATH")
-        self.llm_service = LLMService()
-        self.processor, self.model, self.device = self.llm_service.get_tts_model(self.model_path)
+        self.output_path = PODCASTS_OUTPUT_PATH
+        self.output_store = PodcastOutputStore(self.output_path)
+        self.workers = workers
+        self.residency = residency
+        self._resident = f"tts:{self.model_id or self.model_path}:{device or 'auto'}"
+        self._sample_rate: int | None = None
+        if self.workers is None:
+            self.residency.register(
+                self._resident,
+                functools.partial(_load_tts_model, self.model_path, device),
+                _unload_tts_model,
+                size=_tts_model_bytes,
+                size_hint=_dir_bytes(self.model_path),
+            )
+        self.batch_size = TTS_BATCH_SIZE
+        # Seeded sampling makes segments reproducible, hence cacheable
+        # (segment_cache is None unless TTS_SEED is set)
+        self.seed = TTS_SEED
+        self.segment_cache = segment_cache
     
-    def generate_audio(self, script: str) -> str:
-        """Generate audio from the provided script and save it to a file."""
-        logger.info(f"Moving model to {self.device}...")
-        self.model.to(self.device)
-        
-        sampling_rate = self.model.generation_config.sample_rate
+    def generate_audio(
+        self,
+        script: str,
+        progress_callback: Callable[[int, int], None] | None = None,
+        batch_size: int | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> str:
+        """Generate audio from the provided script and save it to a file.
+
+        Returns the stored episode's path; an identical script synthesized
+        earlier with the same model is returned without running TTS.
+        If given, ``progress_callback(done, total)`` is called after each
+        segment (or batch of segments); an exception raised by it aborts
+        the generation. ``batch_size`` overrides ``TTS_BATCH_SIZE``.
+        """
+        for _ in self.stream_episode(
+            script,
+            progress_callback=progress_callback,
+            batch_size=batch_size,
+            metadata=metadata,
+            bucketed=True,
+        ):
+            pass
+        return self.episode_path(script)
+
+    def episode_path(self, script: str) -> str:
+        """Return the path the episode for *script* is (or will be) stored at."""
+        return self.output_store.audio_path(self._episode_key(script))
+
+    def stream_episode(
+        self,
+        script: str,
+        progress_callback: Callable[[int, int], None] | None = None,
+        batch_size: int | None = None,
+        metadata: dict[str, Any] | None = None,
+        bucketed: bool = False,
+    ) -> Iterator[bytes]:
+        """Yield the episode for *script* as WAV bytes.
+
+        A stored episode is read back from disk; otherwise the script is
+        synthesized progressively into a temporary file that is published
+        in the output store once complete. Concurrent requests for the
+        same episode wait for the first one and then reuse its result.
+        """
+        key = self._episode_key(script)
+        with self.output_store.lock(key):
+            stored = self.output_store.get(key)
+            if stored is None:
+                with self.output_store.writing(key) as tmp_path:
+                    yield from self.generate_audio_stream(
+                        script,
+                        tmp_path,
+                        progress_callback=progress_callback,
+                        batch_size=batch_size,
+                        bucketed=bucketed,
+                    )
+                    self.output_store.commit(key, tmp_path, metadata)
+                return
+
+        logger.info(f"Reusing stored episode {stored.audio_path}")
+        with open(stored.audio_path, "rb") as f:
+            while chunk := f.read(64 * 1024):
+                yield chunk
+
+    def generate_audio_stream(
+        self,
+        script: str,
+        final_path: str,
+        progress_callback: Callable[[int, int], None] | None = None,
+        batch_size: int | None = None,
+        bucketed: bool = False,
+    ) -> Iterator[bytes]:
+        """Synthesize *script* progressively.
 
-        lines = [line.strip() for line in script.strip().splitlines() if line.strip()]
-        full_audio_pieces = []
+        The script is segmented into sentence-aligned chunks (see
+        :mod:`app.services.segmentation`), one TTS segment each. Yields a
+        streamable WAV (header first, then 16-bit PCM for each chunk, plus
+        its trailing silence, as soon as it is ready) while appending the
+        same audio to *final_path*. Segments are normalized with a running
+        peak, so the full waveform never has to be held in memory.
+        """
+        sampling_rate = self.sampling_rate
 
-        logger.info(f"Starting generation for {len(lines)} segments...")
+        chunks = segment_script(script.strip().splitlines())
+
+        logger.info(f"Starting generation for {len(chunks)} segments...")
         total_start_time = time.time()
 
-        for i, line in enumerate(lines):
-            logger.info(f"[{i+1}/{len(lines)}] Generating: {line[:50]}...")
-            start_time = time.time()
-            
-            inputs = self.processor(
-                text=[line],
-                return_tensors="pt",
+        normalize = RunningPeakNormalizer()
+        # Keep the model resident for the whole episode
+        with self._use_model():
+            with WavFileWriter(final_path, sampling_rate) as writer:
+                yield streaming_wav_header(sampling_rate)
+                for chunk, segment in zip(chunks, self.iter_segments(
+                    [chunk.text for chunk in chunks],
+                    batch_size=batch_size or self.batch_size,
+                    progress_callback=progress_callback,
+                    bucketed=bucketed,
+                )):
+                    pcm = to_pcm16(normalize(segment)) + silence(chunk.pause, sampling_rate)
+                    writer.write(pcm)
+                    yield pcm
+
+        logger.info("Total time of generation: %.2f seconds" % (time.time() - total_start_time))
+        logger.info(f"Audio saved to {final_path}.")
+
+    def stream_lines(
+        self,
+        line_batches: Iterable[list[str]],
+        progress_callback: Callable[[int], None] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Iterator[bytes]:
+        """Synthesize a script whose lines are still being written.
+
+        *line_batches* yields groups of consecutive script lines as they
+        become available (it may block while the LLM is generating); each
+        group is segmented into chunks, synthesized in script order and
+        streamed as WAV bytes right away. Once the script is complete the
+        episode is published in the output store under the address of the
+        full script.
+        ``progress_callback(done)`` is called with the number of lines
+        synthesized so far (the total is unknown until the script ends).
+        """
+        sampling_rate = self.sampling_rate
+
+        lines: list[str] = []
+        normalize = RunningPeakNormalizer()
+        total_start_time = time.time()
+        with self.output_store.writing("streaming") as tmp_path:
+            with self._use_model():
+                with WavFileWriter(tmp_path, sampling_rate) as writer:
+                    yield streaming_wav_header(sampling_rate)
+                    for batch in line_batches:
+                        batch = [line.strip() for line in batch if line.strip()]
+                        lines.extend(batch)
+                        chunks = segment_script(batch)
+                        for chunk, segment in zip(chunks, self.iter_segments(
+                            [chunk.text for chunk in chunks],
+                            batch_size=self.batch_size,
+                            bucketed=False,
+                        )):
+                            pcm = to_pcm16(normalize(segment)) + silence(
+                                chunk.pause, sampling_rate
+                            )
+                            writer.write(pcm)
+                            yield pcm
+                        if progress_callback is not None and batch:
+                            progress_callback(len(lines))
+
+            logger.info(
+                "Total time of generation: %.2f seconds" % (time.time() - total_start_time)
+            )
+            key = self._episode_key("\n".join(lines))
+            with self.output_store.lock(key):
+                if self.output_store.get(key) is None:
+                    self.output_store.commit(key, tmp_path, metadata)
+
+    @property
+    def loaded(self) -> bool:
+        if self.workers is not None:
+            return self.workers.started
+        return self.residency.is_loaded(self._resident)
+
+    def load(self) -> None:
+        """Make the TTS processor and model resident unless they already are."""
+        if self.workers is None:
+            with self._use_model():
+                pass
+
+    def warm_up(self) -> None:
+        """Load the model now (or start the worker pool) instead of on first use."""
+        if self.workers is not None:
+            self.workers.warm_up()
+        else:
+            self.load()
+
+    @property
+    def sampling_rate(self) -> int:
+        if self.workers is not None:
+            return self.workers.sample_rate
+        if self._sample_rate is None:
+            with self._use_model() as tts:
+                self._sample_rate = tts.model.generation_config.sample_rate
+        return self._sample_rate
+
+    def _episode_key(self, script: str) -> str:
+        return PodcastOutputStore.key(script, self.model_id, self.sampling_rate)
+
+    def _use_model(self) -> ContextManager[TTSModel | None]:
+        """Pin the resident model (loading it if needed); None with a worker pool."""
+        if self.workers is not None:
+            return nullcontext()
+        return self.residency.use(self._resident)
+
+    def synthesize_lines(
+        self,
+        lines: list[str],
+        batch_size: int = 1,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> list[np.ndarray]:
+        """Synthesize each line and return all audio segments in input order."""
+        return list(self.iter_segments(
+            lines, batch_size=batch_size, progress_callback=progress_callback
+        ))
+
+    def iter_segments(
+        self,
+        lines: list[str],
+        batch_size: int = 1,
+        progress_callback: Callable[[int, int], None] | None = None,
+        bucketed: bool = True,
+    ) -> Iterator[np.ndarray]:
+        """Yield one audio segment per line, in input order, as they complete.
+
+        With ``batch_size > 1`` each ``generate`` call processes a whole
+        batch. When *bucketed*, lines are sorted by length so batches hold
+        lines of similar length (little padding waste); segments are then
+        yielded as soon as every earlier line is done. Without bucketing,
+        batches follow script order, which minimizes time to first audio.
+        With a worker pool, batches are synthesized in parallel across the
+        pool's processes.
+
+        In deterministic mode (``TTS_SEED`` set) each ``generate`` call is
+        seeded, so a line's audio depends on the seed and on the batch it
+        was synthesized in. With the segment cache enabled, lines found in
+        the cache are spliced in and the misses are synthesized one per
+        call (``batch_size`` is ignored), so every cached segment is the
+        reproducible audio of its line alone.
+        """
+        ready: dict[int, np.ndarray] = {}
+        keys: dict[int, str] = {}
+        if self.segment_cache is not None:
+            for i, line in enumerate(lines):
+                keys[i] = SegmentCache.key(line, self.model_id, self.seed)
+                cached = self.segment_cache.get(keys[i])
+                if cached is not None:
+                    ready[i] = np.asarray(cached, dtype=np.float32)
+            logger.info(
+                "Segment cache: %d/%d lines reused (overall hit ratio %.1f%%)",
+                len(ready), len(lines), self.segment_cache.stats()["hit_ratio"] * 100,
             )
 
-            inputs = {key: value.to(self.device) for key, value in inputs.items()}
-            speech_values = self.model.generate(**inputs, do_sample=True)
-            audio_segment = speech_values.cpu().float().numpy().squeeze()
+        pending = [i for i in range(len(lines)) if i not in ready]
+        if self.segment_cache is not None:
+            batch_size = 1
+        if batch_size > 1 and bucketed:
+            pending.sort(key=lambda i: len(lines[i]))
+        size = max(1, batch_size)
+        batches = [pending[start:start + size] for start in range(0, len(pending), size)]
 
-            full_audio_pieces.append(audio_segment)
-            
+        next_index = 0
+        done = len(ready)
+        while next_index in ready:
+            yield ready.pop(next_index)
+            next_index += 1
+
+        start_time = time.time()
+        for batch, audios in self._run_batches(batches, lines):
+            for i in batch:
+                logger.info(f"[{i+1}/{len(lines)}] Generated: {lines[i][:50]}...")
+
+            for i, audio in zip(batch, audios):
+                ready[i] = audio
+                if self.segment_cache is not None:
+                    self.segment_cache.put(keys[i], audio)
+
+            done += len(batch)
             logger.info("Time of generation: %.2f seconds" % (time.time() - start_time))
+            start_time = time.time()
+            if progress_callback is not None:
+                progress_callback(done, len(lines))
 
-        final_audio = np.concatenate(full_audio_pieces)
-        logger.info("Total time of generation: %.2f seconds" % (time.time() - total_start_time))
+            while next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
 
-        max_val = np.abs(final_audio).max()
-        if max_val > 0:
-            final_audio = final_audio / max_val
+    def _run_batches(
+        self, batches: list[list[int]], lines: list[str]
+    ) -> Iterator[tuple[list[int], list[np.ndarray]]]:
+        """Synthesize each batch of line indices, yielding ``(batch, audio)``.
 
-        final_path = os.path.join(self.output_path, "bark_out_final.wav")
-        scipy.io.wavfile.write(final_path, rate=sampling_rate, data=final_audio)
-        logger.info(f"Audio saved to {final_path}.")
-        self.llm_service.empty_tts_model_cache(self.model)
-        return final_path
\ No newline at end of file
+        In-process batches run one after the other; with a worker pool
+        they run concurrently and are yielded in completion order.
+        """
+        texts = [[lines[i] for i in batch] for batch in batches]
+        if self.workers is None:
+            for batch, batch_texts in zip(batches, texts):
+                yield batch, self._generate_batch(batch_texts)
+            return
+        for index, audios in self.workers.map_batches(texts, self.seed):
+            yield batches[index], audios
+
+    def _generate_batch(self, texts: list[str]) -> list[np.ndarray]:
+        """Run one ``generate`` call over *texts* and split the padded output."""
+        with self._use_model() as tts:
+            return generate_speech(tts.processor, tts.model, tts.device, texts, self.seed)
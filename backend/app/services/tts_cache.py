@@ -0,0 +1,151 @@
+"""On-disk cache of synthesized TTS segments.
+
+Recurring podcast lines (intros, outros, boilerplate) are synthesized once
+and spliced in from the cache afterwards. Segments are keyed by the
+normalized line text, the TTS model id and the sampling seed; they are only
+reusable when sampling is seeded (``TTS_SEED``), otherwise every call is
+expected to sound different. Batched generation makes a line's audio depend
+on its batch-mates, so cached lines are synthesized one per ``generate``
+call.
+
+Each segment is a float16 ``.npy`` file sharded into sub-directories by key
+prefix and memory-mapped on read. The total size is bounded with LRU
+eviction, and hit/miss counters are reported through logs and ``stats()``.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import unicodedata
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from app.config import (
+    TTS_SEED,
+    TTS_SEGMENT_CACHE_ENABLED,
+    TTS_SEGMENT_CACHE_MAX_BYTES,
+    TTS_SEGMENT_CACHE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_line(text: str) -> str:
+    """Canonical form of a script line used for cache keys."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class SegmentCache:
+    """LRU-bounded store of audio segments as memory-mapped ``.npy`` shards."""
+
+    def __init__(
+        self,
+        root: str = TTS_SEGMENT_CACHE_PATH,
+        *,
+        max_bytes: int = TTS_SEGMENT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.root = root
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def key(text: str, model_id: str | None, seed: int) -> str:
+        payload = f"{model_id or ''}\n{seed}\n{normalize_line(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Return the cached segment for *key* (memory-mapped), if any."""
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+        try:
+            audio = np.load(self._path(key), mmap_mode="r")
+            # Persist recency so the LRU order survives restarts
+            os.utime(self._path(key))
+        except (OSError, ValueError):
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return audio
+
+    def put(self, key: str, audio: np.ndarray) -> None:
+        """Store a segment, evicting least-recently-used ones if needed."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.npy"
+        np.save(tmp_path, np.asarray(audio, dtype=np.float16))
+        os.replace(tmp_path, path)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self._forget(key)
+            self._index[key] = size
+            self._bytes += size
+            self._evict()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.npy")
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from file modification times."""
+        entries = []
+        for shard in os.listdir(self.root):
+            shard_dir = os.path.join(self.root, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if not name.endswith(".npy") or name.endswith(".tmp.npy"):
+                    continue
+                stat = os.stat(os.path.join(shard_dir, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._evict()
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+
+# Process-wide cache used by TTSGeneratorService (None when disabled or
+# when sampling is not seeded)
+segment_cache: SegmentCache | None = (
+    SegmentCache() if TTS_SEGMENT_CACHE_ENABLED and TTS_SEED is not None else None
+)
@@ -0,0 +1,163 @@
+"""Multi-process TTS worker farm for CPU-only hosts.
+
+A single TTS model runs one ``generate`` call at a time, so on a many-core
+CPU most cores sit idle. With ``TTS_WORKERS > 0``, :class:`TTSWorkerPool`
+starts that many worker processes, each loading its own model instance and
+limited to ``TTS_WORKER_THREADS`` torch threads (by default the CPU cores
+are divided evenly between workers).
+
+Script segments are sharded across the workers batch by batch and handed
+back with their batch index, so :class:`~app.services.tts.TTSGeneratorService`
+reassembles the audio in script order. Each caller keeps at most one batch
+per worker in flight: a single long episode can use every worker, and
+several concurrent episodes (``TTS_EXECUTOR_WORKERS > 1``) share them
+fairly instead of queueing behind each other.
+
+Workers are spawned (not forked) on first use or by
+:meth:`TTSWorkerPool.warm_up`, and load the model then.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Iterator
+
+import numpy as np
+
+from app.config import TTS_WORKER_THREADS, TTS_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Model loaded by each worker process (see _init_worker)
+_worker_model: tuple[Any, Any, str] | None = None
+
+
+def _init_worker(model_path: str | None, threads: int) -> None:
+    global _worker_model
+    import torch
+
+    from app.services.llm import LLMService
+
+    torch.set_num_threads(threads)
+    processor, model, device = LLMService().get_tts_model(model_path)
+    model.to(device)
+    _worker_model = processor, model, device
+    logger.info(f"TTS worker {os.getpid()} ready ({threads} threads, {device})")
+
+
+def _synthesize(texts: list[str], seed: int | None) -> list[np.ndarray]:
+    from app.services.tts import generate_speech
+
+    processor, model, device = _worker_model
+    return generate_speech(processor, model, device, texts, seed)
+
+
+def _sample_rate() -> int:
+    return _worker_model[1].generation_config.sample_rate
+
+
+class TTSWorkerPool:
+    """Process pool of TTS models with in-order batch sharding."""
+
+    def __init__(
+        self,
+        num_workers: int = TTS_WORKERS,
+        threads_per_worker: int = TTS_WORKER_THREADS,
+        model_path: str | None = None,
+    ) -> None:
+        self.num_workers = max(1, num_workers)
+        self.threads_per_worker = threads_per_worker or max(
+            1, (os.cpu_count() or 1) // self.num_workers
+        )
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_path or os.getenv("TTS_MODEL_PATH"), self.threads_per_worker),
+        )
+        self._lock = threading.Lock()
+        self._sample_rate: int | None = None
+        self._in_flight = 0
+        self.batches = 0
+        self.segments = 0
+
+    @property
+    def sample_rate(self) -> int:
+        """Output sampling rate of the workers' model (starts a worker)."""
+        if self._sample_rate is None:
+            self._sample_rate = self._executor.submit(_sample_rate).result()
+        return self._sample_rate
+
+    @property
+    def started(self) -> bool:
+        return self._sample_rate is not None
+
+    def warm_up(self) -> None:
+        """Start every worker and wait until their models are loaded."""
+        futures = [self._executor.submit(_sample_rate) for _ in range(self.num_workers)]
+        self._sample_rate = futures[0].result()
+        for future in futures[1:]:
+            future.result()
+
+    def map_batches(
+        self, batches: list[list[str]], seed: int | None = None
+    ) -> Iterator[tuple[int, list[np.ndarray]]]:
+        """Synthesize *batches* on the workers.
+
+        Yields ``(batch index, audio segments)`` in completion order, keeping
+        at most ``num_workers`` batches of this call in flight. Pending
+        batches are cancelled if the consumer stops early.
+        """
+        queued = deque(enumerate(batches))
+        running: dict[Future, int] = {}
+        try:
+            while queued or running:
+                while queued and len(running) < self.num_workers:
+                    index, texts = queued.popleft()
+                    running[self._executor.submit(_synthesize, texts, seed)] = index
+                    with self._lock:
+                        self._in_flight += 1
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    with self._lock:
+                        self._in_flight -= 1
+                        self.batches += 1
+                        self.segments += len(batches[index])
+                    yield index, future.result()
+        finally:
+            for future in running:
+                if future.cancel():
+                    self._batch_done(future)
+                else:
+                    # Already running on a worker: counted until it ends
+                    future.add_done_callback(self._batch_done)
+
+    def _batch_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.num_workers,
+                "threads_per_worker": self.threads_per_worker,
+                "in_flight": self._in_flight,
+                "batches": self.batches,
+                "segments": self.segments,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide pool used by TTSGeneratorService (None unless TTS_WORKERS > 0);
+# spawned workers re-import this module and must not create their own
+tts_worker_pool: TTSWorkerPool | None = (
+    TTSWorkerPool()
+    if TTS_WORKERS > 0 and multiprocessing.parent_process() is None
+    else None
+)
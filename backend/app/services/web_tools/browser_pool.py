@@ -0,0 +1,138 @@
+"""Long-lived pool of headless browsers shared by the crawlers.
+
+Launching Chromium costs seconds and hundreds of MB per instance, so the
+pool starts a fixed number of ``AsyncWebCrawler`` instances once (from the
+application ``lifespan``) and hands them out per crawl. Each browser serves
+up to ``contexts_per_browser`` concurrent crawls (crawl4ai opens a fresh
+page per ``arun`` call); requests beyond that wait in a FIFO queue.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from app.config import (
+    BROWSER_ACQUIRE_TIMEOUT,
+    BROWSER_CONTEXTS_PER_BROWSER,
+    BROWSER_POOL_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """A fixed-size pool of started ``AsyncWebCrawler`` instances.
+
+    Usage::
+
+        async with browser_pool.acquire() as crawler:
+            result = await crawler.arun(url=url, config=config)
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        contexts_per_browser: int = BROWSER_CONTEXTS_PER_BROWSER,
+        *,
+        browser_cfg: BrowserConfig | None = None,
+        acquire_timeout: float = BROWSER_ACQUIRE_TIMEOUT,
+    ) -> None:
+        self._size = max(1, size)
+        self._contexts = max(1, contexts_per_browser)
+        self._browser_cfg = browser_cfg or BrowserConfig(
+            headless=True,
+            verbose=False,
+            text_mode=True,
+        )
+        self._acquire_timeout = acquire_timeout
+        self._crawlers: list[AsyncWebCrawler] = []
+        self._slots: asyncio.Queue[AsyncWebCrawler] | None = None
+        self._start_lock = asyncio.Lock()
+        self._waiting = 0
+
+    @property
+    def started(self) -> bool:
+        return self._slots is not None
+
+    async def start(self) -> None:
+        """Launch every browser in the pool (idempotent)."""
+        async with self._start_lock:
+            if self._slots is not None:
+                return
+            logger.info(
+                "Starting browser pool: %d browsers x %d contexts",
+                self._size, self._contexts,
+            )
+            crawlers = [
+                AsyncWebCrawler(config=self._browser_cfg)
+                for _ in range(self._size)
+            ]
+            await asyncio.gather(*(c.start() for c in crawlers))
+
+            # Interleave slots so consecutive acquisitions spread across browsers
+            slots: asyncio.Queue[AsyncWebCrawler] = asyncio.Queue()
+            for _ in range(self._contexts):
+                for crawler in crawlers:
+                    slots.put_nowait(crawler)
+
+            self._crawlers = crawlers
+            self._slots = slots
+
+    async def close(self) -> None:
+        """Shut down every browser in the pool."""
+        async with self._start_lock:
+            crawlers, self._crawlers, self._slots = self._crawlers, [], None
+            results = await asyncio.gather(
+                *(c.close() for c in crawlers), return_exceptions=True
+            )
+            for r in results:
+                if isinstance(r, BaseException):
+                    logger.warning("Error closing browser: %s", r)
+            if crawlers:
+                logger.info("Browser pool closed")
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AsyncWebCrawler]:
+        """Borrow a crawler for one crawl, waiting for a free context.
+
+        The pool is started lazily if the application lifespan did not
+        start it (e.g. when a service is run as a standalone script).
+        """
+        if self._slots is None:
+            await self.start()
+        slots = self._slots
+        assert slots is not None
+
+        self._waiting += 1
+        try:
+            crawler = await asyncio.wait_for(
+                slots.get(), timeout=self._acquire_timeout
+            )
+        finally:
+            self._waiting -= 1
+
+        try:
+            yield crawler
+        finally:
+            # Only return the slot to the queue it came from: after close()
+            # or a restart the old crawler must not leak into the new pool.
+            if self._slots is slots:
+                slots.put_nowait(crawler)
+
+    def stats(self) -> dict[str, int]:
+        """Return current pool occupancy."""
+        free = self._slots.qsize() if self._slots is not None else 0
+        capacity = len(self._crawlers) * self._contexts
+        return {
+            "browsers": len(self._crawlers),
+            "capacity": capacity,
+            "in_use": capacity - free,
+            "waiting": self._waiting,
+        }
+
+
+# Process-wide pool, started and closed by the FastAPI lifespan in main.py
+browser_pool = BrowserPool()
@@ -13,14 +13,27 @@ from crawl4ai import (
 # Minimum words to consider a page as a real article
 _MIN_WORDS = 150
 
+# Boilerplate elements dropped before markdown generation
+_EXCLUDED_TAGS = ["nav", "header", "footer", "aside", "script", "style"]
+_WORD_COUNT_THRESHOLD = 50
+
+
+def topic_keywords(topic: str) -> list[str]:
+    """Lower-cased topic words longer than two characters."""
+    return [w for w in re.split(r"\W+", topic.lower()) if len(w) > 2]
 
-def build_crawl_config(topic: str, max_pages: int) -> CrawlerRunConfig:
-    """Build a CrawlerRunConfig tuned for topic-relevant deep crawling."""
-    keywords = [w for w in re.split(r"\W+", topic.lower()) if len(w) > 2]
 
-    # BM25 filter: produces fit_markdown containing only topic-relevant blocks
+def build_markdown_generator(topic: str) -> DefaultMarkdownGenerator:
+    """Markdown generator whose BM25 filter produces ``fit_markdown``
+    containing only topic-relevant blocks."""
     bm25 = BM25ContentFilter(user_query=topic, bm25_threshold=1.0)
-    md_gen = DefaultMarkdownGenerator(content_filter=bm25)
+    return DefaultMarkdownGenerator(content_filter=bm25)
+
+
+def build_crawl_config(topic: str, max_pages: int) -> CrawlerRunConfig:
+    """Build a CrawlerRunConfig tuned for topic-relevant deep crawling."""
+    keywords = topic_keywords(topic)
+    md_gen = build_markdown_generator(topic)
 
     # BFS deep crawl: follow internal links one level deep,
     # prioritising URLs that match topic keywords
@@ -34,8 +47,8 @@ def build_crawl_config(topic: str, max_pages: int) -> CrawlerRunConfig:
     return CrawlerRunConfig(
         deep_crawl_strategy=strategy,
         markdown_generator=md_gen,
-        word_count_threshold=50,
-        excluded_tags=["nav", "header", "footer", "aside", "script", "style"],
+        word_count_threshold=_WORD_COUNT_THRESHOLD,
+        excluded_tags=_EXCLUDED_TAGS,
         remove_overlay_elements=True,
         scan_full_page=True,
         wait_until="domcontentloaded",
@@ -0,0 +1,136 @@
+"""Near-duplicate article detection with MinHash and LSH banding.
+
+Wire-service stories are syndicated across outlets, so scraping several
+seeds often returns the same article more than once. Each article's
+content is reduced to a set of word shingles (``DEDUP_SHINGLE_SIZE``
+consecutive words) and summarized by a MinHash signature of
+``DEDUP_NUM_PERM`` values; the fraction of equal values estimates the
+Jaccard similarity of two articles' shingle sets.
+
+Signatures are split into bands that are hashed into buckets, so only
+articles sharing a bucket are compared. The band layout is derived from
+``DEDUP_THRESHOLD``, and a candidate counts as a duplicate when its
+estimated similarity reaches the threshold. Indexing and lookups are
+therefore linear in the number of articles, with no pairwise comparison.
+
+The highest-scoring copy is kept and the URLs of the others are recorded
+in its ``alternate_sources``.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from app.config import (
+    DEDUP_ENABLED,
+    DEDUP_NUM_PERM,
+    DEDUP_SHINGLE_SIZE,
+    DEDUP_THRESHOLD,
+)
+from app.services.web_tools.schemas import ScrapedArticle
+
+_TOKEN_RE = re.compile(r"\w+")
+# Mersenne prime 2^31 - 1: (a * x + b) stays below 2^63 for 31-bit a and x
+_PRIME = (1 << 31) - 1
+
+
+def _band_layout(threshold: float, num_perm: int) -> tuple[int, int]:
+    """``(bands, rows)`` whose LSH threshold is the closest one below *threshold*.
+
+    Two articles with similarity *s* share a bucket with probability
+    ``1 - (1 - s**rows) ** bands``, which rises steeply around
+    ``(1 / bands) ** (1 / rows)``. Erring low favours recall; the
+    candidates are verified against the real threshold anyway.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index of the articles kept so far."""
+
+    def __init__(
+        self,
+        *,
+        threshold: float = DEDUP_THRESHOLD,
+        num_perm: int = DEDUP_NUM_PERM,
+        shingle_size: int = DEDUP_SHINGLE_SIZE,
+        seed: int = 1,
+    ) -> None:
+        self.threshold = threshold
+        self._shingle_size = max(1, shingle_size)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self._bands, self._rows = _band_layout(threshold, num_perm)
+        self._buckets: list[dict[bytes, list[int]]] = [
+            defaultdict(list) for _ in range(self._bands)
+        ]
+        self._articles: list[ScrapedArticle] = []
+        self._signatures: list[np.ndarray] = []
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of *text*'s word shingles."""
+        words = _TOKEN_RE.findall(text.lower())
+        k = self._shingle_size
+        shingles = {
+            " ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))
+        }
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) & _PRIME for s in shingles),
+            dtype=np.uint64, count=len(shingles),
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1)
+
+    def find_or_add(self, article: ScrapedArticle) -> ScrapedArticle | None:
+        """Return the indexed article *article* duplicates, or index it.
+
+        A duplicate's URL (and its own alternates) are added to the kept
+        article's ``alternate_sources``; None means *article* was new.
+        """
+        signature = self.signature(article.content)
+        keys = [
+            signature[band * self._rows:(band + 1) * self._rows].tobytes()
+            for band in range(self._bands)
+        ]
+
+        candidates = {i for band, key in enumerate(keys) for i in self._buckets[band].get(key, ())}
+        best, best_similarity = None, self.threshold
+        for i in candidates:
+            similarity = float(np.mean(self._signatures[i] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = i, similarity
+
+        if best is not None:
+            original = self._articles[best]
+            for url in [article.url, *article.alternate_sources]:
+                if url != original.url and url not in original.alternate_sources:
+                    original.alternate_sources.append(url)
+            return original
+
+        index = len(self._articles)
+        self._articles.append(article)
+        self._signatures.append(signature)
+        for band, key in enumerate(keys):
+            self._buckets[band][key].append(index)
+        return None
+
+
+def deduplicate(articles: list[ScrapedArticle]) -> list[ScrapedArticle]:
+    """Drop near-duplicate articles, keeping the highest-scoring copy.
+
+    The kept articles are returned in their input order.
+    """
+    if not DEDUP_ENABLED or len(articles) < 2:
+        return articles
+    index = NearDuplicateIndex()
+    by_score = sorted(articles, key=lambda a: a.relevance_score, reverse=True)
+    duplicates = {id(a) for a in by_score if index.find_or_add(a) is not None}
+    return [a for a in articles if id(a) not in duplicates]
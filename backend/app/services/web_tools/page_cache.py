@@ -0,0 +1,420 @@
+"""Persistent SQLite cache for crawled pages.
+
+Pages are stored under a content address derived from their normalized URL
+(scheme/host lowercased, fragment and tracking parameters dropped, query
+sorted). Each entry keeps the raw and BM25-filtered markdown, the title,
+the fetch time and the ``ETag``/``Last-Modified`` validators. A second
+table remembers which pages a deep crawl of a seed URL produced for a
+topic and page budget, so a repeated ``scrape_url`` call can be answered
+without a browser.
+
+Freshness is governed by a default TTL with optional per-domain overrides.
+Stale crawls are revalidated with a conditional GET on every page before
+being served, and the total stored size is bounded with LRU eviction.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from app.clients.http import get_http_client
+from app.config import (
+    PAGE_CACHE_DOMAIN_TTLS,
+    PAGE_CACHE_ENABLED,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_PATH,
+    PAGE_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+_TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src",
+})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    raw_markdown TEXT NOT NULL,
+    fit_markdown TEXT NOT NULL,
+    fit_query TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+CREATE TABLE IF NOT EXISTS crawls (
+    key TEXT PRIMARY KEY,
+    seed_url TEXT NOT NULL,
+    page_keys TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """Canonicalize *url* so trivially different spellings share a cache key."""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower() or "https"
+    host = (parsed.hostname or "").lower()
+    port = parsed.port
+    if port and not (
+        (scheme == "http" and port == 80) or (scheme == "https" and port == 443)
+    ):
+        host = f"{host}:{port}"
+    path = parsed.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    return urlunparse((scheme, host, path, "", query, ""))
+
+
+def _key(*parts: str) -> str:
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _topic_key(topic: str) -> str:
+    return " ".join(topic.lower().split())
+
+
+def _parse_domain_ttls(spec: str) -> dict[str, float]:
+    """Parse ``"example.com=600,news.site=3600"`` into a host→TTL map."""
+    ttls: dict[str, float] = {}
+    for item in spec.split(","):
+        host, sep, ttl = item.partition("=")
+        if not sep:
+            continue
+        try:
+            ttls[host.strip().lower()] = float(ttl)
+        except ValueError:
+            logger.warning("Ignoring invalid page cache TTL entry: %r", item)
+    return ttls
+
+
+@dataclass
+class CachedPage:
+    url: str
+    title: str
+    raw_markdown: str
+    fit_markdown: str
+    fit_query: str
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def markdown_for(self, topic: str) -> str:
+        """Return the topic-filtered markdown when it was built for *topic*."""
+        if self.fit_markdown and self.fit_query == _topic_key(topic):
+            return self.fit_markdown
+        return self.raw_markdown
+
+
+@dataclass
+class CachedCrawl:
+    key: str
+    seed_url: str
+    pages: list[CachedPage]
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    fresh: bool
+
+
+class PageCache:
+    """SQLite-backed page store with per-domain TTLs and LRU eviction.
+
+    All public coroutine methods run their SQLite work in a worker thread so
+    the event loop is never blocked on disk I/O.
+    """
+
+    def __init__(
+        self,
+        path: str = PAGE_CACHE_PATH,
+        *,
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+        default_ttl: float = PAGE_CACHE_TTL,
+        domain_ttls: dict[str, float] | None = None,
+    ) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._domain_ttls = (
+            domain_ttls if domain_ttls is not None
+            else _parse_domain_ttls(PAGE_CACHE_DOMAIN_TTLS)
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # Running SUM(size) of the pages table, loaded on the first write
+        self._total_bytes: int | None = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def ttl_for(self, url: str) -> float:
+        """Return the freshness TTL (seconds) that applies to *url*'s host."""
+        host = (urlparse(url).hostname or "").lower()
+        while host:
+            if host in self._domain_ttls:
+                return self._domain_ttls[host]
+            _, _, host = host.partition(".")
+        return self._default_ttl
+
+    async def get_crawl(
+        self, seed_url: str, topic: str, max_follow: int
+    ) -> CachedCrawl | None:
+        """Return the cached deep crawl of *seed_url* for *topic*, if complete.
+
+        Crawls are keyed by *max_follow* too: a crawl limited to fewer pages
+        must not answer a request for more.
+        """
+        return await asyncio.to_thread(self._get_crawl, seed_url, topic, max_follow)
+
+    async def put_crawl(
+        self,
+        seed_url: str,
+        topic: str,
+        max_follow: int,
+        pages: list[dict],
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store the pages of a deep crawl and the crawl → pages mapping.
+
+        Each page dict carries ``url``, ``title``, ``raw_markdown``,
+        ``fit_markdown`` and optionally ``etag``/``last_modified``.
+        """
+        await asyncio.to_thread(
+            self._put_crawl, seed_url, topic, max_follow, pages, etag, last_modified
+        )
+
+    async def revalidate(self, crawl: CachedCrawl) -> bool:
+        """Revalidate a stale crawl with conditional GETs on all its pages.
+
+        A ``304`` for the seed says nothing about the pages followed from
+        it, so every page is checked with its own validators. Returns True
+        (and refreshes the entry) only when all of them answer
+        ``304 Not Modified``; a page without validators cannot be
+        revalidated, and the crawl must then be fetched again.
+        """
+        seed = normalize_url(crawl.seed_url)
+        targets = [(crawl.seed_url, crawl.etag, crawl.last_modified)] + [
+            (p.url, p.etag, p.last_modified)
+            for p in crawl.pages if normalize_url(p.url) != seed
+        ]
+        results = await asyncio.gather(*(
+            self._not_modified(url, etag, last_modified)
+            for url, etag, last_modified in targets
+        ))
+        if not all(results):
+            return False
+
+        await asyncio.to_thread(self._touch_crawl, crawl)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._total_bytes = None
+
+    async def _not_modified(
+        self, url: str, etag: str | None, last_modified: str | None
+    ) -> bool:
+        """Return True if a conditional GET of *url* answers ``304``."""
+        headers: dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if not headers:
+            return False
+
+        try:
+            response = await get_http_client().get(url, headers=headers)
+        except Exception as e:
+            logger.debug("Revalidation of %s failed: %s", url, e)
+            return False
+        return response.status_code == 304
+
+    # ------------------------------------------------------------------
+    # Internals (run in worker threads)
+    # ------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get_crawl(self, seed_url: str, topic: str, max_follow: int) -> CachedCrawl | None:
+        seed = normalize_url(seed_url)
+        crawl_key = _key(seed, _topic_key(topic), str(max_follow))
+        now = time.time()
+
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT page_keys, etag, last_modified, fetched_at "
+                "FROM crawls WHERE key = ?",
+                (crawl_key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            page_keys: list[str] = json.loads(row[0])
+            pages: list[CachedPage] = []
+            for page_key in page_keys:
+                page = db.execute(
+                    "SELECT url, title, raw_markdown, fit_markdown, fit_query, "
+                    "fetched_at, etag, last_modified FROM pages WHERE key = ?",
+                    (page_key,),
+                ).fetchone()
+                if page is None:
+                    # A page was evicted: the crawl can no longer be replayed
+                    return None
+                pages.append(CachedPage(*page))
+
+            db.executemany(
+                "UPDATE pages SET accessed_at = ? WHERE key = ?",
+                [(now, k) for k in page_keys],
+            )
+            db.execute(
+                "UPDATE crawls SET accessed_at = ? WHERE key = ?", (now, crawl_key)
+            )
+            db.commit()
+
+        fetched_at = row[3]
+        return CachedCrawl(
+            key=crawl_key,
+            seed_url=seed_url,
+            pages=pages,
+            etag=row[1],
+            last_modified=row[2],
+            fetched_at=fetched_at,
+            fresh=now - fetched_at < self.ttl_for(seed_url),
+        )
+
+    def _put_crawl(
+        self,
+        seed_url: str,
+        topic: str,
+        max_follow: int,
+        pages: list[dict],
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        seed = normalize_url(seed_url)
+        topic_key = _topic_key(topic)
+        now = time.time()
+
+        # Keyed by page, so a URL crawled twice is stored (and counted) once
+        page_rows: dict[str, tuple] = {}
+        for p in pages:
+            raw, fit = p.get("raw_markdown") or "", p.get("fit_markdown") or ""
+            key = _key(normalize_url(p["url"]))
+            page_rows[key] = (
+                key, p["url"], p.get("title") or "",
+                raw, fit, topic_key, p.get("etag"), p.get("last_modified"),
+                now, now, len(raw.encode("utf-8")) + len(fit.encode("utf-8")),
+            )
+
+        with self._lock:
+            db = self._db()
+            total = self._stored_bytes(db)
+            for key in page_rows:
+                row = db.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    total -= row[0]
+            db.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                page_rows.values(),
+            )
+            self._total_bytes = total + sum(r[-1] for r in page_rows.values())
+            db.execute(
+                "INSERT OR REPLACE INTO crawls VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _key(seed, topic_key, str(max_follow)), seed_url,
+                    json.dumps(list(page_rows)),
+                    etag, last_modified, now, now,
+                ),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _touch_crawl(self, crawl: CachedCrawl) -> None:
+        now = time.time()
+        keys = [_key(normalize_url(p.url)) for p in crawl.pages]
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "UPDATE pages SET fetched_at = ? WHERE key = ?",
+                [(now, k) for k in keys],
+            )
+            db.execute(
+                "UPDATE crawls SET fetched_at = ? WHERE key = ?",
+                (now, crawl.key),
+            )
+            db.commit()
+        crawl.fetched_at, crawl.fresh = now, True
+
+    def _stored_bytes(self, db: sqlite3.Connection) -> int:
+        """Total size of the stored pages (scanned once, then kept running)."""
+        if self._total_bytes is None:
+            self._total_bytes = db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()[0]
+        return self._total_bytes
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Drop least-recently-used pages until under the size budget."""
+        total = self._stored_bytes(db)
+        if total <= self._max_bytes:
+            return
+
+        target = int(self._max_bytes * 0.9)
+        cutoff = None
+        for key, size, accessed_at in db.execute(
+            "SELECT key, size, accessed_at FROM pages ORDER BY accessed_at"
+        ).fetchall():
+            if total <= target:
+                break
+            db.execute("DELETE FROM pages WHERE key = ?", (key,))
+            total -= size
+            cutoff = accessed_at
+        self._total_bytes = total
+
+        if cutoff is not None:
+            # Crawls last used before the evicted pages are unlikely to be
+            # complete any more; drop them with their pages.
+            db.execute("DELETE FROM crawls WHERE accessed_at <= ?", (cutoff,))
+            logger.info("Page cache evicted entries up to accessed_at=%s", cutoff)
+
+
+# Process-wide cache used by CrawlScraper (None when disabled)
+page_cache: PageCache | None = PageCache() if PAGE_CACHE_ENABLED else None
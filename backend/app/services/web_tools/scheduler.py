@@ -0,0 +1,266 @@
+"""Bounded-concurrency crawl scheduler shared by the scraper and URL finder.
+
+Every crawl goes through :meth:`CrawlScheduler.slot`, which enforces:
+
+* a global budget of in-flight pages (a BFS deep crawl of a seed costs
+  ``max_follow + 1`` pages, a single search page costs 1);
+* per-domain politeness: a concurrency cap and a minimum interval between
+  crawl starts on the same host;
+* fair queuing: waiters are grouped by *owner* (one per API request) and
+  served round-robin, so one large request cannot starve the others;
+* backpressure: once too many crawls are pending, new ones are rejected
+  with :class:`ServiceBusyError` instead of queueing without bound.
+"""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+from urllib.parse import urlparse
+
+from app.config import (
+    CRAWL_DOMAIN_CONCURRENCY,
+    CRAWL_DOMAIN_MIN_INTERVAL,
+    CRAWL_MAX_IN_FLIGHT_PAGES,
+    CRAWL_MAX_PENDING,
+)
+from app.services.errors import ServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Waiter:
+    cost: int
+    future: asyncio.Future[None]
+
+
+@dataclass
+class _DomainState:
+    semaphore: asyncio.Semaphore
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    next_start: float = 0.0
+    last_owner: str | None = None
+    users: int = 0
+
+
+def _host(url: str) -> str:
+    try:
+        return urlparse(url).netloc.lower().split(":")[0]
+    except Exception:
+        return ""
+
+
+def new_owner() -> str:
+    """Return a fresh owner id used to group one request's crawls."""
+    return uuid.uuid4().hex
+
+
+class CrawlScheduler:
+    """Admission control for crawls (see module docstring)."""
+
+    def __init__(
+        self,
+        max_in_flight_pages: int = CRAWL_MAX_IN_FLIGHT_PAGES,
+        *,
+        domain_concurrency: int = CRAWL_DOMAIN_CONCURRENCY,
+        domain_min_interval: float = CRAWL_DOMAIN_MIN_INTERVAL,
+        max_pending: int = CRAWL_MAX_PENDING,
+    ) -> None:
+        self._capacity = max(1, max_in_flight_pages)
+        self._available = self._capacity
+        self._domain_concurrency = max(1, domain_concurrency)
+        self._domain_min_interval = max(0.0, domain_min_interval)
+        self._max_pending = max(1, max_pending)
+
+        self._queues: dict[str, deque[_Waiter]] = {}
+        self._owners: deque[str] = deque()
+        self._domains: dict[str, _DomainState] = {}
+        self._pending = 0
+        self._running = 0
+        # Exponentially weighted mean crawl duration, used for Retry-After
+        self._avg_duration = 10.0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def check_capacity(self, n: int = 1) -> None:
+        """Reject a batch of *n* crawls up front if it cannot be queued."""
+        if self._pending + n > self._max_pending:
+            raise self._busy()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        url: str,
+        *,
+        owner: str | None = None,
+        cost: int = 1,
+        pace_owner: bool = True,
+    ) -> AsyncIterator[None]:
+        """Hold a crawl slot for *url* for the duration of the block.
+
+        Args:
+            url: URL about to be crawled (its host is rate limited).
+            owner: Fairness group, typically one per API request.
+            cost: Number of pages the crawl may fetch.
+            pace_owner: If False, skip the host's minimum interval when
+                the previous crawl started there belongs to the same
+                owner (e.g. sibling searches of one request). Crawls of
+                other owners are still spaced out, and the concurrency
+                cap still applies.
+        """
+        if self._pending >= self._max_pending:
+            raise self._busy()
+
+        owner = owner or new_owner()
+        cost = min(max(1, cost), self._capacity)
+        host = _host(url)
+        domain = self._domains.get(host)
+        if domain is None:
+            domain = _DomainState(asyncio.Semaphore(self._domain_concurrency))
+            self._domains[host] = domain
+
+        domain.users += 1
+        self._pending += 1
+        granted = False
+        try:
+            # Global pages first, so a queued crawl never blocks its host's
+            # concurrency slots while waiting for capacity elsewhere
+            await self._acquire(owner, cost)
+            try:
+                async with domain.semaphore:
+                    await self._wait_domain_turn(domain, owner, pace_owner)
+                    granted = True
+                    self._pending -= 1
+                    self._running += 1
+                    started = time.monotonic()
+                    try:
+                        yield
+                    finally:
+                        self._running -= 1
+                        elapsed = time.monotonic() - started
+                        self._avg_duration = 0.8 * self._avg_duration + 0.2 * elapsed
+            finally:
+                self._release(cost)
+        finally:
+            if not granted:
+                self._pending -= 1
+            domain.users -= 1
+            self._prune_domains()
+
+    def stats(self) -> dict[str, int]:
+        """Return current scheduler occupancy."""
+        return {
+            "capacity": self._capacity,
+            "in_flight_pages": self._capacity - self._available,
+            "running": self._running,
+            "pending": self._pending,
+            "domains": len(self._domains),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _busy(self) -> ServiceBusyError:
+        waves = math.ceil((self._pending + 1) / max(1, self._capacity))
+        retry_after = math.ceil(self._avg_duration * waves)
+        logger.warning(
+            "Crawl scheduler saturated (%d pending), Retry-After %ss",
+            self._pending, retry_after,
+        )
+        return ServiceBusyError("Crawl capacity exhausted", retry_after=retry_after)
+
+    async def _wait_domain_turn(
+        self, domain: _DomainState, owner: str, pace_owner: bool
+    ) -> None:
+        """Space out crawl starts on the same host.
+
+        Waiters take turns under the domain lock and the next start is
+        stamped once the wait is over, i.e. when the crawl really begins.
+        """
+        async with domain.lock:
+            delay = domain.next_start - time.monotonic()
+            if delay > 0 and (pace_owner or domain.last_owner != owner):
+                await asyncio.sleep(delay)
+            domain.next_start = time.monotonic() + self._domain_min_interval
+            domain.last_owner = owner
+
+    async def _acquire(self, owner: str, cost: int) -> None:
+        if not self._owners and self._available >= cost:
+            self._available -= cost
+            return
+
+        waiter = _Waiter(cost, asyncio.get_running_loop().create_future())
+        queue = self._queues.get(owner)
+        if queue is None:
+            queue = self._queues[owner] = deque()
+            self._owners.append(owner)
+        queue.append(waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before cancellation: hand the pages back
+                self._release(cost)
+            else:
+                self._remove_waiter(owner, waiter)
+            raise
+
+    def _release(self, cost: int) -> None:
+        self._available += cost
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant pages to waiting owners in round-robin order."""
+        while self._owners:
+            owner = self._owners[0]
+            queue = self._queues[owner]
+            waiter = queue[0]
+            if waiter.cost > self._available:
+                # Head-of-line waits so large crawls are not starved
+                break
+            queue.popleft()
+            self._available -= waiter.cost
+            waiter.future.set_result(None)
+
+            self._owners.popleft()
+            if queue:
+                self._owners.append(owner)
+            else:
+                del self._queues[owner]
+
+    def _remove_waiter(self, owner: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(owner)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del self._queues[owner]
+            self._owners.remove(owner)
+        # The removed waiter may have been blocking the head of the line
+        self._dispatch()
+
+    def _prune_domains(self) -> None:
+        now = time.monotonic()
+        idle = [
+            host for host, d in self._domains.items()
+            if d.users == 0 and d.next_start <= now
+        ]
+        for host in idle:
+            del self._domains[host]
+
+
+# Process-wide scheduler shared by CrawlScraper and URLFinder
+crawl_scheduler = CrawlScheduler()
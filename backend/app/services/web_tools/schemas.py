@@ -4,4 +4,6 @@ class ScrapedArticle(BaseModel):
     url: str
     title: str
     content: str
-    relevance_score: float = 0.0
\ No newline at end of file
+    relevance_score: float = 0.0
+    # URLs of near-duplicate copies of this article from other sources
+    alternate_sources: list[str] = []
@@ -1,17 +1,193 @@
-"""Relevance scoring for scraped articles."""
+"""BM25 relevance scoring for scraped articles.
+
+Every article in a batch is tokenized once (lower-cased word tokens,
+stop words dropped, light suffix stemming) into unigrams and adjacent-word
+bigrams, the latter standing for multiword phrases. The batch is indexed as
+a sparse term-document matrix held in NumPy arrays, and a topic is scored
+against all articles at once with BM25. Title tokens count
+``_TITLE_WEIGHT`` times.
+
+Scores are normalized to 0.0–1.0 by the score a document would get with
+every query word that occurs in the batch saturated. Query words no page
+mentions do not lower the scores, so thresholds such as ``min_relevance``
+keep their meaning across topics and batches.
+
+In a topic, quoted text (``"large language models"``) and unquoted
+multiword topics also match their adjacent word pairs. Phrase matches are
+a bonus (weighted ``_PHRASE_WEIGHT``) on top of the word score, not
+required terms.
+"""
 
 import re
+from typing import Iterable
+
+import numpy as np
+
+from app.services.web_tools.schemas import ScrapedArticle
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+_TITLE_WEIGHT = 3
+_PHRASE_WEIGHT = 0.5
+# Only the beginning of very long pages is indexed, to bound the cost
+_MAX_CONTENT_CHARS = 50_000
+
+_TOKEN_RE = re.compile(r"\w+")
+_PHRASE_RE = re.compile(r'"([^"]+)"')
+
+_STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers him his how i if
+in into is it its itself just me more most my no nor not now of off on once only
+or other our out over own same she should so some such than that the their them
+then there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your
+""".split())
+
+# Words that only look inflected
+_STEM_EXCEPTIONS = frozenset("""
+news series species physics politics economics mathematics always perhaps
+whereas analysis basis crisis thesis bias gas lens
+""".split())
+
+# (suffix, replacement) rules, first match wins
+_SUFFIX_RULES = (
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"),
+    ("iveness", "ive"), ("ations", "ate"), ("ation", "ate"),
+    ("ments", ""), ("ment", ""), ("ness", ""), ("ingly", ""), ("ing", ""),
+    ("edly", ""), ("ies", "y"), ("ied", "y"), ("ers", ""), ("er", ""),
+    ("ed", ""), ("ly", ""), ("ss", "ss"), ("us", "us"), ("is", "is"),
+    ("s", ""),
+)
+
+
+def stem(word: str) -> str:
+    """Strip common English inflections ("models" and "modeling" -> "model")."""
+    if len(word) <= 3 or word.isdigit() or word in _STEM_EXCEPTIONS:
+        return word
+    for suffix, replacement in _SUFFIX_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)] + replacement
+            break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case, drop stop words and stem; word order is kept."""
+    return [
+        stem(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in _STOP_WORDS and (len(token) > 1 or token.isdigit())
+    ]
+
+
+def _bigrams(tokens: list[str]) -> list[str]:
+    return [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def _with_bigrams(tokens: list[str]) -> list[str]:
+    return tokens + _bigrams(tokens)
+
+
+def query_terms(topic: str) -> tuple[list[str], list[str]]:
+    """Words of *topic* and the word pairs of its phrases (deduplicated).
+
+    Quoted phrases and the unquoted rest of the topic each count as a
+    phrase.
+    """
+    phrases = [tokenize(p) for p in _PHRASE_RE.findall(topic)]
+    phrases.append(tokenize(_PHRASE_RE.sub(" ", topic)))
+    words = [t for tokens in phrases for t in tokens]
+    pairs = [b for tokens in phrases for b in _bigrams(tokens)]
+    return list(dict.fromkeys(words)), list(dict.fromkeys(pairs))
+
+
+class RelevanceIndex:
+    """In-memory BM25 index over one batch of (title, content) documents."""
+
+    def __init__(self, documents: Iterable[tuple[str, str]]) -> None:
+        self._vocab: dict[str, int] = {}
+        rows: list[np.ndarray] = []
+        cols: list[np.ndarray] = []
+        counts: list[np.ndarray] = []
+        lengths: list[int] = []
+
+        for doc_id, (title, content) in enumerate(documents):
+            tokens = (
+                _with_bigrams(tokenize(title)) * _TITLE_WEIGHT
+                + _with_bigrams(tokenize(content[:_MAX_CONTENT_CHARS]))
+            )
+            ids = np.fromiter(
+                (self._vocab.setdefault(t, len(self._vocab)) for t in tokens),
+                dtype=np.int64, count=len(tokens),
+            )
+            unique, tf = np.unique(ids, return_counts=True)
+            rows.append(np.full(len(unique), doc_id, dtype=np.int64))
+            cols.append(unique)
+            counts.append(tf)
+            lengths.append(len(tokens))
+
+        self.size = len(lengths)
+        self._rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        self._cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        self._tf = (np.concatenate(counts) if counts else np.zeros(0)).astype(np.float64)
+        self._lengths = np.asarray(lengths, dtype=np.float64)
+        self._avg_length = float(self._lengths.mean()) if self.size and self._lengths.mean() else 1.0
+        df = np.bincount(self._cols, minlength=len(self._vocab)).astype(np.float64)
+        self._idf = np.log1p((self.size - df + 0.5) / (df + 0.5))
+
+    def score(self, topic: str) -> np.ndarray:
+        """Normalized BM25 score (0.0–1.0) of every document for *topic*.
+
+        Topics without indexable words score 0.5 for every document.
+        """
+        words, pairs = query_terms(topic)
+        if not words or not self.size:
+            return np.full(self.size, 0.5)
+
+        word_ids = self._term_ids(words)
+        # Best possible score: every query word found in the batch saturated
+        # (tf -> inf, dl = avgdl); absent words cannot be matched by any page
+        ideal = float(self._idf[word_ids].sum()) * (_K1 + 1)
+        if ideal <= 0:
+            return np.zeros(self.size)
+
+        scores = self._bm25(word_ids) + _PHRASE_WEIGHT * self._bm25(self._term_ids(pairs))
+        return np.clip(scores / ideal, 0.0, 1.0)
+
+    def _term_ids(self, terms: list[str]) -> np.ndarray:
+        return np.array(
+            [self._vocab[t] for t in terms if t in self._vocab], dtype=np.int64
+        )
+
+    def _bm25(self, term_ids: np.ndarray) -> np.ndarray:
+        scores = np.zeros(self.size)
+        if not len(term_ids):
+            return scores
+        mask = np.isin(self._cols, term_ids)
+        docs, cols, tf = self._rows[mask], self._cols[mask], self._tf[mask]
+        norm = _K1 * (1 - _B + _B * self._lengths[docs] / self._avg_length)
+        np.add.at(scores, docs, self._idf[cols] * tf * (_K1 + 1) / (tf + norm))
+        return scores
+
+
+def score_articles(articles: list[ScrapedArticle], topic: str) -> list[ScrapedArticle]:
+    """Score a batch of articles against *topic* with one shared index.
+
+    Sets each article's ``relevance_score`` and returns them sorted by it.
+    """
+    if not articles:
+        return articles
+    index = RelevanceIndex((a.title, a.content) for a in articles)
+    for article, score in zip(articles, index.score(topic)):
+        article.relevance_score = round(float(score), 3)
+    return sorted(articles, key=lambda a: a.relevance_score, reverse=True)
 
 
 def score_relevance(title: str, content: str, topic: str) -> float:
-    """Score how relevant an article is to the given topic (0.0–1.0)."""
-    kws = [w for w in re.split(r"\W+", topic.lower()) if len(w) > 2]
-    if not kws:
-        return 0.5
-    t_hits = sum(1 for k in kws if k in title.lower())
-    c_hits = sum(1 for k in kws if k in content[:2000].lower())
-    score = (t_hits / len(kws)) * 0.4 + (c_hits / len(kws)) * 0.6
-    # Bonus for longer articles (more substance)
-    if len(content) > 3000:
-        score = min(1.0, score + 0.1)
-    return round(min(1.0, score), 3)
+    """Score how relevant a single article is to the given topic (0.0–1.0)."""
+    return round(float(RelevanceIndex([(title, content)]).score(topic)[0]), 3)
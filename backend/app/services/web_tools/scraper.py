@@ -1,16 +1,76 @@
 """Scraping service using crawl4ai deep crawling + BM25 content filtering."""
 
+import asyncio
 import logging
+import time
+from contextlib import aclosing
+from typing import AsyncIterator
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig
-
+from app.config import DEDUP_ENABLED, STATIC_FETCH_MIN_RELEVANCE
+from app.services.errors import ServiceBusyError
+from app.services.web_tools.browser_pool import BrowserPool, browser_pool
 from app.services.web_tools.config import _MIN_WORDS, build_crawl_config
+from app.services.web_tools.page_cache import PageCache, normalize_url, page_cache
+from app.services.web_tools.scheduler import (
+    CrawlScheduler,
+    crawl_scheduler,
+    new_owner,
+)
+from app.services.web_tools.dedup import NearDuplicateIndex, deduplicate
 from app.services.web_tools.schemas import ScrapedArticle
-from app.services.web_tools.scoring import score_relevance
+from app.services.web_tools.static_fetch import (
+    FetchRouter,
+    StaticFetcher,
+    fetch_router,
+)
+from app.services.web_tools.scoring import score_articles
 
 logger = logging.getLogger(__name__)
 
 
+def _header(result, name: str) -> str | None:
+    """Case-insensitive lookup of a response header on a crawl result."""
+    headers = getattr(result, "response_headers", None) or {}
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _page_from_result(r) -> dict:
+    """Extract the cacheable fields of a successful crawl result."""
+    raw_md, fit_md = "", ""
+    if r.markdown:
+        raw_md = r.markdown.raw_markdown or str(r.markdown)
+        fit_md = r.markdown.fit_markdown or ""
+    return {
+        "url": r.url,
+        "title": (r.metadata or {}).get("title", "") or "",
+        "raw_markdown": raw_md,
+        "fit_markdown": fit_md,
+        "etag": _header(r, "etag"),
+        "last_modified": _header(r, "last-modified"),
+    }
+
+
+def _to_article(url: str, title: str, md: str) -> ScrapedArticle | None:
+    """Build an unscored article, or None if the page is too short."""
+    if not md or len(md.split()) < _MIN_WORDS:
+        return None
+    return ScrapedArticle(url=url, title=title, content=md.strip())
+
+
+def _rank_articles(pages: list[dict], topic: str) -> list[ScrapedArticle]:
+    """Turn crawled pages into articles sorted by relevance."""
+    articles = [
+        article for p in pages
+        if (article := _to_article(
+            p["url"], p["title"], p["fit_markdown"] or p["raw_markdown"]
+        ))
+    ]
+    return score_articles(articles, topic)
+
+
 class CrawlScraper:
     """Scrapes a URL using crawl4ai BFS deep crawl + BM25 topic filtering.
 
@@ -19,13 +79,38 @@ class CrawlScraper:
     2. Prioritises links whose text/URL match topic keywords
     3. Filters each page's content with BM25 to keep only topic-relevant text
     4. Returns scored articles sorted by relevance
+
+    Pages are first fetched over plain HTTP when the fetch router allows it
+    for the domain; the browser is only used when that yields no article
+    passing the ``_MIN_WORDS`` and relevance checks. Crawled pages are kept
+    in the persistent page cache, so repeated scrapes of the same seed and
+    topic skip fetching entirely.
     """
 
-    def __init__(self) -> None:
-        self._browser_cfg = BrowserConfig(headless=True, verbose=False)
+    def __init__(
+        self,
+        pool: BrowserPool | None = None,
+        scheduler: CrawlScheduler | None = None,
+        cache: PageCache | None = page_cache,
+        router: FetchRouter | None = None,
+    ) -> None:
+        self._pool = pool or browser_pool
+        self._scheduler = scheduler or crawl_scheduler
+        self._cache = cache
+        self._router = router or fetch_router
+        self._static = StaticFetcher()
+
+    def check_capacity(self, n: int) -> None:
+        """Raise ServiceBusyError if *n* more seed crawls cannot be queued."""
+        self._scheduler.check_capacity(n)
 
     async def scrape_url(
-        self, url: str, topic: str, *, max_follow: int = 5
+        self,
+        url: str,
+        topic: str,
+        *,
+        max_follow: int = 5,
+        owner: str | None = None,
     ) -> list[ScrapedArticle]:
         """Scrape *one* seed URL, following article links, and return
         a list of articles ranked by topic relevance.
@@ -34,12 +119,55 @@ class CrawlScraper:
             url: Seed URL (e.g. a blog listing page).
             topic: The topic to search for.
             max_follow: Max pages to crawl (seed + followed links).
+            owner: Scheduler fairness group (one per API request).
+
+        Raises:
+            ServiceBusyError: If the crawl scheduler is saturated.
         """
+        cached = await self._from_cache(url, topic, max_follow)
+        if cached is not None:
+            return cached
+
+        if self._router.try_static(url):
+            pages = await self._crawl_static(url, topic, max_follow=max_follow, owner=owner)
+            articles = _rank_articles(pages, topic)
+            static_ok = bool(articles) and articles[0].relevance_score >= STATIC_FETCH_MIN_RELEVANCE
+            self._router.record(url, static_ok)
+            if static_ok:
+                await self._store(url, topic, max_follow, pages)
+                return articles
+            logger.info("Static fetch of %s was insufficient, using the browser", url)
+
+        pages = await self._crawl_browser(url, topic, max_follow=max_follow, owner=owner)
+        if pages:
+            await self._store(url, topic, max_follow, pages)
+        return _rank_articles(pages, topic)
+
+    async def _crawl_static(
+        self, url: str, topic: str, *, max_follow: int, owner: str | None
+    ) -> list[dict]:
+        """Fetch the seed and followed links over HTTP (one light scheduler slot)."""
+        try:
+            async with self._scheduler.slot(url, owner=owner):
+                return await self._static.crawl(url, topic, max_pages=max_follow + 1)
+        except ServiceBusyError:
+            raise
+        except Exception as e:
+            logger.error("Error fetching %s statically: %s", url, e)
+            return []
+
+    async def _crawl_browser(
+        self, url: str, topic: str, *, max_follow: int, owner: str | None
+    ) -> list[dict]:
+        """Deep-crawl the seed with a pooled headless browser."""
         config = build_crawl_config(topic, max_pages=max_follow + 1)
-        articles: list[ScrapedArticle] = []
+        pages: list[dict] = []
 
         try:
-            async with AsyncWebCrawler(config=self._browser_cfg) as crawler:
+            async with (
+                self._scheduler.slot(url, owner=owner, cost=max_follow + 1),
+                self._pool.acquire() as crawler,
+            ):
                 raw = await crawler.arun(url=url, config=config)
 
                 # arun() may return a list-like container or an
@@ -49,36 +177,53 @@ class CrawlScraper:
                 else:
                     results = list(raw)  # type: ignore[arg-type]
 
-                for r in results:
-                    if not r.success:
-                        continue
+                pages = [_page_from_result(r) for r in results if r.success]
+        except ServiceBusyError:
+            raise
+        except Exception as e:
+            logger.error("Error scraping %s: %s", url, e)
 
-                    title = (r.metadata or {}).get("title", "")
+        return pages
 
-                    # Prefer BM25-filtered fit_markdown, fall back to raw
-                    md = ""
-                    if r.markdown:
-                        md = (
-                            r.markdown.fit_markdown
-                            or r.markdown.raw_markdown
-                            or str(r.markdown)
-                        )
+    async def _from_cache(
+        self, url: str, topic: str, max_follow: int
+    ) -> list[ScrapedArticle] | None:
+        """Return articles from a fresh (or revalidated) cached crawl."""
+        if self._cache is None:
+            return None
+        try:
+            crawl = await self._cache.get_crawl(url, topic, max_follow)
+            if crawl is None:
+                return None
+            if not crawl.fresh and not await self._cache.revalidate(crawl):
+                return None
+        except Exception as e:
+            logger.warning("Page cache lookup failed for %s: %s", url, e)
+            return None
 
-                    if not md or len(md.split()) < _MIN_WORDS:
-                        continue
+        logger.info("Page cache hit for %s (%d pages)", url, len(crawl.pages))
+        articles = [
+            article for p in crawl.pages
+            if (article := _to_article(p.url, p.title, p.markdown_for(topic)))
+        ]
+        return score_articles(articles, topic)
 
-                    score = score_relevance(title, md, topic)
-                    articles.append(
-                        ScrapedArticle(
-                            url=r.url, title=title,
-                            content=md.strip(), relevance_score=score,
-                        )
-                    )
+    async def _store(
+        self, url: str, topic: str, max_follow: int, pages: list[dict]
+    ) -> None:
+        """Persist a fresh crawl; cache failures never fail the scrape."""
+        if self._cache is None:
+            return
+        seed_key = normalize_url(url)
+        seed = next((p for p in pages if normalize_url(p["url"]) == seed_key), {})
+        try:
+            await self._cache.put_crawl(
+                url, topic, max_follow, pages,
+                etag=seed.get("etag"),
+                last_modified=seed.get("last_modified"),
+            )
         except Exception as e:
-            logger.error("Error scraping %s: %s", url, e)
-
-        articles.sort(key=lambda a: a.relevance_score, reverse=True)
-        return articles
+            logger.warning("Could not cache crawl of %s: %s", url, e)
 
     async def scrape_and_rank(
         self,
@@ -87,23 +232,114 @@ class CrawlScraper:
         *,
         min_relevance: float = 0.1,
         max_follow: int = 5,
+        deadline: float | None = None,
     ) -> list[ScrapedArticle]:
-        """Scrape multiple seed URLs in parallel and merge results by relevance."""
-        import asyncio
+        """Scrape multiple seed URLs in parallel and merge results by relevance.
+
+        Crawls run through the shared scheduler as one fairness group. With
+        a *deadline* (seconds), seeds still crawling when it expires are
+        cancelled and the articles scraped so far are returned.
 
-        tasks = [self.scrape_url(u, topic, max_follow=max_follow) for u in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Raises:
+            ServiceBusyError: If the scheduler cannot admit the batch.
+        """
+        self.check_capacity(len(urls))
 
         articles: list[ScrapedArticle] = []
-        for result in results:
-            if isinstance(result, BaseException):
-                logger.error("Scrape task failed: %s", result)
-                continue
-            articles.extend(a for a in result if a.relevance_score >= min_relevance)
+        # aclosing: an early exit (e.g. ServiceBusyError) cancels the other
+        # seeds' crawls now, not whenever the generator is collected
+        async with aclosing(self._scrape_seeds(urls, topic, max_follow, deadline)) as results:
+            async for result in results:
+                if isinstance(result, ServiceBusyError):
+                    raise result
+                if isinstance(result, BaseException):
+                    logger.error("Scrape task failed: %s", result)
+                    continue
+                articles.extend(result)
 
-        articles.sort(key=lambda a: a.relevance_score, reverse=True)
+        # Rescore the merged batch with one index so scores are comparable
+        # across seeds (document frequencies span every scraped page)
+        articles = deduplicate([
+            a for a in score_articles(articles, topic)
+            if a.relevance_score >= min_relevance
+        ])
         logger.info(
             "Scraped %d articles from %d seed URLs (min_relevance=%s)",
             len(articles), len(urls), min_relevance,
         )
         return articles
+
+    async def scrape_stream(
+        self,
+        urls: list[str],
+        topic: str,
+        *,
+        min_relevance: float = 0.1,
+        max_follow: int = 5,
+        deadline: float | None = None,
+    ) -> AsyncIterator[ScrapedArticle]:
+        """Like :meth:`scrape_and_rank`, but yield articles as seeds finish.
+
+        Each seed's articles are yielded, best first, as soon as that seed
+        is scraped and scored. Scores are per seed, since the batch is not
+        known yet. Near-duplicates of already yielded articles are skipped.
+        Closing the iterator early cancels the remaining crawls.
+
+        Raises:
+            ServiceBusyError: If the scheduler cannot admit the batch.
+        """
+        self.check_capacity(len(urls))
+        duplicates = NearDuplicateIndex() if DEDUP_ENABLED else None
+
+        async with aclosing(self._scrape_seeds(urls, topic, max_follow, deadline)) as results:
+            async for result in results:
+                if isinstance(result, BaseException):
+                    # The response has started, so a failed seed is only skipped
+                    logger.error("Scrape task failed: %s", result)
+                    continue
+                for article in result:
+                    if article.relevance_score < min_relevance:
+                        break
+                    if duplicates is not None and duplicates.find_or_add(article):
+                        continue
+                    yield article
+
+    async def _scrape_seeds(
+        self,
+        urls: list[str],
+        topic: str,
+        max_follow: int,
+        deadline: float | None,
+    ) -> AsyncIterator[list[ScrapedArticle] | BaseException]:
+        """Yield each seed's articles (or its exception) in completion order.
+
+        Seeds still pending when *deadline* seconds have passed, or when the
+        caller stops iterating, are cancelled.
+        """
+        owner = new_owner()
+        pending = {
+            asyncio.create_task(
+                self.scrape_url(u, topic, max_follow=max_follow, owner=owner)
+            )
+            for u in urls
+        }
+        expires = None if deadline is None else time.monotonic() + deadline
+        try:
+            while pending:
+                timeout = None if expires is None else max(0.0, expires - time.monotonic())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info(
+                        "Scrape deadline of %ss reached, cancelling %d seed crawls",
+                        deadline, len(pending),
+                    )
+                    break
+                for task in done:
+                    yield task.exception() or task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,212 @@
+"""Static HTTP fetch tier in front of the headless browser.
+
+Most news sources are server-rendered, so their articles can be read with a
+plain HTTP request: the HTML is cleaned and converted to markdown with the
+same crawl4ai scraping and BM25 markdown pipeline the browser path uses,
+without starting a page. :class:`StaticFetcher` mirrors the browser's
+depth-1 crawl (seed page plus the best keyword-matching internal links).
+
+:class:`FetchRouter` decides per domain which tier to try first. Domains in
+``JS_HEAVY_DOMAINS`` always use the browser; otherwise the static tier is
+tried and the outcome (kept static, or escalated to the browser) is
+remembered for ``STATIC_DECISION_TTL`` seconds.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import httpx
+from crawl4ai import LXMLWebScrapingStrategy
+
+from app.clients.http import get_http_client
+from app.config import (
+    JS_HEAVY_DOMAINS,
+    STATIC_DECISION_TTL,
+    STATIC_FETCH_ENABLED,
+    STATIC_FETCH_TIMEOUT,
+)
+from app.services.web_tools.config import (
+    _EXCLUDED_TAGS,
+    _WORD_COUNT_THRESHOLD,
+    build_markdown_generator,
+    topic_keywords,
+)
+
+logger = logging.getLogger(__name__)
+
+STATIC = "static"
+BROWSER = "browser"
+
+
+def _host(url: str) -> str:
+    try:
+        host = urlparse(url).netloc.lower().split(":")[0]
+    except Exception:
+        return ""
+    return host.removeprefix("www.")
+
+
+def _link_hrefs(links: Any, kind: str) -> list[tuple[str, str]]:
+    """Return ``(href, text)`` pairs from crawl4ai link containers."""
+    items = links.get(kind, []) if isinstance(links, dict) else getattr(links, kind, [])
+    pairs = []
+    for item in items or []:
+        if isinstance(item, dict):
+            pairs.append((item.get("href", ""), item.get("text", "") or ""))
+        else:
+            pairs.append((getattr(item, "href", "") or "", getattr(item, "text", "") or ""))
+    return pairs
+
+
+class StaticFetcher:
+    """Fetch and convert pages over plain HTTP (no browser)."""
+
+    def __init__(self, timeout: float = STATIC_FETCH_TIMEOUT) -> None:
+        self._timeout = timeout
+        self._scraping = LXMLWebScrapingStrategy()
+
+    async def crawl(self, url: str, topic: str, max_pages: int) -> list[dict]:
+        """Fetch *url* and up to ``max_pages - 1`` internal links.
+
+        Returns page dicts shaped like the browser path's results (see
+        ``scraper._page_from_result``); empty if the seed cannot be fetched.
+        """
+        seed = await self.fetch(url, topic)
+        if seed is None:
+            return []
+
+        followed = self._rank_links(seed["url"], seed.pop("links"), topic)[: max_pages - 1]
+        pages = await asyncio.gather(*(self.fetch(link, topic) for link in followed))
+        for page in pages:
+            if page is not None:
+                page.pop("links")
+        return [seed] + [page for page in pages if page is not None]
+
+    async def fetch(self, url: str, topic: str) -> dict | None:
+        """Fetch one page; None unless it is a successful HTML response."""
+        try:
+            response = await get_http_client().get(url, timeout=self._timeout)
+        except httpx.HTTPError as e:
+            logger.info("Static fetch failed for %s: %s", url, e)
+            return None
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or "html" not in content_type:
+            logger.info(
+                "Static fetch of %s returned %s (%s)",
+                url, response.status_code, content_type or "no content type",
+            )
+            return None
+
+        final_url = str(response.url)
+        # HTML cleaning and markdown generation are CPU-bound
+        page = await asyncio.to_thread(self._convert, final_url, response.text, topic)
+        page["etag"] = response.headers.get("etag")
+        page["last_modified"] = response.headers.get("last-modified")
+        return page
+
+    def _convert(self, url: str, html: str, topic: str) -> dict:
+        scraped = self._scraping.scrap(
+            url, html,
+            excluded_tags=_EXCLUDED_TAGS,
+            word_count_threshold=_WORD_COUNT_THRESHOLD,
+        )
+        markdown = build_markdown_generator(topic).generate_markdown(
+            scraped.cleaned_html, base_url=url
+        )
+        return {
+            "url": url,
+            "title": (scraped.metadata or {}).get("title", "") or "",
+            "raw_markdown": markdown.raw_markdown or "",
+            "fit_markdown": markdown.fit_markdown or "",
+            "links": _link_hrefs(scraped.links, "internal"),
+        }
+
+    @staticmethod
+    def _rank_links(seed_url: str, links: list[tuple[str, str]], topic: str) -> list[str]:
+        """Internal links of the seed, best keyword matches first."""
+        keywords = topic_keywords(topic)
+        seed_host = _host(seed_url)
+        seed = urldefrag(seed_url).url.rstrip("/")
+        scored: dict[str, int] = {}
+        for href, text in links:
+            link = urldefrag(urljoin(seed_url, href)).url
+            if (
+                not link.startswith("http")
+                or _host(link) != seed_host
+                or link.rstrip("/") == seed
+            ):
+                continue
+            haystack = f"{link} {text}".lower()
+            score = sum(1 for k in keywords if k in haystack)
+            scored[link] = max(score, scored.get(link, 0))
+        return sorted(scored, key=lambda link: scored[link], reverse=True)
+
+
+@dataclass
+class _Decision:
+    mode: str
+    decided_at: float
+
+
+class FetchRouter:
+    """Remembers, per domain, whether pages can be fetched statically."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = STATIC_FETCH_ENABLED,
+        js_heavy_domains: str = JS_HEAVY_DOMAINS,
+        ttl: float = STATIC_DECISION_TTL,
+    ) -> None:
+        self.enabled = enabled
+        self._js_heavy = frozenset(
+            d.strip().lower().removeprefix("www.")
+            for d in js_heavy_domains.split(",")
+            if d.strip()
+        )
+        self._ttl = ttl
+        self._decisions: dict[str, _Decision] = {}
+        self.static_served = 0
+        self.escalations = 0
+
+    def try_static(self, url: str) -> bool:
+        """Whether the static tier should be tried first for *url*."""
+        if not self.enabled:
+            return False
+        host = _host(url)
+        if any(host == d or host.endswith("." + d) for d in self._js_heavy):
+            return False
+        decision = self._decisions.get(host)
+        if decision is None or time.monotonic() - decision.decided_at >= self._ttl:
+            return True
+        return decision.mode == STATIC
+
+    def record(self, url: str, static_ok: bool) -> None:
+        """Remember the outcome of a static attempt for *url*'s domain."""
+        host = _host(url)
+        mode = STATIC if static_ok else BROWSER
+        previous = self._decisions.get(host)
+        if previous is None or previous.mode != mode:
+            logger.info("Fetch tier for %s: %s", host, mode)
+        self._decisions[host] = _Decision(mode, time.monotonic())
+        if static_ok:
+            self.static_served += 1
+        else:
+            self.escalations += 1
+
+    def stats(self) -> dict[str, int]:
+        modes = [d.mode for d in self._decisions.values()]
+        return {
+            "static_domains": modes.count(STATIC),
+            "browser_domains": modes.count(BROWSER),
+            "static_served": self.static_served,
+            "escalations": self.escalations,
+        }
+
+
+# Process-wide router shared by CrawlScraper instances
+fetch_router = FetchRouter()
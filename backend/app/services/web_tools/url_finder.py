@@ -13,7 +13,15 @@ import logging
 import re
 from urllib.parse import urlparse, quote_plus
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai import CrawlerRunConfig
+
+from app.services.errors import ServiceBusyError
+from app.services.web_tools.browser_pool import BrowserPool, browser_pool
+from app.services.web_tools.scheduler import (
+    CrawlScheduler,
+    crawl_scheduler,
+    new_owner,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -64,23 +72,44 @@ def _is_excluded(domain_url: str) -> bool:
         return True
 
 
+def _unique_domains(urls: list[str], n: int) -> list[str]:
+    """Deduplicate *urls* by main domain, in order, skipping excluded ones."""
+    seen: set[str] = set()
+    domains: list[str] = []
+
+    for url in urls:
+        domain = _extract_main_domain(url)
+        if domain is None:
+            continue
+        domain_lower = domain.lower()
+        if domain_lower in seen or _is_excluded(domain):
+            continue
+        seen.add(domain_lower)
+        domains.append(domain)
+        if len(domains) >= n:
+            break
+    return domains
+
+
 class URLFinder:
     """Discovers the most relevant news-source URLs for a given topic.
 
-    Uses crawl4ai to query Google News and Google Web search with a single
-    browser session, combines results, deduplicates by main domain, and
+    Uses crawl4ai to query Google News and Google Web search through the
+    shared browser pool, combines results, deduplicates by main domain, and
     returns up to *n* unique domain URLs likely to contain insightful content.
 
-    Google News is searched first (news-specific results), then regular
-    Google is used as a supplement to broaden coverage.
+    Google News (news-specific results) and regular Google (to broaden
+    coverage) are searched concurrently in separate tabs; Google News
+    results take priority when merging.
     """
 
-    def __init__(self) -> None:
-        self._browser_cfg = BrowserConfig(
-            headless=True,
-            verbose=False,
-            text_mode=True,
-        )
+    def __init__(
+        self,
+        pool: BrowserPool | None = None,
+        scheduler: CrawlScheduler | None = None,
+    ) -> None:
+        self._pool = pool or browser_pool
+        self._scheduler = scheduler or crawl_scheduler
         self._crawl_cfg = CrawlerRunConfig(
             word_count_threshold=0,
             excluded_tags=["script", "style"],
@@ -90,37 +119,27 @@ class URLFinder:
             page_timeout=30000,
         )
 
-    async def find_urls(self, topic: str, n: int = 10) -> list[str]:
+    async def find_urls(
+        self, topic: str, n: int = 10, *, early_exit: bool = False
+    ) -> list[str]:
         """Return up to *n* unique main-domain URLs relevant to *topic*.
 
         Args:
             topic: Free-text description of the topic to search for.
             n: Maximum number of domain URLs to return.
+            early_exit: Stop as soon as *n* domains have been collected
+                from the searches finished so far, cancelling the other
+                search (faster, but results may not include Google News
+                first).
 
         Returns:
             A list of up to *n* strings, each a main-domain URL
             (e.g. ``"https://example.com"``).
         """
-        raw_urls = await self._search(topic, n)
+        raw_urls = await self._search(topic, n, early_exit=early_exit)
         logger.info("Extracted %d raw URLs from search results", len(raw_urls))
 
-        # Deduplicate by main domain, preserving discovery order
-        # (Google News results come first, so they get priority)
-        seen: set[str] = set()
-        domains: list[str] = []
-
-        for url in raw_urls:
-            domain = _extract_main_domain(url)
-            if domain is None:
-                continue
-            domain_lower = domain.lower()
-            if domain_lower in seen or _is_excluded(domain):
-                continue
-            seen.add(domain_lower)
-            domains.append(domain)
-            if len(domains) >= n:
-                break
-
+        domains = _unique_domains(raw_urls, n)
         logger.info(
             "Returning %d domain URLs for topic '%s': %s",
             len(domains), topic, domains,
@@ -131,8 +150,11 @@ class URLFinder:
     # Internals
     # ------------------------------------------------------------------
 
-    async def _search(self, topic: str, n: int) -> list[str]:
-        """Run Google News + Google Web searches using a single browser."""
+    async def _search(self, topic: str, n: int, *, early_exit: bool = False) -> list[str]:
+        """Run Google News + Google Web searches concurrently in pooled tabs.
+
+        Returns the extracted URLs with Google News results first.
+        """
         query = quote_plus(topic)
 
         # Google News search — surfaces actual news articles
@@ -146,23 +168,53 @@ class URLFinder:
             f"&num={n + 5}&hl=en"
         )
 
-        all_urls: list[str] = []
+        search_urls = [news_url, web_url]
+        owner = new_owner()
+        results: list[list[str] | None] = [None] * len(search_urls)
+
+        async def fetch(index: int) -> int:
+            results[index] = await self._fetch_search_page(search_urls[index], owner)
+            return index
 
+        tasks = [asyncio.create_task(fetch(i)) for i in range(len(search_urls))]
         try:
-            async with AsyncWebCrawler(config=self._browser_cfg) as crawler:
-                for url in [news_url, web_url]:
-                    result = cast(
-                        CrawlResult,
-                        await crawler.arun(url=url, config=self._crawl_cfg),
-                    )
-                    if not result.success:
-                        logger.warning("Search crawl failed: %s", result.url)
-                        continue
-                    all_urls.extend(self._extract_urls(result))
+            for next_done in asyncio.as_completed(tasks):
+                await next_done
+                if early_exit:
+                    found = [url for urls in results if urls for url in urls]
+                    if len(_unique_domains(found, n)) >= n:
+                        logger.info("Collected %d domains, skipping remaining searches", n)
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [url for urls in results if urls for url in urls]
+
+    async def _fetch_search_page(self, url: str, owner: str) -> list[str]:
+        """Crawl one search results page in its own tab and extract its URLs."""
+        try:
+            # Both searches hit google.com; pacing them against each other
+            # would delay the second one by CRAWL_DOMAIN_MIN_INTERVAL
+            async with (
+                self._scheduler.slot(url, owner=owner, pace_owner=False),
+                self._pool.acquire() as crawler,
+            ):
+                result = cast(
+                    CrawlResult,
+                    await crawler.arun(url=url, config=self._crawl_cfg),
+                )
+        except ServiceBusyError:
+            raise
         except Exception as e:
             logger.error("Error during Google search: %s", e)
+            return []
 
-        return all_urls
+        if not result.success:
+            logger.warning("Search crawl failed: %s", result.url)
+            return []
+        return self._extract_urls(result)
 
     @staticmethod
     def _extract_urls(result: CrawlResult) -> list[str]:
@@ -201,7 +253,10 @@ if __name__ == "__main__":
     async def main():
         finder = URLFinder()
         topic = input("Enter topic: ")
-        urls = await finder.find_urls(topic, n=10)
+        try:
+            urls = await finder.find_urls(topic, n=10, early_exit=True)
+        finally:
+            await browser_pool.close()
         print(f"\nFound {len(urls)} URLs for topic '{topic}':")
         for i, url in enumerate(urls, 1):
             print(f"  {i}. {url}")
@@ -1,20 +1,75 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import time
 
+from app.clients.http import close_http_client
+from app.clients.llm import llm_clients
+from app.config import MODEL_WARMUP
 from app.routers import podcasts, find_urls, scrape
+from app.services.agents.agents import build_url_finder_agent
+from app.services.agents.cache import url_search_cache
+from app.services.agents.tools.search import search_service
+from app.services.errors import ServiceBusyError
+from app.services.executors import executor_stats, llm_executor, tts_executor
+from app.services.residency import model_residency
+from app.services.tts_cache import segment_cache
+from app.services.tts_workers import tts_worker_pool
+from app.services.web_tools.browser_pool import browser_pool
+from app.services.web_tools.page_cache import page_cache
+from app.services.web_tools.scheduler import crawl_scheduler
+from app.services.web_tools.static_fetch import fetch_router
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Background model warm-up (MODEL_WARMUP), awaited by /ready
+_warmup_task: asyncio.Task | None = None
+
+
+async def _warm_up_models():
+    """Load the TTS model and import the URL finder agent ahead of first use"""
+    start_time = time.monotonic()
+    try:
+        await asyncio.gather(
+            tts_executor.run(podcasts.podcast_generator.tts_generator.warm_up),
+            llm_executor.run(build_url_finder_agent),
+        )
+    except Exception as e:
+        logger.error("Model warm-up failed: %s", e)
+        raise
+    logger.info("Models warmed up in %.1f seconds", time.monotonic() - start_time)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
+    global _warmup_task
     logger.info("Starting AI Podcast Generator API")
+    await browser_pool.start()
+    await llm_clients.start()
+    await podcasts.job_manager.start()
+    await model_residency.start()
+    if MODEL_WARMUP:
+        _warmup_task = asyncio.create_task(_warm_up_models())
     yield
     logger.info("Shutting down AI Podcast Generator API")
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+    await podcasts.job_manager.stop()
+    await browser_pool.close()
+    await close_http_client()
+    await llm_clients.close()
+    await model_residency.close()
+    if page_cache is not None:
+        page_cache.close()
+    llm_executor.shutdown()
+    tts_executor.shutdown()
+    if tts_worker_pool is not None:
+        tts_worker_pool.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -32,6 +87,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(ServiceBusyError)
+async def service_busy_handler(request: Request, exc: ServiceBusyError):
+    """Turn saturation errors into 429 responses with a Retry-After hint."""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # Include routers
 app.include_router(find_urls.router, prefix="/urls", tags=["urls"])
 app.include_router(podcasts.router, prefix="/podcasts", tags=["podcasts"])
@@ -47,6 +111,44 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "ai-podcast-generator"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 while the optional model warm-up is running"""
+    if _warmup_task is None:
+        warmup = "disabled"
+    elif not _warmup_task.done():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up"},
+        )
+    elif _warmup_task.cancelled() or _warmup_task.exception() is not None:
+        # Models still load on first use
+        warmup = "failed"
+    else:
+        warmup = "done"
+    return {
+        "status": "ready",
+        "warmup": warmup,
+        "tts_model_loaded": podcasts.podcast_generator.tts_generator.loaded,
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Occupancy of the worker pools, queues and crawl resources"""
+    return {
+        "executors": executor_stats(),
+        "llm_endpoints": llm_clients.stats(),
+        "podcast_jobs": podcasts.job_manager.stats(),
+        "browser_pool": browser_pool.stats(),
+        "crawl_scheduler": crawl_scheduler.stats(),
+        "fetch_router": fetch_router.stats(),
+        "model_residency": model_residency.stats(),
+        "tts_workers": tts_worker_pool.stats() if tts_worker_pool else None,
+        "tts_segment_cache": segment_cache.stats() if segment_cache else None,
+        "url_search_cache": url_search_cache.stats() if url_search_cache else None,
+        "web_search": search_service.stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
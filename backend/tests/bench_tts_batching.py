@@ -0,0 +1,65 @@
+"""
+Benchmark per-line vs batched TTS synthesis wall time.
+
+Usage: python3 tests/bench_tts_batching.py --lines <n_lines> --batch_sizes 1 4 8 [--cpu]
+"""
+
+import logging
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.tts import TTSGeneratorService
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SAMPLE_LINES = [
+    "Welcome back to the show.",
+    "Today we are looking at the biggest stories of the week.",
+    "Let's start with the news that everyone has been talking about since Monday morning.",
+    "It's a short one.",
+    "Researchers announced a new open model that runs comfortably on a laptop, and early benchmarks look promising.",
+    "Meanwhile, regulators published a draft of the rules that will apply from next year.",
+    "That's it for now.",
+    "Thanks for listening, and see you next time.",
+]
+
+
+def run(n_lines: int, batch_sizes: list[int], cpu: bool):
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(n_lines)]
+
+    service = TTSGeneratorService(workers=None, device="cpu" if cpu else None)
+    service.load()
+
+    # Warm-up so the first measurement does not pay one-off initialisation
+    service.synthesize_lines(lines[:1], batch_size=1)
+
+    timings: dict[int, float] = {}
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        service.synthesize_lines(lines, batch_size=batch_size)
+        timings[batch_size] = time.perf_counter() - start
+        logger.info(
+            "Bench: batch_size=%d  %d lines  %.2fs  (%.2fs/line)",
+            batch_size, n_lines, timings[batch_size], timings[batch_size] / n_lines,
+        )
+
+    baseline = timings.get(1)
+    if baseline:
+        for batch_size, elapsed in timings.items():
+            logger.info("Bench: batch_size=%d speed-up x%.2f", batch_size, baseline / elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-line and batched TTS wall time.")
+    parser.add_argument("--lines", required=False, type=int, default=16, help="Number of script lines to synthesize.")
+    parser.add_argument("--batch_sizes", required=False, type=int, nargs="+", default=[1, 4, 8], help="Batch sizes to compare (1 = per line).")
+    parser.add_argument("--cpu", action="store_true", help="Force synthesis on CPU.")
+
+    args = parser.parse_args()
+    run(args.lines, args.batch_sizes, args.cpu)
@@ -0,0 +1,49 @@
+"""Unit tests for near-duplicate detection (app/services/web_tools/dedup.py)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.web_tools.dedup import NearDuplicateIndex, _band_layout, deduplicate
+from app.services.web_tools.schemas import ScrapedArticle
+
+STORY = (
+    "The European Parliament approved the artificial intelligence act on Wednesday, "
+    "setting rules for high risk systems, transparency duties for general purpose "
+    "models and fines for companies that break the law. Lawmakers said the rules "
+    "would take effect in stages over the next two years."
+)
+OTHER = (
+    "A new pasta restaurant opened downtown this weekend, serving fresh tomato sauce, "
+    "hand made noodles and a short list of local wines to a crowd of curious diners."
+)
+
+
+def article(url: str, content: str, score: float = 0.5) -> ScrapedArticle:
+    return ScrapedArticle(url=url, title=url, content=content, relevance_score=score)
+
+
+def test_band_layout_threshold_is_at_or_below_target():
+    bands, rows = _band_layout(0.8, 128)
+    assert bands * rows <= 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+
+
+def test_syndicated_copies_are_merged():
+    index = NearDuplicateIndex()
+    original = article("https://wire.test/eu-ai", STORY)
+    assert index.find_or_add(original) is None
+    copy = article("https://paper.test/eu-ai", STORY + " Reporting by the wire service.")
+    assert index.find_or_add(copy) is original
+    assert original.alternate_sources == ["https://paper.test/eu-ai"]
+    assert index.find_or_add(article("https://food.test/pasta", OTHER)) is None
+
+
+def test_deduplicate_keeps_the_best_copy_in_input_order():
+    low = article("https://a.test/story", STORY, score=0.3)
+    other = article("https://b.test/pasta", OTHER, score=0.1)
+    high = article("https://c.test/story", STORY + " Updated.", score=0.9)
+    kept = deduplicate([low, other, high])
+    assert kept == [other, high]
+    assert high.alternate_sources == ["https://a.test/story"]
@@ -0,0 +1,39 @@
+"""Unit tests for the bounded executors (app/services/executors.py)."""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.errors import ServiceBusyError
+from app.services.executors import BoundedExecutor
+
+
+def test_cancelled_call_keeps_its_slot_until_the_work_ends():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        task = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0)
+        # The worker is still blocked, so the pool is still full
+        with pytest.raises(ServiceBusyError):
+            executor.check_capacity()
+        release.set()
+        for _ in range(100):
+            if executor.stats()["queued"] == 0 and executor.stats()["active"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        return await executor.run(lambda: "ok")
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+    finally:
+        release.set()
+        executor.shutdown()
@@ -12,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app.routers.schemas import URLSearchResponse
-from app.services.agents.agents import url_finder_agent
+from app.services.agents.agents import build_url_finder_agent
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 
 def run(topic: str, max_sources: int):
     logger.info("Test: Searching URLs for topic: %s", topic)
-    response = url_finder_agent(prompt=f"Topic: {topic}, Number of URLs: {max_sources}")
+    response = build_url_finder_agent()(prompt=f"Topic: {topic}, Number of URLs: {max_sources}")
     if not isinstance(response.structured_output, URLSearchResponse):
         raise ValueError("Agent failed to return valid URL structure.")
     logger.info("Test: Found %d URLs for topic '%s'", len(response.structured_output.urls), topic)
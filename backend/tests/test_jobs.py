@@ -0,0 +1,103 @@
+"""Unit tests for background podcast jobs (app/services/jobs.py)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.errors import ServiceBusyError
+from app.services.jobs import JobStatus, PodcastJobManager
+
+
+class Request:
+    topic = "ai"
+
+
+def test_jobs_run_and_report_progress():
+    async def runner(request, progress):
+        progress("scraping", {"done": 1, "total": 2})
+        return "response"
+
+    async def scenario():
+        manager = PodcastJobManager(runner, workers=1, max_queued=2)
+        await manager.start()
+        job = manager.submit(Request())
+        events = [event async for event in manager.events(job.id)]
+        await manager.stop()
+        return job, events
+
+    job, events = asyncio.run(scenario())
+    assert job.status is JobStatus.COMPLETED
+    assert job.result == "response"
+    assert events[-1]["status"] == "completed"
+    assert any(event["stage"] == "scraping" for event in events)
+
+
+def test_interleaved_stages_keep_their_own_progress():
+    async def runner(request, progress):
+        progress("synthesizing", {"done": 3})
+        progress("scripting", {"summarized": 2})
+        progress("synthesizing", {"done": 5})
+        return "response"
+
+    async def scenario():
+        manager = PodcastJobManager(runner, workers=1, max_queued=2)
+        await manager.start()
+        job = manager.submit(Request())
+        events = [event async for event in manager.events(job.id)]
+        await manager.stop()
+        return job, events
+
+    job, events = asyncio.run(scenario())
+    assert job.progress == {"synthesizing": {"done": 5}, "scripting": {"summarized": 2}}
+    done = [e["progress"]["synthesizing"]["done"] for e in events if "synthesizing" in e["progress"]]
+    assert done == sorted(done)
+
+
+def test_cancelled_queued_jobs_free_their_queue_slot():
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def runner(request, progress):
+            await gate.wait()
+            return "response"
+
+        manager = PodcastJobManager(runner, workers=1, max_queued=1)
+        await manager.start()
+        running = manager.submit(Request())
+        await asyncio.sleep(0)
+        queued = manager.submit(Request())
+        with pytest.raises(ServiceBusyError):
+            manager.submit(Request())
+
+        manager.cancel(queued.id)
+        assert queued.status is JobStatus.CANCELLED
+        replacement = manager.submit(Request())
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        statuses = running.status, replacement.status
+        await manager.stop()
+        return statuses
+
+    assert asyncio.run(scenario()) == (JobStatus.COMPLETED, JobStatus.COMPLETED)
+
+
+def test_running_jobs_can_be_cancelled():
+    async def scenario():
+        async def runner(request, progress):
+            await asyncio.sleep(10)
+
+        manager = PodcastJobManager(runner, workers=1, max_queued=1)
+        await manager.start()
+        job = manager.submit(Request())
+        await asyncio.sleep(0)
+        manager.cancel(job.id)
+        await asyncio.sleep(0)
+        await manager.stop()
+        return job
+
+    assert asyncio.run(scenario()).status is JobStatus.CANCELLED
@@ -0,0 +1,99 @@
+"""Unit tests for LLM load balancing and circuit breaking (app/clients/llm.py)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+from app.clients.llm import LLMClientManager
+from app.services.errors import ServiceBusyError
+
+
+def make_manager(urls=("http://a", "http://b"), **kwargs) -> LLMClientManager:
+    kwargs = {"max_retries": 1, "retry_backoff": 0, "breaker_threshold": 1,
+              "breaker_cooldown": 60, **kwargs}
+    return LLMClientManager(list(urls), **kwargs)
+
+
+def fail_on(*bad_urls):
+    async def request(endpoint):
+        if endpoint.url in bad_urls:
+            raise httpx.ConnectError("connection refused")
+        return endpoint.url
+    return request
+
+
+def test_retries_on_another_server_and_opens_the_breaker():
+    manager = make_manager()
+    for _ in range(3):
+        assert asyncio.run(manager.call(fail_on("http://a"))) == "http://b"
+    states = {s["url"]: s["state"] for s in manager.stats()}
+    assert states == {"http://a": "open", "http://b": "closed"}
+
+
+def test_wrapped_transport_errors_are_retried():
+    manager = make_manager()
+
+    async def request(endpoint):
+        if endpoint.url == "http://a":
+            try:
+                raise httpx.ConnectError("connection refused")
+            except httpx.ConnectError as e:
+                raise RuntimeError("model call failed") from e
+        return endpoint.url
+
+    results = {asyncio.run(manager.call(request)) for _ in range(2)}
+    assert results == {"http://b"}
+
+
+def test_other_errors_are_raised_without_tripping_the_breaker():
+    manager = make_manager(urls=("http://a",))
+
+    async def request(endpoint):
+        raise ValueError("bad output")
+
+    with pytest.raises(ValueError):
+        asyncio.run(manager.call(request))
+    assert manager.stats()[0]["state"] == "closed"
+    assert manager.stats()[0]["in_flight"] == 0
+
+
+def test_open_breakers_reject_with_retry_after():
+    manager = make_manager(urls=("http://a",), max_retries=0)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(manager.call(fail_on("http://a")))
+    with pytest.raises(ServiceBusyError) as excinfo:
+        manager.pick()
+    assert excinfo.value.retry_after >= 1
+
+
+def test_half_open_breaker_admits_a_single_probe():
+    manager = make_manager(urls=("http://a",), max_retries=0, breaker_cooldown=0)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(manager.call(fail_on("http://a")))
+
+    async def scenario():
+        probe_started, release = asyncio.Event(), asyncio.Event()
+
+        async def probe(endpoint):
+            probe_started.set()
+            await release.wait()
+            return "ok"
+
+        task = asyncio.create_task(manager.call(probe))
+        await probe_started.wait()
+        # Further requests are rejected while the probe is in flight
+        with pytest.raises(ServiceBusyError):
+            manager.pick()
+        release.set()
+        return await task
+
+    assert asyncio.run(scenario()) == "ok"
+    assert manager.stats()[0]["state"] == "closed"
+    # Closed again: concurrent requests are admitted
+    assert manager.pick() is manager.pick()
@@ -0,0 +1,54 @@
+"""Unit tests for the episode output store (app/services/output_store.py)."""
+
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.output_store import PodcastOutputStore
+
+
+def write_wav(path: str, seconds: float = 0.5, rate: int = 8000) -> None:
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\0\0" * int(seconds * rate))
+
+
+def test_committed_episodes_are_found_by_key(tmp_path):
+    store = PodcastOutputStore(str(tmp_path))
+    key = store.key("Hello there.", "bark", 24000)
+    assert key == store.key("  Hello there.\n", "bark", 24000)
+    assert store.get(key) is None
+
+    with store.writing(key) as tmp:
+        write_wav(tmp)
+        store.commit(key, tmp, {"topic": "ai"})
+    stored = store.get(key)
+    assert stored.duration == 0.5
+    assert stored.metadata == {"topic": "ai"}
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".part"] == []
+
+
+def test_key_locks_serialize_and_are_released(tmp_path):
+    store = PodcastOutputStore(str(tmp_path))
+    inside, overlaps = [0], []
+
+    def work():
+        with store.lock("episode"):
+            inside[0] += 1
+            overlaps.append(inside[0])
+            time.sleep(0.01)
+            inside[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == [1, 1, 1, 1]
+    assert store._locks == {}
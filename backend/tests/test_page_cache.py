@@ -0,0 +1,93 @@
+"""Unit tests for the persistent page cache (app/services/web_tools/page_cache.py)."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.web_tools import page_cache as page_cache_module
+from app.services.web_tools.page_cache import PageCache, normalize_url
+
+
+def page(url: str, text: str = "body", **validators) -> dict:
+    return {"url": url, "title": url, "raw_markdown": text, "fit_markdown": "", **validators}
+
+
+def make_cache(tmp_path, **kwargs) -> PageCache:
+    return PageCache(str(tmp_path / "pages.db"), domain_ttls={}, **kwargs)
+
+
+def test_normalize_url_drops_tracking_and_sorts_query():
+    assert (
+        normalize_url("HTTPS://Example.com:443/news/?utm_source=x&b=2&a=1#top")
+        == "https://example.com/news?a=1&b=2"
+    )
+
+
+def test_crawls_are_keyed_by_max_follow(tmp_path):
+    cache = make_cache(tmp_path)
+    pages = [page("https://site.test/"), page("https://site.test/a")]
+    asyncio.run(cache.put_crawl("https://site.test/", "AI", 1, pages))
+
+    crawl = asyncio.run(cache.get_crawl("https://site.test/", "ai", 1))
+    assert [p.url for p in crawl.pages] == ["https://site.test/", "https://site.test/a"]
+    assert asyncio.run(cache.get_crawl("https://site.test/", "ai", 5)) is None
+
+
+def test_eviction_keeps_a_running_total(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=100)
+    for i in range(5):
+        asyncio.run(cache.put_crawl(
+            f"https://site.test/{i}", "t", 0, [page(f"https://site.test/{i}", "x" * 30)]
+        ))
+        # Replacing a page must not count it twice
+        asyncio.run(cache.put_crawl(
+            f"https://site.test/{i}", "t", 0, [page(f"https://site.test/{i}", "x" * 30)]
+        ))
+    stored = cache._db().execute("SELECT SUM(size) FROM pages").fetchone()[0]
+    assert cache._total_bytes == stored <= 100
+    assert asyncio.run(cache.get_crawl("https://site.test/0", "t", 0)) is None
+    assert asyncio.run(cache.get_crawl("https://site.test/4", "t", 0)) is not None
+
+
+def test_revalidation_checks_every_page(tmp_path, monkeypatch):
+    statuses = {"https://site.test/": 304, "https://site.test/a": 200}
+    requested = []
+
+    async def get(url, headers):
+        requested.append((url, headers))
+        return SimpleNamespace(status_code=statuses[url])
+
+    monkeypatch.setattr(page_cache_module, "get_http_client", lambda: SimpleNamespace(get=get))
+    cache = make_cache(tmp_path)
+    pages = [
+        page("https://site.test/", etag='"seed"'),
+        page("https://site.test/a", last_modified="Mon, 01 Jan 2024 00:00:00 GMT"),
+    ]
+    asyncio.run(cache.put_crawl("https://site.test/", "t", 1, pages, etag='"seed"'))
+    crawl = asyncio.run(cache.get_crawl("https://site.test/", "t", 1))
+
+    # The seed is unchanged but a followed page changed
+    assert asyncio.run(cache.revalidate(crawl)) is False
+    assert dict(requested) == {
+        "https://site.test/": {"If-None-Match": '"seed"'},
+        "https://site.test/a": {"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+    }
+
+    statuses["https://site.test/a"] = 304
+    assert asyncio.run(cache.revalidate(crawl)) is True
+    assert crawl.fresh
+
+
+def test_pages_without_validators_cannot_be_revalidated(tmp_path, monkeypatch):
+    async def get(url, headers):
+        return SimpleNamespace(status_code=304)
+
+    monkeypatch.setattr(page_cache_module, "get_http_client", lambda: SimpleNamespace(get=get))
+    cache = make_cache(tmp_path)
+    pages = [page("https://site.test/", etag='"seed"'), page("https://site.test/a")]
+    asyncio.run(cache.put_crawl("https://site.test/", "t", 1, pages, etag='"seed"'))
+    crawl = asyncio.run(cache.get_crawl("https://site.test/", "t", 1))
+    assert asyncio.run(cache.revalidate(crawl)) is False
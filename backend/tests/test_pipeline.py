@@ -0,0 +1,61 @@
+"""Unit tests for the pipelined podcast generation (app/services/pipeline.py)."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.pipeline import _DONE, LineFeed, PodcastPipeline
+
+
+class FakeScriptGenerator:
+    def __init__(self) -> None:
+        self.sections: list[dict] = []
+
+    def episode_words(self, duration: int) -> int:
+        return duration * 300
+
+    async def stream_script_section(self, duration, topic, summaries, **kwargs):
+        self.sections.append({"summaries": list(summaries), **kwargs})
+        yield f"Section {len(self.sections)}."
+
+
+def compose(urls: int, max_articles_per_site: int, summaries: list[str]) -> list[dict]:
+    request = SimpleNamespace(
+        topic="ai", duration=2, urls=[f"https://site{i}.test/" for i in range(urls)],
+        max_articles_per_site=max_articles_per_site,
+    )
+    generator = FakeScriptGenerator()
+    pipeline = PodcastPipeline(
+        request, scraper=None, script_generator=generator,
+        tts_generator=None, progress=lambda stage, details: None,
+    )
+
+    async def scenario():
+        source: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(pipeline._compose(source, LineFeed(batch_size=1)))
+        # One at a time, as summaries finish, with the end marker last
+        for item in [*summaries, _DONE]:
+            await source.put(item)
+            await asyncio.sleep(0.01)
+        await task
+
+    asyncio.run(scenario())
+    return generator.sections
+
+
+def test_every_source_filling_its_quota_ends_with_a_closing_section():
+    sections = compose(urls=1, max_articles_per_site=1, summaries=["summary"])
+    assert [s["summaries"] for s in sections] == [["summary"], []]
+    assert sections[0]["words"] == 600
+    assert sections[-1]["final"]
+
+
+def test_fewer_articles_than_expected_leave_the_budget_to_the_last_section():
+    sections = compose(urls=2, max_articles_per_site=2, summaries=["a", "b"])
+    assert [s["summaries"] for s in sections] == [["a"], ["b"], []]
+    # Each article gets its share of the four expected; the closing
+    # section is short
+    assert [s["words"] for s in sections] == [150, 150, 80]
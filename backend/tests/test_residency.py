@@ -0,0 +1,91 @@
+"""Unit tests for the model residency manager (app/services/residency.py)."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.errors import ServiceBusyError
+from app.services.residency import ModelResidency
+
+MB = 1024 * 1024
+
+
+def register(residency: ModelResidency, name: str, log: list, size_mb: int = 0) -> None:
+    residency.register(
+        name,
+        lambda: log.append(("load", name)) or f"{name}-model",
+        lambda model: log.append(("unload", name)),
+        size_hint=size_mb * MB,
+    )
+
+
+def test_models_stay_loaded_until_idle():
+    log = []
+    residency = ModelResidency(budget_mb=0, idle_timeout=60)
+    register(residency, "tts", log)
+    for _ in range(2):
+        with residency.use("tts") as model:
+            assert model == "tts-model"
+    assert log == [("load", "tts")]
+
+    assert residency.unload_idle() == []
+    assert residency.unload_idle(idle_for=0) == ["tts"]
+    assert not residency.is_loaded("tts")
+    assert residency.stats()["models"]["tts"]["unloads"] == 1
+
+
+def test_models_in_use_are_not_unloaded():
+    residency = ModelResidency(budget_mb=0, idle_timeout=60)
+    register(residency, "tts", [])
+    with residency.use("tts"):
+        assert residency.unload_idle(idle_for=0) == []
+        assert residency.is_loaded("tts")
+
+
+def test_budget_unloads_least_recently_used_first():
+    log = []
+    residency = ModelResidency(budget_mb=250, idle_timeout=60)
+    for name in ("a", "b", "c"):
+        register(residency, name, log, size_mb=100)
+    for name in ("a", "b", "a", "c"):
+        with residency.use(name):
+            pass
+    assert ("unload", "b") in log and ("unload", "a") not in log
+    assert residency.stats()["resident_bytes"] == 200 * MB
+
+
+def test_budget_taken_by_models_in_use_raises_busy():
+    residency = ModelResidency(budget_mb=150, idle_timeout=60)
+    register(residency, "a", [], size_mb=100)
+    register(residency, "b", [], size_mb=100)
+    with residency.use("a"):
+        with pytest.raises(ServiceBusyError):
+            with residency.use("b"):
+                pass
+
+
+def test_idle_unload_waits_for_a_load_in_progress():
+    events = []
+    loading = threading.Event()
+    residency = ModelResidency(budget_mb=0, idle_timeout=60)
+    residency.register("idle", lambda: "idle-model", lambda m: events.append("unload idle"))
+    residency.register("slow", lambda: loading.set() or time.sleep(0.2) or "slow-model",
+                       lambda m: None)
+    with residency.use("idle"):
+        pass
+
+    def load_slow():
+        with residency.use("slow"):
+            events.append("loaded slow")
+
+    thread = threading.Thread(target=load_slow)
+    thread.start()
+    loading.wait()
+    residency.unload_idle(idle_for=0)
+    thread.join()
+    assert events == ["loaded slow", "unload idle"]
@@ -0,0 +1,91 @@
+"""Unit tests for the URL finder result cache (app/services/agents/cache.py)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.agents.cache import ResultCache, normalize_topic
+
+
+class Loader:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.calls
+
+
+def test_normalize_topic():
+    assert normalize_topic("  AI   News! ") == normalize_topic("ai news")
+
+
+def test_fresh_entries_are_served_from_the_cache():
+    async def scenario():
+        cache, load = ResultCache(ttl=60, stale_ttl=0), Loader()
+        assert await cache.get_or_load("k", load) == 1
+        assert await cache.get_or_load("k", load) == 1
+        return cache, load
+
+    cache, load = asyncio.run(scenario())
+    assert load.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_requests_share_one_load():
+    async def scenario():
+        cache, load = ResultCache(ttl=60, stale_ttl=0), Loader(delay=0.05)
+        results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(3)))
+        return cache, load, results
+
+    cache, load, results = asyncio.run(scenario())
+    assert results == [1, 1, 1]
+    assert load.calls == 1
+    assert cache.stats()["coalesced"] == 2
+
+
+def test_stale_entries_are_served_while_refreshing():
+    async def scenario():
+        cache, load = ResultCache(ttl=0.05, stale_ttl=60), Loader()
+        await cache.get_or_load("k", load)
+        await asyncio.sleep(0.06)
+        stale = await cache.get_or_load("k", load)
+        await asyncio.sleep(0.01)
+        fresh = await cache.get_or_load("k", load)
+        return stale, fresh
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+
+def test_failures_are_not_cached():
+    async def scenario():
+        cache, calls = ResultCache(ttl=60, stale_ttl=0), []
+
+        async def load():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ValueError("no URLs")
+            return "ok"
+
+        with pytest.raises(ValueError):
+            await cache.get_or_load("k", load)
+        return await cache.get_or_load("k", load)
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_entries_are_evicted_least_recently_used_first():
+    async def scenario():
+        cache = ResultCache(ttl=60, stale_ttl=0, max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            await cache.get_or_load(key, Loader())
+        return cache
+
+    cache = asyncio.run(scenario())
+    assert list(cache._entries) == ["a", "c"]
@@ -0,0 +1,155 @@
+"""Unit tests for the crawl scheduler (app/services/web_tools/scheduler.py)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.errors import ServiceBusyError
+from app.services.web_tools.scheduler import CrawlScheduler
+
+
+def make_scheduler(**kwargs) -> CrawlScheduler:
+    kwargs = {"domain_concurrency": 10, "domain_min_interval": 0, "max_pending": 100, **kwargs}
+    return CrawlScheduler(kwargs.pop("max_in_flight_pages", 2), **kwargs)
+
+
+async def crawl(scheduler, url, owner, log, *, cost=1, hold=0.01):
+    async with scheduler.slot(url, owner=owner, cost=cost):
+        log.append(owner)
+        await asyncio.sleep(hold)
+
+
+def test_page_budget_bounds_concurrency():
+    async def scenario():
+        scheduler, running, peak = make_scheduler(max_in_flight_pages=2), [0], [0]
+
+        async def job(i):
+            async with scheduler.slot(f"https://site{i}.test/", owner=str(i)):
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                await asyncio.sleep(0.01)
+                running[0] -= 1
+
+        await asyncio.gather(*(job(i) for i in range(6)))
+        return scheduler, peak[0]
+
+    scheduler, peak = asyncio.run(scenario())
+    assert peak == 2
+    assert scheduler.stats()["in_flight_pages"] == 0
+    assert scheduler.stats()["pending"] == 0
+
+
+def test_owners_are_served_round_robin():
+    async def scenario():
+        scheduler, log = make_scheduler(max_in_flight_pages=1), []
+        big = [crawl(scheduler, f"https://a{i}.test/", "big", log) for i in range(4)]
+        small = [crawl(scheduler, f"https://b{i}.test/", "small", log) for i in range(2)]
+        await asyncio.gather(*big, *small)
+        return log
+
+    log = asyncio.run(scenario())
+    # The first big crawl starts at once; the queued ones then alternate,
+    # so the small request is not starved behind the whole big one
+    assert log == ["big", "big", "small", "big", "small", "big"]
+
+
+def test_saturated_scheduler_rejects_with_busy():
+    async def scenario():
+        scheduler = make_scheduler(max_in_flight_pages=1, max_pending=2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("https://site.test/", owner="a"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiters = [asyncio.create_task(crawl(scheduler, f"https://w{i}.test/", "b", []))
+                   for i in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(ServiceBusyError):
+            scheduler.check_capacity(1)
+        with pytest.raises(ServiceBusyError):
+            async with scheduler.slot("https://other.test/"):
+                pass
+        release.set()
+        await asyncio.gather(holder, *waiters)
+        scheduler.check_capacity(2)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiters_release_their_place():
+    async def scenario():
+        scheduler = make_scheduler(max_in_flight_pages=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("https://site.test/", owner="a"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(crawl(scheduler, "https://w.test/", "b", []))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["pending"] == 0
+    assert stats["in_flight_pages"] == 0
+
+
+def test_domain_interval_counts_from_actual_starts():
+    async def scenario():
+        scheduler = make_scheduler(max_in_flight_pages=1, domain_min_interval=0.1)
+        loop, starts = asyncio.get_running_loop(), []
+
+        async def hold():
+            async with scheduler.slot("https://busy.test/", owner="a"):
+                await asyncio.sleep(0.3)
+
+        async def timed():
+            async with scheduler.slot("https://site.test/", owner="b"):
+                starts.append(loop.time())
+                await asyncio.sleep(0.01)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        await asyncio.gather(timed(), timed())
+        await holder
+        return starts
+
+    first, second = asyncio.run(scenario())
+    # Both crawls queued behind the page budget; the interval must still
+    # separate their real starts rather than their time of arrival
+    assert second - first >= 0.09
+
+
+def test_sibling_crawls_can_skip_the_domain_interval():
+    async def scenario():
+        scheduler = make_scheduler(max_in_flight_pages=4, domain_min_interval=0.2)
+        loop, starts = asyncio.get_running_loop(), {}
+
+        async def timed(name, owner):
+            async with scheduler.slot(
+                "https://search.test/", owner=owner, pace_owner=False
+            ):
+                starts[name] = loop.time()
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(timed("news", "a"), timed("web", "a"))
+        await timed("other", "b")
+        return starts
+
+    starts = asyncio.run(scenario())
+    assert abs(starts["web"] - starts["news"]) < 0.1
+    # Another request is still spaced out after the siblings
+    assert starts["other"] - max(starts["news"], starts["web"]) >= 0.18
@@ -0,0 +1,62 @@
+"""Unit tests for BM25 relevance scoring (app/services/web_tools/scoring.py)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.web_tools.scoring import RelevanceIndex, stem, tokenize
+
+AI_ARTICLE = (
+    "EU agrees landmark AI regulation",
+    "European lawmakers agreed on rules for artificial intelligence. "
+    "The AI act regulates artificial intelligence systems by risk. " * 8,
+)
+PASTA = ("Pasta recipes", "How to cook pasta at home with fresh tomatoes and basil. " * 10)
+NEW_STADIUM = ("New stadium opens", "The new stadium opened today with a new roof. " * 10)
+ART_FAIR = ("The art fair", "Painters show their art at the fair today. " * 10)
+START = ("Getting started", "We start early and start again after lunch. " * 10)
+
+
+def test_stem_keeps_words_that_only_look_inflected():
+    assert stem("news") == "news"
+    assert stem("models") == stem("modeling") == "model"
+
+
+def test_tokenize_drops_stop_words():
+    assert tokenize("The latest news about AI") == ["latest", "news", "ai"]
+
+
+def test_art_does_not_match_start():
+    scores = RelevanceIndex([ART_FAIR, START]).score("art")
+    assert scores[0] > 0.5
+    assert scores[1] == 0.0
+
+
+def test_news_does_not_match_new():
+    scores = RelevanceIndex([NEW_STADIUM, PASTA]).score("stadium news")
+    assert scores[0] > 0.1
+    scores = RelevanceIndex([NEW_STADIUM, PASTA]).score("news")
+    assert scores.tolist() == [0.0, 0.0]
+
+
+def test_words_missing_from_the_batch_do_not_penalize():
+    index = RelevanceIndex([AI_ARTICLE, PASTA, NEW_STADIUM])
+    for topic in ("artificial intelligence", "artificial intelligence news", "AI news"):
+        scores = index.score(topic)
+        assert scores[0] > 0.5, topic
+        assert scores[1] == 0.0
+
+
+def test_phrases_are_a_bonus_not_required():
+    index = RelevanceIndex([AI_ARTICLE, PASTA])
+    assert index.score("AI regulation")[0] > 0.5
+    # Both words, but never next to each other
+    split = ("Regulation", "New regulation was passed. Separately, AI grew. " * 10)
+    scores = RelevanceIndex([AI_ARTICLE, split, PASTA]).score('"AI regulation"')
+    assert scores[1] > 0.1
+    assert scores[0] > scores[1]
+
+
+def test_topic_without_indexable_words_is_neutral():
+    assert RelevanceIndex([PASTA]).score("the of").tolist() == [0.5]
@@ -0,0 +1,41 @@
+"""Unit tests for the map-reduce script pipeline (app/services/script_generator.py)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.script_generator import ScriptGeneratorService
+
+
+def make_service() -> ScriptGeneratorService:
+    service = ScriptGeneratorService()
+    service.summary_max_tokens = 50
+    service.reduce_input_tokens = 100
+    return service
+
+
+def test_reduce_condenses_until_within_budget():
+    service = make_service()
+
+    async def condense(topic, group):
+        return f"merged {len(group)}"
+
+    service._condense = condense
+    summaries = [f"SOURCE: https://site.test/{i}\n" + "x" * 150 for i in range(6)]
+    assert asyncio.run(service.reduce_summaries("t", summaries)) == ["merged 2"] * 3
+
+
+def test_failed_condense_falls_back_to_the_group_notes():
+    service = make_service()
+
+    async def condense(topic, group):
+        raise KeyError("choices")
+
+    service._condense = condense
+    summaries = [f"SOURCE: https://site.test/{i}\n" + "x" * 150 for i in range(4)]
+    reduced = asyncio.run(service.reduce_summaries("t", summaries))
+    assert sum(len(s) for s in reduced) <= service.reduce_input_tokens * 4
+    for i in range(4):
+        assert any(f"SOURCE: https://site.test/{i}" in s for s in reduced)
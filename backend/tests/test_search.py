@@ -0,0 +1,110 @@
+"""Unit tests for the search service (app/services/agents/tools/search.py).
+
+A local stand-in replaces the DuckDuckGo backend.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.agents.tools.search import (
+    SearchRateLimited,
+    SearchService,
+    normalize_query,
+)
+
+
+class FakeBackend:
+    def __init__(self, delay: float = 0.0, rate_limited: int = 0) -> None:
+        self.calls: list[tuple[str, int]] = []
+        self.delay = delay
+        self.rate_limited = rate_limited
+        self._lock = threading.Lock()
+
+    def text(self, query: str, max_results: int) -> list[dict[str, str]]:
+        with self._lock:
+            self.calls.append((query, max_results))
+            if self.rate_limited:
+                self.rate_limited -= 1
+                raise SearchRateLimited("slow down")
+        time.sleep(self.delay)
+        return [
+            {"title": f"{query} {i}", "href": f"https://site.test/{i}", "body": ""}
+            for i in range(max_results)
+        ]
+
+
+def make_service(backend, **kwargs) -> SearchService:
+    kwargs = {"ttl": 60, "min_interval": 0, "backoff": 0, **kwargs}
+    return SearchService(backend, **kwargs)
+
+
+def test_normalize_query_ignores_case_punctuation_and_order():
+    assert normalize_query("AI News, Europe!") == normalize_query("europe ai news")
+
+
+def test_near_duplicate_queries_hit_the_cache():
+    backend = FakeBackend()
+    service = make_service(backend)
+    service.search("AI news", max_results=5)
+    response = service.search("news, AI", max_results=3)
+    assert len(response.results) == 3
+    assert len(backend.calls) == 1
+    # A cached result with fewer hits cannot serve a larger request
+    assert len(service.search("ai news", max_results=8).results) == 8
+    assert len(backend.calls) == 2
+
+
+def test_concurrent_identical_queries_are_coalesced():
+    backend = FakeBackend(delay=0.2)
+    service = make_service(backend)
+    with ThreadPoolExecutor(4) as pool:
+        responses = list(pool.map(lambda _: service.search("ai news", 5), range(4)))
+    assert len(backend.calls) == 1
+    assert all(len(r.results) == 5 for r in responses)
+    assert service.stats()["coalesced"] == 3
+
+
+def test_larger_request_does_not_join_a_smaller_call_in_flight():
+    backend = FakeBackend(delay=0.2)
+    service = make_service(backend)
+    with ThreadPoolExecutor(2) as pool:
+        small = pool.submit(service.search, "ai news", 3)
+        time.sleep(0.05)
+        large = pool.submit(service.search, "ai news", 10)
+        assert len(small.result().results) == 3
+        assert len(large.result().results) == 10
+    assert sorted(n for _, n in backend.calls) == [3, 10]
+    # The larger result stays cached for both sizes
+    assert len(service.search("ai news", 10).results) == 10
+    assert len(backend.calls) == 2
+
+
+def test_rate_limited_calls_are_retried():
+    backend = FakeBackend(rate_limited=2)
+    service = make_service(backend, max_retries=2)
+    assert len(service.search("ai", 2).results) == 2
+    assert service.stats()["rate_limited"] == 2
+
+    service = make_service(FakeBackend(rate_limited=5), max_retries=1)
+    with pytest.raises(SearchRateLimited):
+        service.search("ai", 2)
+
+
+def test_search_many_keeps_order_and_survives_failures():
+    class FlakyBackend(FakeBackend):
+        def text(self, query, max_results):
+            if query == "bad":
+                raise RuntimeError("boom")
+            return super().text(query, max_results)
+
+    service = make_service(FlakyBackend())
+    responses = service.search_many(["one", "bad", "two"], max_results=1)
+    assert [r.query for r in responses] == ["one", "bad", "two"]
+    assert [len(r.results) for r in responses] == [1, 0, 1]
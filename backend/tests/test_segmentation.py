@@ -0,0 +1,63 @@
+"""Unit tests for script segmentation (app/services/segmentation.py)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.segmentation import Chunk, segment_script, split_sentences
+
+SENTENCE, PARAGRAPH = 0.1, 0.5
+
+
+def segment(lines, max_chars=60, min_chars=20):
+    return segment_script(
+        lines, max_chars=max_chars, min_chars=min_chars,
+        sentence_pause=SENTENCE, paragraph_pause=PARAGRAPH,
+    )
+
+
+def test_split_sentences_keeps_abbreviations():
+    assert split_sentences("Dr. Smith met Mr. Jones. They talked, e.g. about AI.") == [
+        "Dr. Smith met Mr. Jones.",
+        "They talked, e.g. about AI.",
+    ]
+
+
+def test_no_ends_a_sentence():
+    assert split_sentences("The answer is no. Next question.") == [
+        "The answer is no.",
+        "Next question.",
+    ]
+
+
+def test_short_lines_are_merged_and_long_ones_keep_their_chunks():
+    chunks = segment(
+        ["Hi.", "Welcome back.", "Today we talk about the new model release."], min_chars=15
+    )
+    assert chunks == [
+        Chunk("Hi. Welcome back.", PARAGRAPH),
+        Chunk("Today we talk about the new model release.", PARAGRAPH),
+    ]
+
+
+def test_chunks_respect_max_chars():
+    line = "This is a fairly long sentence, with clauses, that keeps going and going on. " * 3
+    chunks = segment([line], max_chars=50)
+    assert all(len(chunk.text) <= 50 for chunk in chunks)
+    assert " ".join(chunk.text for chunk in chunks) == " ".join(line.split())
+    assert [chunk.pause for chunk in chunks][-1] == PARAGRAPH
+
+
+def test_short_paragraph_tail_keeps_its_paragraph_pause():
+    # The first paragraph ends with a tail too short to stand alone; the
+    # next paragraph does not fit after it, so the tail is flushed alone
+    chunks = segment([
+        "The first sentence fills most of one chunk. Short tail.",
+        "The second paragraph opens with a long sentence.",
+    ], max_chars=50, min_chars=30)
+    assert chunks == [
+        Chunk("The first sentence fills most of one chunk.", SENTENCE),
+        Chunk("Short tail.", PARAGRAPH),
+        Chunk("The second paragraph opens with a long sentence.", PARAGRAPH),
+    ]
@@ -0,0 +1,53 @@
+"""Unit tests for TTS batch sharding (app/services/tts_workers.py).
+
+A thread pool stands in for the worker processes.
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services import tts_workers
+from app.services.tts_workers import TTSWorkerPool
+
+
+def make_pool(monkeypatch, synthesize, num_workers=2) -> TTSWorkerPool:
+    monkeypatch.setattr(tts_workers, "_synthesize", synthesize)
+    pool = TTSWorkerPool(num_workers=num_workers, threads_per_worker=1)
+    pool._executor.shutdown()
+    pool._executor = ThreadPoolExecutor(max_workers=num_workers)
+    return pool
+
+
+def test_batches_come_back_with_their_index(monkeypatch):
+    pool = make_pool(monkeypatch, lambda texts, seed: [t.upper() for t in texts])
+    batches = [["a", "b"], ["c"], ["d", "e"]]
+    results = dict(pool.map_batches(batches))
+    assert results == {0: ["A", "B"], 1: ["C"], 2: ["D", "E"]}
+    assert pool.stats()["in_flight"] == 0
+    assert pool.stats()["segments"] == 5
+    pool.shutdown()
+
+
+def test_stopping_early_keeps_running_batches_counted(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def synthesize(texts, seed):
+        if texts == ["slow"]:
+            started.set()
+            release.wait()
+        return texts
+
+    pool = make_pool(monkeypatch, synthesize)
+    results = pool.map_batches([["fast"], ["slow"], ["queued"]])
+    assert next(results) == (0, ["fast"])
+    started.wait()
+    results.close()
+    # The slow batch is still running on a worker
+    assert pool.stats()["in_flight"] == 1
+    release.set()
+    pool._executor.shutdown(wait=True)
+    assert pool.stats()["in_flight"] == 0